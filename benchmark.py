@@ -29,7 +29,9 @@ def run_idle_test(duration: int = 10):
         time.sleep(1)
     
     tracker.print_statistics()
-    return tracker.get_statistics()
+    stats = tracker.get_statistics()
+    stats['raw'] = tracker.get_samples()
+    return stats
 
 
 def run_mediapipe_test(duration: int = 15):
@@ -98,7 +100,10 @@ def run_mediapipe_test(duration: int = 15):
         print(f"   平均 FPS: {frame_count / duration:.1f}")
         
         tracker.print_statistics()
-        return tracker.get_statistics()
+        stats = tracker.get_statistics()
+        stats['raw'] = tracker.get_samples()
+        stats['raw']['fps'] = [frame_count / duration]
+        return stats
         
     except Exception as e:
         print(f"❌ 測試失敗: {e}")
@@ -180,7 +185,10 @@ def run_full_pipeline_test(duration: int = 15):
         print(f"   手部偵測率: {detection_count / frame_count * 100:.1f}%")
         
         tracker.print_statistics()
-        return tracker.get_statistics()
+        stats = tracker.get_statistics()
+        stats['raw'] = tracker.get_samples()
+        stats['raw']['fps'] = [frame_count / duration]
+        return stats
         
     except Exception as e:
         print(f"❌ 測試失敗: {e}")
@@ -235,6 +243,22 @@ def main():
         print(f"  CPU: {results['full']['cpu_avg']:.1f}% (最大: {results['full']['cpu_max']:.1f}%)")
         print(f"  記憶體: {results['full']['memory_avg_mb']:.1f} MB")
     
+    # 記錄到歷史資料庫
+    samples = {}
+    for test_name, stats in results.items():
+        if stats:
+            for metric, values in stats['raw'].items():
+                samples[f"{test_name}.{metric}"] = values
+    if samples:
+        try:
+            from utils.perf_history import PerfHistory
+            history = PerfHistory()
+            run_id = history.record_run("benchmark", samples, system_info=info)
+            history.close()
+            print(f"\n🗃️  已記錄到歷史資料庫 (run #{run_id})")
+        except Exception as e:
+            print(f"\n⚠️  無法寫入歷史資料庫: {e}")
+    
     print("\n" + "="*60)
     print("✅ 所有測試完成！")
     print("="*60 + "\n")
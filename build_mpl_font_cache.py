@@ -4,6 +4,10 @@ Matplotlib 字型快取生成工具
 
 用途: 預先建立 Matplotlib 字型快取,避免首次啟動時的掃描延遲
 
+注意: 應用程式已不再載入 Matplotlib（utils/hand_detector.py 只匯入 MediaPipe Hands，
+      關鍵點由 utils/hand_drawing.py 繪製），執行 main.py 不需要這個快取。
+      僅保留給需要直接使用 mediapipe.solutions.drawing_utils 的腳本。
+
 使用方法:
 1. 在乾淨環境執行此腳本生成快取
 2. 將生成的 fontlist-*.json 複製到專案的 mpl-cache/ 資料夾
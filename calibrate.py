@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+"""
+硬體校準
+
+在目標機器上以錄製的片段掃描「解析度 × model_complexity × 最多手數 × OpenCV 執行緒數」的組合，
+量測每個組合的吞吐量、每影格延遲（p50/p95，與 main.py 相同的整個影格處理路徑），以及與最準確設定
+（最高解析度、complexity 1、兩隻手）相比的關鍵點一致性：
+    手數一致率  每個影格偵測到的手數與參考設定相同的比例
+    關鍵點誤差  配對到的手部 21 個關鍵點的平均距離（佔畫面寬高的比例）；
+                參考設定有偵測到手部、但這個組合沒有任何可配對的手部時視為無限大
+
+取柏拉圖最佳（沒有其他組合在四項指標上都不差且至少一項更好）的組合中，
+符合目標幀率與 p95 預算、且一致性最高者，寫入設定檔；
+config.py 啟動時載入該檔覆寫 CAMERA_WIDTH / HEIGHT、MEDIAPIPE_MODEL_COMPLEXITY、
+MEDIAPIPE_MAX_HANDS 與 OPENCV_NUM_THREADS。
+
+注意：MediaPipe Hands（solutions API）沒有提供執行緒數設定，執行緒數只影響 OpenCV。
+
+使用方式：
+    python calibrate.py --source recordings/hands.mp4
+    python calibrate.py --source recordings/frames --frames 120 --threads 1 2 4
+    python calibrate.py --source synthetic --dry-run      # 只輸出結果，不寫入設定檔
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+import config
+from models.gesture_model import DummyModel
+from utils.frame_source import open_frame_source
+from utils.hand_detector import HandDetector, MEDIAPIPE_AVAILABLE
+from utils.image_convert import frame_to_qimage
+from utils.mirror import mirror_landmarks
+from utils.perf_stats import summarize_latencies
+
+REFERENCE_COMPLEXITY = 1
+REFERENCE_MAX_HANDS = 2
+
+
+def load_clip(source: str, count: int, width: int, height: int):
+    """讀取片段的前 count 個影格到記憶體（循環播放的來源不足時會重複）"""
+    capture = open_frame_source(source, width, height)
+    if not capture.isOpened():
+        raise RuntimeError(f"無法開啟影像來源: {source}")
+    frames = []
+    try:
+        while len(frames) < count:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            frames.append(frame)
+    finally:
+        capture.release()
+    if not frames:
+        raise RuntimeError(f"影像來源沒有影格: {source}")
+    return frames
+
+
+def run_config(frames, resolution, model_complexity, max_hands, threads, warmup, model):
+    """以一組設定處理整個片段
+
+    影格先縮放到目標解析度並複製到擷取緩衝區（模擬攝影機以該解析度擷取，不計入延遲），
+    再計時 main.py 每個影格的處理路徑「翻轉（MIRROR_AT_DISPLAY 為 False 時）→ 偵測 →
+    繪製關鍵點 → 鏡像關鍵點 → 手勢分類 → 轉換顯示格式」，與 QUALITY_P95_BUDGET_MS 的量測範圍相同
+    （只少了擷取本身）。
+
+    Returns:
+        (延遲摘要, 每個影格鏡像空間中的關鍵點列表)
+    """
+    cv2.setNumThreads(threads)
+    width, height = resolution
+    scaled = [
+        frame if frame.shape[1::-1] == (width, height)
+        else cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        for frame in frames
+    ]
+
+    detector = HandDetector(max_num_hands=max_hands, model_complexity=model_complexity)
+    captured = np.empty_like(scaled[0])  # 繪製會修改影格，片段本身保持不變
+
+    def process_frame():
+        frame = captured if config.MIRROR_AT_DISPLAY else cv2.flip(captured, 1)
+        landmarks_list = detector.detect(frame)
+        detector.draw_landmarks(frame)
+        if config.MIRROR_AT_DISPLAY:
+            landmarks_list = mirror_landmarks(landmarks_list)
+        for landmarks in landmarks_list or []:
+            model.predict(landmarks)
+        frame_to_qimage(frame, mirror=config.MIRROR_AT_DISPLAY)
+        return landmarks_list
+
+    try:
+        # 暖機：第一次推論會配置緩衝區，不計入延遲（每個組合都以相同影格暖機）
+        for frame in scaled[:warmup]:
+            np.copyto(captured, frame)
+            process_frame()
+
+        latencies_ms = []
+        results = []
+        for frame in scaled:
+            np.copyto(captured, frame)
+            start = time.perf_counter()
+            landmarks_list = process_frame()
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+            results.append([landmarks[:, :2] for landmarks in landmarks_list or []])
+    finally:
+        detector.close()
+    return summarize_latencies(latencies_ms), results
+
+
+def compare_landmarks(reference, results, max_hands):
+    """與參考設定比較手數與關鍵點位置
+
+    Returns:
+        (手數一致率, 平均關鍵點誤差；沒有可配對的手部時為 None)
+    """
+    matching_frames = 0
+    errors = []
+    for ref_hands, hands in zip(reference, results):
+        if len(hands) == min(len(ref_hands), max_hands):
+            matching_frames += 1
+        for hand in hands:
+            if ref_hands:
+                # 與最近的參考手部配對
+                errors.append(min(
+                    float(np.linalg.norm(hand - ref, axis=1).mean()) for ref in ref_hands
+                ))
+    agreement = matching_frames / len(reference) if reference else 0.0
+    return agreement, (sum(errors) / len(errors) if errors else None)
+
+
+def landmark_error(candidate: dict, missing_error: float) -> float:
+    """比較用的關鍵點誤差；沒有可配對的手部（None）時為 missing_error"""
+    error = candidate['landmark_error']
+    return missing_error if error is None else error
+
+
+def dominates(a: dict, b: dict, missing_error: float = 0.0) -> bool:
+    """a 在吞吐量、p95、手數一致率、關鍵點誤差上都不比 b 差且至少一項更好"""
+    a_error = landmark_error(a, missing_error)
+    b_error = landmark_error(b, missing_error)
+    not_worse = (a['fps'] >= b['fps'] and a['p95_ms'] <= b['p95_ms']
+                 and a['agreement'] >= b['agreement'] and a_error <= b_error)
+    better = (a['fps'] > b['fps'] or a['p95_ms'] < b['p95_ms']
+              or a['agreement'] > b['agreement'] or a_error < b_error)
+    return not_worse and better
+
+
+def pareto_front(candidates, missing_error: float = 0.0):
+    return [c for c in candidates
+            if not any(dominates(other, c, missing_error) for other in candidates)]
+
+
+def choose(front, target_fps, p95_budget_ms, missing_error: float = 0.0):
+    """柏拉圖前緣中符合預算且最準確者；沒有符合預算的組合時取最快者
+
+    missing_error: 沒有可配對手部的組合的誤差；參考設定有手部時應為無限大，
+    否則什麼都沒偵測到的組合會被當成誤差為 0
+    """
+    within = [c for c in front if c['fps'] >= target_fps and c['p95_ms'] <= p95_budget_ms]
+    if within:
+        return max(within, key=lambda c: (c['agreement'], -landmark_error(c, missing_error), c['fps'])), True
+    return max(front, key=lambda c: c['fps']), False
+
+
+def print_table(candidates, front):
+    print(f"\n{'解析度':>10} {'cx':>3} {'手':>2} {'緒':>2} {'FPS':>7} {'p50':>7} {'p95':>7} "
+          f"{'一致':>6} {'誤差':>7}")
+    for c in sorted(candidates, key=lambda c: -c['fps']):
+        error = "—" if c['landmark_error'] is None else f"{c['landmark_error']:.4f}"
+        marker = " ★" if c in front else ""
+        print(f"{c['width']:>5}x{c['height']:<4} {c['model_complexity']:>3} {c['max_hands']:>2} "
+              f"{c['threads']:>2} {c['fps']:7.1f} {c['p50_ms']:7.2f} {c['p95_ms']:7.2f} "
+              f"{c['agreement']:6.0%} {error:>7}{marker}")
+    print("  ★ 柏拉圖最佳")
+
+
+def parse_resolution(text: str):
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="硬體校準：掃描設定組合並寫入最佳設定檔")
+    parser.add_argument("--source", required=True, help="錄製的片段：影片檔、圖片資料夾或 synthetic")
+    parser.add_argument("--frames", type=int, default=90, help="每個組合處理的影格數")
+    parser.add_argument("--warmup", type=int, default=10, help="每個組合的暖機影格數")
+    parser.add_argument("--resolutions", nargs="+", type=parse_resolution,
+                        default=[(640, 480), (480, 360), (320, 240)], help="例如 640x480 320x240")
+    parser.add_argument("--complexities", nargs="+", type=int, default=[0, 1])
+    parser.add_argument("--max-hands", nargs="+", type=int, default=[1, 2])
+    parser.add_argument("--threads", nargs="+", type=int,
+                        default=sorted({1, cv2.getNumThreads()}), help="OpenCV 執行緒數")
+    parser.add_argument("--target-fps", type=float, default=config.CAMERA_FPS, help="目標幀率")
+    parser.add_argument("--p95-budget-ms", type=float, default=config.QUALITY_P95_BUDGET_MS,
+                        help="每影格 p95 延遲預算（整個影格處理路徑，不含擷取）")
+    parser.add_argument("--output", default=config.CALIBRATION_PROFILE_FILE, help="設定檔路徑")
+    parser.add_argument("--dry-run", action="store_true", help="不寫入設定檔")
+    parser.add_argument("--force", action="store_true", help="片段中沒有手部時仍寫入設定檔")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not MEDIAPIPE_AVAILABLE:
+        print("❌ MediaPipe 未安裝")
+        return 1
+
+    print("\n" + "🎛️  硬體校準".center(60, "="))
+    largest = max(args.resolutions, key=lambda r: r[0] * r[1])
+    frames = load_clip(args.source, args.frames, *largest)
+    print(f"🎞️  片段: {args.source}（{len(frames)} 影格，{frames[0].shape[1]}x{frames[0].shape[0]}）")
+
+    default_threads = cv2.getNumThreads()
+    model = DummyModel()
+    model.load_model()
+    print(f"🎯 參考設定: {largest[0]}x{largest[1]}、complexity {REFERENCE_COMPLEXITY}、"
+          f"最多 {REFERENCE_MAX_HANDS} 隻手")
+    _, reference = run_config(frames, largest, REFERENCE_COMPLEXITY, REFERENCE_MAX_HANDS,
+                              default_threads, args.warmup, model)
+    hand_frames = sum(1 for hands in reference if hands)
+    if not hand_frames:
+        print("⚠️  參考設定在片段中沒有偵測到手部，一致性無法比較，請使用錄有手部的片段")
+    missing_error = float('inf') if hand_frames else 0.0
+
+    combinations = list(product(args.resolutions, args.complexities, args.max_hands, args.threads))
+    candidates = []
+    for i, (resolution, complexity, max_hands, threads) in enumerate(combinations, 1):
+        summary, results = run_config(frames, resolution, complexity, max_hands, threads, args.warmup, model)
+        agreement, error = compare_landmarks(reference, results, max_hands)
+        candidate = {
+            'width': resolution[0],
+            'height': resolution[1],
+            'model_complexity': complexity,
+            'max_hands': max_hands,
+            'threads': threads,
+            'fps': summary['ops_per_sec'],
+            'p50_ms': summary['p50_ms'],
+            'p95_ms': summary['p95_ms'],
+            'agreement': agreement,
+            'landmark_error': error,
+        }
+        candidates.append(candidate)
+        print(f"🔄 {i}/{len(combinations)} {resolution[0]}x{resolution[1]} cx{complexity} "
+              f"手{max_hands} 緒{threads}: {candidate['fps']:.1f} FPS, p95 {candidate['p95_ms']:.1f} ms, "
+              f"一致 {agreement:.0%}")
+    cv2.setNumThreads(default_threads)
+
+    front = pareto_front(candidates, missing_error)
+    print_table(candidates, front)
+    best, within_budget = choose(front, args.target_fps, args.p95_budget_ms, missing_error)
+    if not within_budget:
+        print(f"\n⚠️  沒有組合達到 {args.target_fps:.0f} FPS 且 p95 ≤ {args.p95_budget_ms:.0f} ms，選擇最快的組合")
+
+    settings = {
+        'CAMERA_WIDTH': best['width'],
+        'CAMERA_HEIGHT': best['height'],
+        'MEDIAPIPE_MODEL_COMPLEXITY': best['model_complexity'],
+        'MEDIAPIPE_MAX_HANDS': best['max_hands'],
+        'OPENCV_NUM_THREADS': best['threads'],
+    }
+    print(f"\n✅ 最佳設定: {best['width']}x{best['height']}、complexity {best['model_complexity']}、"
+          f"最多 {best['max_hands']} 隻手、OpenCV {best['threads']} 執行緒"
+          f"（{best['fps']:.1f} FPS，p95 {best['p95_ms']:.1f} ms，一致 {best['agreement']:.0%}）")
+
+    if args.dry_run:
+        return 0
+    if not hand_frames and not args.force:
+        print("❌ 片段中沒有手部，結果只反映速度，未寫入設定檔（使用 --force 強制寫入）")
+        return 1
+
+    profile = {
+        'created': datetime.now().isoformat(),
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+        },
+        'source': args.source,
+        'frames': len(frames),
+        'hand_frames': hand_frames,
+        'target_fps': args.target_fps,
+        'p95_budget_ms': args.p95_budget_ms,
+        'within_budget': within_budget,
+        'settings': settings,
+        'result': best,
+        'pareto_front': front,
+        'candidates': candidates,
+    }
+    output = Path(args.output).expanduser()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2, ensure_ascii=False)
+    print(f"💾 設定檔已寫入: {output}（下次啟動 main.py 時載入）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
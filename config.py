@@ -4,25 +4,9 @@
 包含 Metal 加速和效能優化設置。
 """
 
+import json
 import os
 import platform
-from pathlib import Path
-
-# 優化 Matplotlib 載入速度（使用專案內預建快取）
-# 這樣可以完全跳過字型掃描,大幅加快啟動速度
-# 注意: 必須在 import matplotlib 之前設定
-_PROJECT_DIR = Path(__file__).parent
-_MPL_CACHE_DIR = _PROJECT_DIR / "mpl-cache"
-
-if _MPL_CACHE_DIR.exists():
-    # 使用 setdefault 避免覆蓋已存在的環境變數
-    os.environ.setdefault('MPLCONFIGDIR', str(_MPL_CACHE_DIR))
-    print(f"✅ 使用預建 Matplotlib 快取: {_MPL_CACHE_DIR}")
-else:
-    # 後備方案: 使用臨時目錄
-    os.environ.setdefault('MPLCONFIGDIR', '/tmp/matplotlib-gesture-demo')
-    print("⚠️  預建快取不存在，使用臨時目錄")
-    print(f"   提示: 執行 'python build_mpl_font_cache.py' 來生成快取")
 
 # 檢測作業系統
 IS_MACOS = platform.system() == "Darwin"
@@ -45,6 +29,21 @@ else:
 CAMERA_WIDTH = 640
 CAMERA_HEIGHT = 480
 CAMERA_FPS = 30
+CAMERA_NEGOTIATE = True  # 開啟攝影機時協商像素格式、幀率與緩衝區
+CAMERA_FOURCC_PREFERENCE = ("MJPG", "YUYV")  # 依序嘗試，第一個達成 CAMERA_FPS 的格式勝出
+CAMERA_BUFFER_SIZE = 1  # 驅動程式緩衝影格數，越少延遲越低
+CAMERA_NEGOTIATION_FRAMES = 15  # 每個格式量測的影格數
+CAMERA_CACHE_FILE = "~/.cache/gesture_recognition_demo/cameras.json"  # 攝影機列表與解析度快取
+CAMERA_HOTPLUG_ENABLED = True  # 監看攝影機插拔（Linux inotify，無法使用時輪詢 sysfs）
+CAMERA_HOTPLUG_POLL_MS = 2000
+
+# 鏡像預覽：偵測未翻轉的影格，關鍵點與左右手在座標上鏡像，預覽區繪製時再水平翻轉
+# False 時每個影格先以 cv2.flip 翻轉整張影像
+MIRROR_AT_DISPLAY = True
+
+# 影格緩衝池：擷取、翻轉、縮放與顯示轉換重複使用影像緩衝區
+# 每種尺寸最多保留的閒置緩衝區數，0 表示不重用（每個影格配置新陣列）
+FRAME_POOL_MAX_FREE_PER_SHAPE = 4
 
 # MediaPipe 設定
 MEDIAPIPE_MAX_HANDS = 2  # 支援雙手偵測
@@ -52,12 +51,100 @@ MEDIAPIPE_MIN_DETECTION_CONFIDENCE = 0.7
 MEDIAPIPE_MIN_TRACKING_CONFIDENCE = 0.5
 MEDIAPIPE_MODEL_COMPLEXITY = 0  # 0=lite(快速啟動), 1=full(更準確), 改為 0 加快啟動
 
+# OpenCV 執行緒數（cv2.setNumThreads），None 表示使用 OpenCV 預設（有執行緒預算時由預算決定）
+OPENCV_NUM_THREADS = None
+
+# 執行緒預算：整個程式同時可執行的執行緒數，推導 OpenCV 與 BLAS/OpenMP 的執行緒數
+# （分配方式見 utils/thread_budget.py），None 表示不限制；GESTURE_THREAD_BUDGET 環境變數可覆寫
+THREAD_BUDGET = None
+# CPU 親和性（僅 Linux），例如 {"ui": [0], "capture": [0], "detection": [1, 2, 3]}，None 表示不綁定
+THREAD_AFFINITY = None
+
+# 動態閘門：畫面靜止且上次沒有手時略過偵測
+MOTION_GATE_ENABLED = True
+MOTION_GATE_SIZE = (64, 48)  # 比較用縮圖尺寸 (寬, 高)
+MOTION_GATE_PIXEL_THRESHOLD = 12  # 灰階差超過此值的像素視為變化
+MOTION_GATE_MIN_CHANGED_RATIO = 0.005  # 變化像素比例達到此值時偵測
+MOTION_GATE_MAX_SKIP = 15  # 最多連續略過的影格數（約 0.5 秒強制偵測一次）
+
+# 閒置省電：沒有手部也沒有畫面變動一段時間後降低擷取與偵測頻率，有動靜立即恢復全速
+ACTIVITY_CONTROL_ENABLED = True
+ACTIVITY_IDLE_AFTER_S = 10  # 進入 idle 的秒數
+ACTIVITY_IDLE_INTERVAL_MS = 100  # ~10 FPS
+ACTIVITY_IDLE_DETECT_EVERY = 2  # 沒有畫面變動時每幾個影格偵測一次
+ACTIVITY_DEEP_IDLE_AFTER_S = 60  # 進入 deep_idle 的秒數
+ACTIVITY_DEEP_IDLE_INTERVAL_MS = 250  # ~4 FPS
+ACTIVITY_DEEP_IDLE_DETECT_EVERY = 4
+
+# 自適應品質：依影格延遲與 CPU 餘裕調整偵測輸入解析度、模型複雜度、手數與偵測間隔
+# 最高（起始）等級為上方 MEDIAPIPE_* 設定，只會往更輕的等級調整，階梯見 utils/quality_controller.py
+QUALITY_CONTROL_ENABLED = True
+QUALITY_TARGET_FPS = 30  # 平均影格延遲不可超過 1000 / 此值
+QUALITY_P95_BUDGET_MS = 40.0  # 影格延遲 p95 預算
+QUALITY_UPGRADE_RATIO = 0.6  # p95 低於預算的此比例才升級
+QUALITY_MIN_CPU_HEADROOM = 30.0  # 升級需要的系統 CPU 閒置 %
+QUALITY_DEGRADE_AFTER = 2  # 連續幾秒超過預算後降級
+QUALITY_UPGRADE_AFTER = 5  # 連續幾秒有餘裕後升級
+QUALITY_COOLDOWN_S = 3.0  # 每次調整後的冷卻秒數
+
+# 具名效能設定檔：覆寫上方的擷取、偵測、排程與 UI 設定
+# 執行期可由視窗的「效能模式」選單或 python control.py mode <名稱> 切換，只重建受影響的部分
+PERFORMANCE_PROFILE = "balanced"  # 啟動時套用（main.py --profile 可覆寫）
+PERFORMANCE_PROFILES = {
+    "balanced": {},  # 使用上方設定
+    "low_latency": {
+        "CAMERA_BUFFER_SIZE": 1,
+        "MEDIAPIPE_MODEL_COMPLEXITY": 0,
+        "MEDIAPIPE_MAX_HANDS": 1,
+        "MOTION_GATE_MIN_CHANGED_RATIO": 0.002,
+        "MOTION_GATE_MAX_SKIP": 5,
+        "ACTIVITY_CONTROL_ENABLED": False,
+        "QUALITY_P95_BUDGET_MS": 25.0,
+    },
+    "low_power": {
+        "CAMERA_FPS": 15,
+        "UI_UPDATE_INTERVAL_MS": 66,
+        "MEDIAPIPE_MODEL_COMPLEXITY": 0,
+        "MEDIAPIPE_MAX_HANDS": 1,
+        "MOTION_GATE_MAX_SKIP": 30,
+        "ACTIVITY_IDLE_AFTER_S": 3,
+        "ACTIVITY_DEEP_IDLE_AFTER_S": 20,
+        "QUALITY_TARGET_FPS": 15,
+        "QUALITY_P95_BUDGET_MS": 60.0,
+        "PERF_UPDATE_INTERVAL_MS": 2000,
+    },
+    "high_accuracy": {
+        "MEDIAPIPE_MODEL_COMPLEXITY": 1,
+        "MEDIAPIPE_MAX_HANDS": 2,
+        "MOTION_GATE_ENABLED": False,
+        "ACTIVITY_CONTROL_ENABLED": False,
+        "QUALITY_CONTROL_ENABLED": False,
+    },
+}
+PROFILE_PARKED_DETECTORS = 2  # 切換設定檔時保留的暖機偵測器數量，切回時不必重建
+
+# 偵測常駐程式（python detection_daemon.py），連線失敗或偵測中斷時改用本機偵測器
+DETECTION_DAEMON_ENABLED = False
+DETECTION_DAEMON_SOCKET = None  # None 表示 <暫存目錄>/gesture-detector.sock
+DETECTION_DAEMON_IDLE_TIMEOUT_S = 300  # 閒置偵測器保留秒數
+DETECTION_DAEMON_FRAME_TIMEOUT_S = 0.5  # 每個影格等待偵測結果的秒數，逾時改用本機偵測器
+
 # UI 更新頻率
 UI_UPDATE_INTERVAL_MS = 33  # ~30 FPS
 
 # 效能監控更新頻率
 PERF_UPDATE_INTERVAL_MS = 1000  # 1 秒
 
+# 影格管線追蹤（Chrome Trace，也可用 main.py --trace 啟用）
+TRACE_ENABLED = False
+
+# 執行期控制通道（control.py / kill -USR1、-USR2）
+CONTROL_SOCKET_ENABLED = True
+PROFILE_WINDOW_SECONDS = 30  # cProfile / tracemalloc 預設分析秒數
+
+# 共享記憶體即時指標（monitor.py --pid、performance_profiler.py 讀取）
+METRICS_CHANNEL_ENABLED = True
+
 # 效能警告閾值
 PERF_CPU_WARNING = 70.0  # CPU %
 PERF_CPU_DANGER = 100.0
@@ -65,3 +152,37 @@ PERF_MEMORY_WARNING = 500.0  # MB
 PERF_MEMORY_DANGER = 1000.0
 PERF_GPU_WARNING = 70.0  # GPU %
 PERF_GPU_DANGER = 90.0
+
+# 硬體校準設定檔（python calibrate.py 產生），存在時覆寫上方的同名設定
+CALIBRATION_PROFILE_FILE = "~/.config/gesture_recognition_demo/calibration.json"
+CALIBRATION_PROFILE_KEYS = (
+    "CAMERA_WIDTH",
+    "CAMERA_HEIGHT",
+    "MEDIAPIPE_MODEL_COMPLEXITY",
+    "MEDIAPIPE_MAX_HANDS",
+    "OPENCV_NUM_THREADS",
+)
+CALIBRATION_PROFILE = None  # 載入的設定檔內容
+
+_profile_path = os.path.expanduser(CALIBRATION_PROFILE_FILE)
+if os.path.exists(_profile_path) and not os.environ.get("GESTURE_IGNORE_CALIBRATION"):
+    try:
+        with open(_profile_path, encoding="utf-8") as _f:
+            _profile = json.load(_f)
+        if not isinstance(_profile, dict) or not isinstance(_profile.get("settings"), dict):
+            raise ValueError("格式錯誤，應為包含 settings 物件的 JSON 物件")
+        CALIBRATION_PROFILE = _profile
+        for _key, _value in CALIBRATION_PROFILE["settings"].items():
+            if _key in CALIBRATION_PROFILE_KEYS:
+                globals()[_key] = _value
+        print(f"🎛️  已載入硬體校準設定: {CAMERA_WIDTH}x{CAMERA_HEIGHT}, "
+              f"complexity {MEDIAPIPE_MODEL_COMPLEXITY}, 最多 {MEDIAPIPE_MAX_HANDS} 隻手")
+    except (OSError, ValueError) as _e:
+        print(f"⚠️  無法讀取硬體校準設定 {_profile_path}: {_e}")
+
+# 執行緒預算的 BLAS / OpenMP 上限必須在匯入 numpy / OpenCV 之前設定
+if os.environ.get("GESTURE_THREAD_BUDGET"):
+    THREAD_BUDGET = int(os.environ["GESTURE_THREAD_BUDGET"])
+if THREAD_BUDGET is not None:
+    from utils.thread_budget import apply_env_limits, plan_threads
+    apply_env_limits(plan_threads(THREAD_BUDGET, OPENCV_NUM_THREADS))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+執行中程式的控制工具
+
+透過本機 Unix socket 對執行中的 main.py 下命令，不需重新啟動。
+
+範例：
+    python control.py profile 30        # cProfile 分析 30 秒
+    python control.py tracemalloc 60    # 追蹤記憶體配置 60 秒
+    python control.py --pid 1234 status
+    python control.py help
+
+也可以直接送訊號：
+    kill -USR1 <pid>   # 開關 cProfile
+    kill -USR2 <pid>   # 開關 tracemalloc
+"""
+
+import argparse
+import glob
+import socket
+import sys
+import tempfile
+from pathlib import Path
+
+SOCKET_PREFIX = "gesture-demo-"
+
+
+def find_socket(pid=None):
+    """尋找控制 socket，未指定 PID 時使用唯一一個執行中的程式"""
+    directory = Path(tempfile.gettempdir())
+    if pid is not None:
+        path = directory / f"{SOCKET_PREFIX}{pid}.sock"
+        return path if path.exists() else None
+
+    candidates = sorted(glob.glob(str(directory / f"{SOCKET_PREFIX}*.sock")))
+    if len(candidates) == 1:
+        return Path(candidates[0])
+    if len(candidates) > 1:
+        print("⚠️  找到多個執行中的程式，請以 --pid 指定：")
+        for candidate in candidates:
+            print(f"   {candidate}")
+    return None
+
+
+def send_command(path, command, timeout=10.0):
+    """送出命令並讀取回應"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall((command + "\n").encode("utf-8"))
+
+        chunks = []
+        while True:
+            data = sock.recv(4096)
+            if not data:
+                break
+            chunks.append(data)
+    return b"".join(chunks).decode("utf-8", errors="replace").rstrip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="手勢識別 Demo 控制工具")
+    parser.add_argument("--pid", type=int, help="目標程式的 PID")
+    parser.add_argument("command", nargs="+", help="命令與參數，例如 profile 30")
+    args = parser.parse_args()
+
+    path = find_socket(args.pid)
+    if path is None:
+        print("❌ 找不到執行中的程式（控制 socket 不存在）")
+        sys.exit(1)
+
+    try:
+        print(send_command(path, " ".join(args.command)))
+    except OSError as e:
+        print(f"❌ 無法連線 {path}: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+"""
+手部偵測常駐程式
+
+常駐載入 MediaPipe 並保留暖機完成的 HandDetector，
+main.py（config.DETECTION_DAEMON_ENABLED = True）重新啟動時直接借用，
+幾毫秒內就能開始偵測，不必再等待匯入、建立計算圖與載入模型。
+
+影格透過用戶端建立的共享記憶體傳遞，socket 只傳送小型 JSON 控制訊息
+（協定見 utils/remote_detector.py）。每個連線獨佔一個偵測器，
+連線結束後偵測器回到閒置池，閒置超過 --idle-timeout 秒即關閉釋放記憶體。
+
+使用方式：
+    python detection_daemon.py                      # 預熱一個預設設定的偵測器
+    python detection_daemon.py --prewarm 2 --idle-timeout 600
+    python detection_daemon.py --status
+"""
+
+import argparse
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+import config  # 執行緒預算的環境變數必須在匯入 numpy 之前設定
+
+import numpy as np
+
+from utils.hand_detector import HandDetector, MEDIAPIPE_AVAILABLE
+from utils.thread_budget import pin_current_thread, plan_threads
+from utils.remote_detector import (
+    attach_shared_memory,
+    daemon_status,
+    default_socket_path,
+    recv_message,
+    send_message,
+)
+
+
+def options_key(options: dict) -> str:
+    return json.dumps(options, sort_keys=True)
+
+
+def default_options() -> dict:
+    return {
+        'max_num_hands': config.MEDIAPIPE_MAX_HANDS,
+        'min_detection_confidence': config.MEDIAPIPE_MIN_DETECTION_CONFIDENCE,
+        'min_tracking_confidence': config.MEDIAPIPE_MIN_TRACKING_CONFIDENCE,
+        'model_complexity': config.MEDIAPIPE_MODEL_COMPLEXITY,
+    }
+
+
+class DetectorPool:
+    """依設定分組的暖機偵測器池"""
+
+    def __init__(self, idle_timeout: float, warmup_shape=(480, 640, 3)):
+        self.idle_timeout = idle_timeout
+        self.warmup_shape = warmup_shape
+        self.lock = threading.Lock()
+        self.idle = {}       # key -> [(detector, 閒置開始時間), ...]
+        self.in_use = 0
+        self.created = 0
+        self.reused = 0
+        self.reclaimed = 0
+
+    def create(self, options: dict) -> HandDetector:
+        """建立偵測器並以空白影格跑一次，讓計算圖與推論後端完成初始化"""
+        start = time.perf_counter()
+        detector = HandDetector(**options)
+        detector.detect(np.zeros(self.warmup_shape, dtype=np.uint8))
+        with self.lock:
+            self.created += 1
+        print(f"🔥 建立偵測器 {options}（{(time.perf_counter() - start) * 1000:.0f} ms）", flush=True)
+        return detector
+
+    def prewarm(self, options: dict, count: int):
+        for _ in range(count):
+            self.release(options, self.create(options))
+
+    def acquire(self, options: dict):
+        """取得偵測器，回傳 (detector, 是否為暖機好的偵測器)"""
+        key = options_key(options)
+        with self.lock:
+            idle = self.idle.get(key)
+            if idle:
+                detector, _ = idle.pop()
+                self.in_use += 1
+                self.reused += 1
+                return detector, True
+        detector = self.create(options)
+        with self.lock:
+            self.in_use += 1
+        return detector, False
+
+    def release(self, options: dict, detector: HandDetector, in_use: bool = False):
+        with self.lock:
+            if in_use:
+                self.in_use -= 1
+            self.idle.setdefault(options_key(options), []).append((detector, time.monotonic()))
+
+    def reclaim(self) -> int:
+        """關閉閒置超過 idle_timeout 的偵測器"""
+        now = time.monotonic()
+        expired = []
+        with self.lock:
+            for key, idle in self.idle.items():
+                keep = []
+                for detector, since in idle:
+                    if now - since > self.idle_timeout:
+                        expired.append(detector)
+                    else:
+                        keep.append((detector, since))
+                self.idle[key] = keep
+            self.reclaimed += len(expired)
+        for detector in expired:
+            detector.close()
+        if expired:
+            print(f"♻️  回收 {len(expired)} 個閒置偵測器", flush=True)
+        return len(expired)
+
+    def status(self) -> dict:
+        with self.lock:
+            return {
+                'idle': sum(len(idle) for idle in self.idle.values()),
+                'in_use': self.in_use,
+                'created': self.created,
+                'reused': self.reused,
+                'reclaimed': self.reclaimed,
+                'idle_timeout': self.idle_timeout,
+            }
+
+    def close(self):
+        with self.lock:
+            detectors = [detector for idle in self.idle.values() for detector, _ in idle]
+            self.idle.clear()
+        for detector in detectors:
+            detector.close()
+
+
+class DetectionHandler(socketserver.BaseRequestHandler):
+    """一個用戶端連線：借用一個偵測器，處理到連線結束"""
+
+    def setup(self):
+        self.detector = None
+        self.options = None
+        self.shm = None
+        self.frame = None
+
+    def handle(self):
+        pool = self.server.pool
+        while True:
+            try:
+                message = recv_message(self.request)
+            except (OSError, ValueError):
+                break
+            if message is None:
+                break
+            try:
+                reply = self.dispatch(pool, message)
+            except Exception as e:
+                reply = {'ok': False, 'error': str(e)}
+            try:
+                send_message(self.request, reply)
+            except OSError:
+                break
+            if message.get('op') == 'close':
+                break
+
+    def dispatch(self, pool: DetectorPool, message: dict) -> dict:
+        op = message.get('op')
+        if op == 'detect':
+            return self.detect()
+        if op == 'open':
+            if self.detector is not None:
+                raise RuntimeError("已開啟偵測器")
+            self.options = {**default_options(), **message.get('options', {})}
+            self.detector, warm = pool.acquire(self.options)
+            return {'ok': True, 'warm': warm}
+        if op == 'buffer':
+            self.attach(message)
+            return {'ok': True}
+        if op == 'status':
+            return {'ok': True, 'pid': os.getpid(), **pool.status()}
+        if op == 'close':
+            self.finish()
+            return {'ok': True}
+        raise ValueError(f"未知的命令: {op}")
+
+    def attach(self, message: dict):
+        self.detach()
+        self.shm = attach_shared_memory(message['shm'])
+        self.frame = np.ndarray(tuple(message['shape']), dtype=np.uint8, buffer=self.shm.buf)
+
+    def detach(self):
+        if self.shm is not None:
+            self.frame = None
+            self.shm.close()
+            self.shm = None
+
+    def detect(self) -> dict:
+        if self.detector is None or self.frame is None:
+            raise RuntimeError("尚未開啟偵測器")
+        landmarks_list = self.detector.detect(self.frame)
+        hands = [landmarks.tolist() for landmarks in landmarks_list or []]
+        return {
+            'ok': True,
+            'hands': hands,
+            'handedness': self.detector.get_hand_info() if hands else [],
+        }
+
+    def finish(self):
+        if self.detector is not None:
+            self.server.pool.release(self.options, self.detector, in_use=True)
+            self.detector = None
+        self.detach()
+
+
+class DetectionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def reaper(pool: DetectorPool, stop: threading.Event):
+    interval = max(1.0, min(pool.idle_timeout / 4, 30.0))
+    while not stop.wait(interval):
+        pool.reclaim()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="手部偵測常駐程式")
+    parser.add_argument("--socket", default=config.DETECTION_DAEMON_SOCKET,
+                        help="Unix socket 路徑（預設 <暫存目錄>/gesture-detector.sock）")
+    parser.add_argument("--prewarm", type=int, default=1, help="啟動時預熱的偵測器數量（使用 config 設定）")
+    parser.add_argument("--idle-timeout", type=float, default=config.DETECTION_DAEMON_IDLE_TIMEOUT_S,
+                        help="閒置偵測器保留秒數")
+    parser.add_argument("--status", action="store_true", help="查詢執行中常駐程式的狀態")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    path = Path(args.socket) if args.socket else default_socket_path()
+
+    if args.status:
+        status = daemon_status(path)
+        if status is None:
+            print(f"❌ 常駐程式未執行（{path}）")
+            return 1
+        print(json.dumps(status, indent=2, ensure_ascii=False))
+        return 0
+
+    if not MEDIAPIPE_AVAILABLE:
+        print("❌ MediaPipe 未安裝")
+        return 1
+    if daemon_status(path) is not None:
+        print(f"❌ 已有常駐程式在執行（{path}）")
+        return 1
+    if path.exists():
+        path.unlink()  # 前一次異常結束留下的 socket
+
+    # 在建立任何執行緒之前綁定 detection 核心，之後的偵測器與連線執行緒都會繼承
+    try:
+        plan = plan_threads(config.THREAD_BUDGET, config.OPENCV_NUM_THREADS, config.THREAD_AFFINITY)
+    except ValueError as e:
+        print(f"❌ 執行緒設定無效: {e}")
+        return 1
+    if pin_current_thread(plan.cores("detection")):
+        print(f"🧵 偵測常駐程式綁定 CPU {','.join(map(str, plan.cores('detection')))}")
+
+    pool = DetectorPool(args.idle_timeout)
+    pool.prewarm(default_options(), args.prewarm)
+
+    server = DetectionServer(str(path), DetectionHandler)
+    server.pool = pool
+    stop = threading.Event()
+    threading.Thread(target=reaper, args=(pool, stop), daemon=True).start()
+
+    def shutdown(*_):
+        # serve_forever 在主執行緒，shutdown 必須由其他執行緒呼叫
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    print(f"🛰️  偵測常駐程式已啟動: {path}（PID {os.getpid()}，閒置 {args.idle_timeout:.0f} 秒回收）",
+          flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
+        if path.exists():
+            path.unlink()
+        pool.close()
+        print("⏹️  偵測常駐程式已停止")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+效能紀錄歷史工具
+
+查詢 performance_logs/history.sqlite 中的執行紀錄，並以 bootstrap
+信賴區間比較兩組重複執行，分辨真正的退步與一般的量測雜訊。
+每邊至少需要 3 次執行（同一次執行內的樣本無法反映執行之間的雜訊），
+可用逗號、範圍或 label:標籤 指定一組執行。
+
+範例：
+    python history.py list
+    python history.py compare latest~5,latest~4,latest~3 latest~2,latest~1,latest
+    python history.py compare 3-5 7-9 --kind microbench
+    python history.py compare label:before label:after
+    python history.py import performance_logs/performance_raw_*.json
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from utils.perf_history import (
+    DEFAULT_DB_PATH, MIN_REPLICATES, PerfHistory, microbench_samples, profiler_samples
+)
+
+
+def cmd_list(history, args):
+    runs = history.list_runs(args.kind, args.limit)
+    if not runs:
+        print("尚無紀錄")
+        return 0
+
+    print(f"{'#':>4}  {'類型':<11}{'時間':<21}{'commit':<10}{'標籤'}")
+    print("-" * 64)
+    for run in runs:
+        commit = (run['git_commit'] or "-")[:8]
+        if run['git_dirty']:
+            commit += "*"
+        print(f"{run['id']:>4}  {run['kind']:<11}{run['created_at']:<21}{commit:<10}{run['label'] or ''}")
+    return 0
+
+
+def cmd_show(history, args):
+    run_id = history.resolve(args.run, args.kind)
+    run = history.get_run(run_id) if run_id else None
+    if not run:
+        print(f"❌ 找不到執行紀錄: {args.run}")
+        return 1
+
+    print(f"執行 #{run['id']} ({run['kind']}) {run['created_at']}")
+    print(f"  commit: {run['git_commit']}{' (有未提交修改)' if run['git_dirty'] else ''}")
+    system = json.loads(run['system_json'] or "{}")
+    print(f"  機器: {system.get('platform')} {system.get('architecture')}, "
+          f"{system.get('cpu_count')} 核心, {system.get('total_memory_gb')} GB")
+    print()
+    for metric, values in sorted(history.get_samples(run_id).items()):
+        mean = sum(values) / len(values)
+        print(f"  {metric:<44} 平均 {mean:10.4f}  (n={len(values)})")
+    return 0
+
+
+def _config_diff(history, base_id, new_id):
+    base = json.loads(history.get_run(base_id)['config_json'] or "{}")
+    new = json.loads(history.get_run(new_id)['config_json'] or "{}")
+    return {
+        key: (base.get(key), new.get(key))
+        for key in sorted(set(base) | set(new))
+        if base.get(key) != new.get(key)
+    }
+
+
+def _describe_runs(history, run_ids):
+    runs = [history.get_run(run_id) for run_id in run_ids]
+    commits = sorted({(run['git_commit'] or '-')[:8] for run in runs})
+    return (f"#{', #'.join(map(str, run_ids))}（{len(runs)} 次，{runs[0]['kind']}，"
+            f"commit {', '.join(commits)}）")
+
+
+def cmd_compare(history, args):
+    base_ids = history.resolve_runs(args.base, args.kind)
+    new_ids = history.resolve_runs(args.new, args.kind)
+    if not base_ids or not new_ids:
+        print("❌ 找不到要比較的執行紀錄")
+        return 1
+
+    print(f"基準 {_describe_runs(history, base_ids)}")
+    print(f"比較 {_describe_runs(history, new_ids)}")
+    if min(len(base_ids), len(new_ids)) < MIN_REPLICATES:
+        print(f"⚠️  每邊至少需要 {MIN_REPLICATES} 次執行才能判斷顯著性：同一次執行內的樣本彼此相關，"
+              f"不包含執行之間的雜訊。以下只列出變化，不判定改善或退步")
+
+    if len({history.get_run(run_id)['system_json'] for run_id in base_ids + new_ids}) > 1:
+        print("⚠️  執行之間的機器資訊不同，比較結果可能受硬體影響")
+    changed = _config_diff(history, base_ids[-1], new_ids[-1])
+    if changed:
+        print("⚙️  config 差異: " + ", ".join(f"{k}: {a} → {b}" for k, (a, b) in changed.items()))
+
+    rows = history.compare(base_ids, new_ids, args.confidence, args.min_effect)
+    if not rows:
+        print("\n兩邊的執行沒有共同的指標")
+        return 1
+
+    ci_label = f"{args.confidence:.0%} 信賴區間"
+    print(f"\n{'指標':<44}{'基準':>11}{'比較':>11}{'變化':>9}  {ci_label:<20}結論")
+    print("-" * 108)
+    regressions = 0
+    for row in rows:
+        if row['ci_low'] is None:
+            ci_text = "-"
+        else:
+            ci_text = f"[{row['ci_low']:+.1%}, {row['ci_high']:+.1%}]"
+        icon = {"退步": "❌", "改善": "✅"}.get(row['verdict'], "  ")
+        print(f"{row['metric']:<44}{row['base_mean']:>11.4f}{row['new_mean']:>11.4f}"
+              f"{row['change']:>+9.1%}  {ci_text:<22}{icon} {row['verdict']}")
+        if row['verdict'] == "退步":
+            regressions += 1
+
+    print()
+    if regressions:
+        print(f"❌ {regressions} 個指標有統計上顯著的退步")
+        return 1 if args.fail_on_regression else 0
+    if min(len(base_ids), len(new_ids)) < MIN_REPLICATES:
+        print(f"ℹ️  重複次數不足，未判定顯著性（每邊以相同 --label 重複執行至少 {MIN_REPLICATES} 次）")
+        return 0
+    print("✅ 沒有統計上顯著的退步")
+    return 0
+
+
+def cmd_import(history, args):
+    """匯入既有的 JSON 報告（performance_raw_*.json、microbench_*.json）"""
+    imported = 0
+    for name in args.files:
+        path = Path(name)
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        created_at = None
+        match = re.search(r"(\d{8})_(\d{6})", path.name)
+        if match:
+            d, t = match.groups()
+            created_at = f"{d[:4]}-{d[4:6]}-{d[6:]}T{t[:2]}:{t[2:4]}:{t[4:]}"
+
+        if "benchmarks" in data:
+            kind, samples = "microbench", microbench_samples(data)
+        elif "phase1_idle" in data and isinstance(data["phase1_idle"], list):
+            kind, samples = "profiler", profiler_samples(data)
+        else:
+            print(f"⚠️  略過 {path}（只支援原始數據檔，例如 performance_raw_*.json）")
+            continue
+
+        # 匯入的舊檔案沒有當時的 config 與機器資訊，留空而不是填入現在的值
+        run_id = history.record_run(
+            kind, samples, label=args.label or path.name,
+            config={}, system_info={}, created_at=created_at
+        )
+        print(f"✅ {path} → run #{run_id} ({kind})")
+        imported += 1
+
+    print(f"\n共匯入 {imported} 個檔案")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="效能紀錄歷史工具")
+    parser.add_argument("--db", default=str(DEFAULT_DB_PATH), help="SQLite 資料庫路徑")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    kind_parser = argparse.ArgumentParser(add_help=False)
+    kind_parser.add_argument("--kind", help="只看特定類型（benchmark / microbench / profiler）")
+
+    list_parser = subparsers.add_parser("list", parents=[kind_parser], help="列出執行紀錄")
+    list_parser.add_argument("--limit", type=int, default=20)
+
+    show_parser = subparsers.add_parser("show", parents=[kind_parser], help="顯示一次執行的指標")
+    show_parser.add_argument("run", help="執行編號、latest 或 latest~N")
+
+    compare_parser = subparsers.add_parser("compare", parents=[kind_parser], help="比較兩組重複執行")
+    compare_parser.add_argument("base", help="基準的重複執行（例如 3,4,5、3-5、latest~5,latest~4,latest~3 或 label:before）")
+    compare_parser.add_argument("new", help="比較的重複執行（格式同上）")
+    compare_parser.add_argument("--confidence", type=float, default=0.95, help="信賴水準")
+    compare_parser.add_argument(
+        "--min-effect", type=float, default=0.02,
+        help="視為有意義的最小相對變化（0.02 = 2%%）"
+    )
+    compare_parser.add_argument(
+        "--fail-on-regression", action="store_true",
+        help="有顯著退步時回傳非零狀態碼"
+    )
+
+    import_parser = subparsers.add_parser("import", help="匯入既有的 JSON 報告")
+    import_parser.add_argument("files", nargs="+")
+    import_parser.add_argument("--label", help="標籤（預設為檔名）")
+
+    args = parser.parse_args()
+    history = PerfHistory(args.db)
+    try:
+        handler = {
+            "list": cmd_list,
+            "show": cmd_show,
+            "compare": cmd_compare,
+            "import": cmd_import,
+        }[args.command]
+        return handler(history, args)
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+多串流壓力測試
+
+同時執行 1..N 個模擬的手勢串流，每個串流都有自己的 HandDetector 與 DummyModel，
+以攝影機的幀率餵入錄製或合成的畫面，走完整的「翻轉 → 偵測 → 繪製 → 識別」流程。
+逐步增加串流數量，量測總吞吐量、p99 延遲與每個串流的 CPU 使用，
+找出在延遲 SLO 之內單機可以承載的串流數。
+
+範例：
+    python load_test.py --max-streams 8 --duration 20
+    python load_test.py --source recordings/hands.mp4 --mode thread --slo-ms 50
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from utils.perf_stats import summarize_latencies
+
+
+def run_stream(stream_id, args, ready, start_event, results):
+    """單一串流的工作函式（執行緒或子進程皆可使用）
+
+    Args:
+        stream_id: 串流編號
+        args: 測試參數（dict）
+        ready: 初始化與暖機完成後回報的佇列
+        start_event: 所有串流初始化完成後一起開始
+        results: 回傳結果的佇列
+    """
+    import cv2
+    from models.gesture_model import DummyModel
+    from utils.frame_source import open_frame_source
+    from utils.hand_detector import HandDetector
+
+    source = open_frame_source(args['source'], args['width'], args['height'])
+    # 錄製影片從不同位置開始，避免所有串流處理完全相同的畫面
+    for _ in range(stream_id * 7):
+        source.read()
+
+    detector = HandDetector(
+        max_num_hands=args['max_hands'],
+        model_complexity=args['model_complexity']
+    )
+    model = DummyModel()
+    model.load_model()
+
+    def process_frame():
+        ret, frame = source.read()
+        if not ret:
+            return False
+        frame = cv2.flip(frame, 1)
+        landmarks_list = detector.detect(frame)
+        detector.draw_landmarks(frame)
+        if landmarks_list:
+            for landmarks in landmarks_list:
+                model.predict(landmarks)
+        return bool(landmarks_list)
+
+    # 暖機（不計入結果）
+    for _ in range(args['warmup_frames']):
+        process_frame()
+
+    ready.put(stream_id)
+    start_event.wait()
+
+    interval = 1.0 / args['fps']
+    latencies_ms = []
+    frames = 0
+    dropped = 0
+    detections = 0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    next_tick = wall_start
+
+    while True:
+        now = time.perf_counter()
+        if now - wall_start >= args['duration']:
+            break
+        if now < next_tick:
+            time.sleep(next_tick - now)
+
+        frame_start = time.perf_counter()
+        if process_frame():
+            detections += 1
+        latencies_ms.append((time.perf_counter() - frame_start) * 1000)
+        frames += 1
+
+        # 處理速度跟不上幀率時，錯過的幀視為丟棄
+        next_tick += interval
+        behind = time.perf_counter() - next_tick
+        if behind > interval:
+            missed = int(behind / interval)
+            dropped += missed
+            next_tick += missed * interval
+
+    wall = time.perf_counter() - wall_start
+    detector.close()
+    source.release()
+
+    results.put({
+        'stream_id': stream_id,
+        'latencies_ms': latencies_ms,
+        'frames': frames,
+        'dropped': dropped,
+        'detections': detections,
+        'wall_seconds': wall,
+        # 進程模式下 process_time 包含 MediaPipe 內部執行緒
+        'cpu_seconds': time.process_time() - cpu_start,
+    })
+
+
+def wait_ready(workers, ready, timeout):
+    """等待所有串流完成初始化與暖機
+
+    Returns:
+        未能啟動的串流編號（初始化時結束或逾時），全部就緒時為空
+    """
+    started = set()
+    deadline = time.monotonic() + timeout
+    while len(started) < len(workers):
+        try:
+            started.add(ready.get(timeout=0.5))
+            continue
+        except queue.Empty:
+            pass
+        exited = any(not worker.is_alive() for i, worker in enumerate(workers) if i not in started)
+        if exited or time.monotonic() >= deadline:
+            return sorted(set(range(len(workers))) - started)
+    return []
+
+
+def stop_workers(workers):
+    """結束子進程（執行緒模式的工作執行緒為 daemon，程式結束時一併結束）"""
+    for worker in workers:
+        if isinstance(worker, multiprocessing.process.BaseProcess) and worker.is_alive():
+            worker.terminate()
+    for worker in workers:
+        worker.join(timeout=5)
+
+
+def run_level(streams, args):
+    """以指定串流數執行一輪測試並彙整結果
+
+    Raises:
+        RuntimeError: 有串流未能啟動或沒有回傳結果（已結束所有子進程）
+    """
+    if args['mode'] == "process":
+        context = multiprocessing.get_context("spawn")
+        ready = context.Queue()
+        start_event = context.Event()
+        results = context.Queue()
+        workers = [
+            context.Process(target=run_stream, args=(i, args, ready, start_event, results))
+            for i in range(streams)
+        ]
+    else:
+        ready = queue.Queue()
+        start_event = threading.Event()
+        results = queue.Queue()
+        workers = [
+            threading.Thread(target=run_stream, args=(i, args, ready, start_event, results), daemon=True)
+            for i in range(streams)
+        ]
+
+    for worker in workers:
+        worker.start()
+
+    # 等待所有串流完成初始化與暖機，讓量測區間內所有串流同時執行
+    failed = wait_ready(workers, ready, args['init_timeout'])
+    if failed:
+        stop_workers(workers)
+        raise RuntimeError(f"串流 {', '.join(map(str, failed))} 未能啟動")
+
+    cpu_before = time.process_time()
+    start_event.set()
+
+    stream_results = []
+    try:
+        for _ in range(streams):
+            stream_results.append(results.get(timeout=args['duration'] + args['init_timeout']))
+    except queue.Empty:
+        stop_workers(workers)
+        finished = {r['stream_id'] for r in stream_results}
+        missing = sorted(set(range(streams)) - finished)
+        raise RuntimeError(f"串流 {', '.join(map(str, missing))} 沒有回傳結果") from None
+    for worker in workers:
+        worker.join(timeout=10)
+    process_cpu = time.process_time() - cpu_before
+
+    latencies = [lat for r in stream_results for lat in r['latencies_ms']]
+    total_frames = sum(r['frames'] for r in stream_results)
+    wall = max(r['wall_seconds'] for r in stream_results)
+
+    if args['mode'] == "process":
+        cpu_seconds = sum(r['cpu_seconds'] for r in stream_results)
+    else:
+        # 執行緒共用進程，只能以整體 CPU 時間平均分攤
+        cpu_seconds = process_cpu
+
+    summary = summarize_latencies(latencies)
+    per_stream_fps = total_frames / wall / streams if wall > 0 else 0.0
+    expected = args['fps'] * wall * streams
+    level = {
+        'streams': streams,
+        'throughput_fps': total_frames / wall if wall > 0 else 0.0,
+        'per_stream_fps': per_stream_fps,
+        'latency': summary,
+        'dropped_frames': sum(r['dropped'] for r in stream_results),
+        'drop_rate': sum(r['dropped'] for r in stream_results) / expected if expected else 0.0,
+        'detection_rate': sum(r['detections'] for r in stream_results) / total_frames if total_frames else 0.0,
+        'cpu_percent_per_stream': cpu_seconds / wall / streams * 100 if wall > 0 else 0.0,
+    }
+    level['slo_ok'] = (
+        summary.get('p99_ms', float('inf')) <= args['slo_ms']
+        and per_stream_fps >= args['fps'] * args['min_fps_ratio']
+    )
+    return level
+
+
+def parse_args():
+    import config
+
+    parser = argparse.ArgumentParser(description="多串流壓力測試")
+    parser.add_argument("--source", default="synthetic", help="影像來源：影片檔、圖片資料夾或 synthetic")
+    parser.add_argument("--min-streams", type=int, default=1)
+    parser.add_argument("--max-streams", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--step", type=int, default=1, help="每輪增加的串流數")
+    parser.add_argument("--duration", type=float, default=15, help="每輪秒數")
+    parser.add_argument("--fps", type=float, default=config.CAMERA_FPS, help="每個串流的目標幀率")
+    parser.add_argument("--mode", choices=["process", "thread"], default="process")
+    parser.add_argument("--slo-ms", type=float, default=config.UI_UPDATE_INTERVAL_MS,
+                        help="p99 延遲 SLO（毫秒）")
+    parser.add_argument("--min-fps-ratio", type=float, default=0.95,
+                        help="每個串流至少要達到目標幀率的比例")
+    parser.add_argument("--model-complexity", type=int, default=config.MEDIAPIPE_MODEL_COMPLEXITY)
+    parser.add_argument("--max-hands", type=int, default=config.MEDIAPIPE_MAX_HANDS)
+    parser.add_argument("--width", type=int, default=config.CAMERA_WIDTH)
+    parser.add_argument("--height", type=int, default=config.CAMERA_HEIGHT)
+    parser.add_argument("--warmup-frames", type=int, default=10)
+    parser.add_argument("--init-timeout", type=float, default=120,
+                        help="等待串流初始化的最長秒數")
+    parser.add_argument("--stop-on-violation", action="store_true",
+                        help="超過 SLO 後停止增加串流")
+    parser.add_argument("--output", help="結果 JSON 路徑")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    params = vars(args).copy()
+
+    print("\n" + "🏋️ 多串流壓力測試".center(60, "="))
+    print(f"來源: {args.source} | 模式: {args.mode} | 目標 {args.fps:.0f} FPS/串流 | "
+          f"SLO p99 ≤ {args.slo_ms:.0f} ms")
+    print(f"CPU 核心: {os.cpu_count()}\n")
+
+    header = f"{'串流':>4}{'吞吐 FPS':>11}{'每串流 FPS':>12}{'p50 ms':>9}{'p99 ms':>9}{'丟幀':>8}{'CPU%/串流':>11}  SLO"
+    print(header)
+    print("-" * 72)
+
+    levels = []
+    error = None
+    for streams in range(args.min_streams, args.max_streams + 1, args.step):
+        try:
+            level = run_level(streams, params)
+        except RuntimeError as e:
+            error = f"{streams} 個串流: {e}"
+            print(f"{streams:>4}  ❌ {e}")
+            break
+        levels.append(level)
+        latency = level['latency']
+        print(f"{streams:>4}{level['throughput_fps']:>11.1f}{level['per_stream_fps']:>12.1f}"
+              f"{latency.get('p50_ms', 0):>9.1f}{latency.get('p99_ms', 0):>9.1f}"
+              f"{level['drop_rate']:>8.1%}{level['cpu_percent_per_stream']:>11.1f}  "
+              f"{'✅' if level['slo_ok'] else '❌'}")
+        if args.stop_on_violation and not level['slo_ok']:
+            break
+
+    passing = [level['streams'] for level in levels if level['slo_ok']]
+    capacity = max(passing) if passing else 0
+    print(f"\n🎯 符合 SLO 的最大串流數: {capacity}")
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'parameters': params,
+        'cpu_count': os.cpu_count(),
+        'capacity_streams': capacity,
+        'levels': levels,
+        'error': error,
+    }
+    output = Path(args.output) if args.output else Path(
+        f"performance_logs/load_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"💾 結果已儲存: {output}")
+    return 1 if error else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,10 @@
 支援 macOS Metal 硬體加速。
 """
 
+import argparse
+import json
+import os
+import signal
 import sys
 import time
 
@@ -17,48 +21,200 @@ import config  # 這會設置環境變數
 _after_config_time = time.time()
 print(f"⏱️  配置載入: {(_after_config_time - _startup_start_time)*1000:.1f} ms")
 
-import cv2
-import numpy as np
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, 
     QHBoxLayout, QPushButton, QLabel, QComboBox
 )
 from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtGui import QPixmap, QShortcut, QKeySequence
 
 _after_imports_time = time.time()
-print(f"⏱️  PyQt6/OpenCV 載入: {(_after_imports_time - _after_config_time)*1000:.1f} ms")
+print(f"⏱️  PyQt6 載入: {(_after_imports_time - _after_config_time)*1000:.1f} ms")
+
+import psutil
 
-from utils.hand_detector import HandDetector, MEDIAPIPE_AVAILABLE
-from models.gesture_model import DummyModel
 from utils.performance_monitor import PerformanceMonitor
+from utils.tracer import tracer
+from utils.runtime_profiler import RuntimeProfiler
+from utils.control_server import ControlServer
+from utils.metrics_channel import MetricsPublisher
+from utils.camera_enum import CameraCache
+from utils.camera_discovery import CameraDiscoveryThread, CameraHotplugWatcher
+from utils.deferred_imports import ModuleLoaderThread
+from utils.detector_builder import DetectorBuildThread
+from utils.activity_controller import ActivityController, ActivityTier
+from utils.quality_controller import QualityController, ladder_for
+from utils.profiles import ProfileManager, affected_sections
+from utils.thread_budget import plan_threads, pin_current_thread, spawn_affinity, thread_report
 
 _after_modules_time = time.time()
 print(f"⏱️  自定義模組載入: {(_after_modules_time - _after_imports_time)*1000:.1f} ms")
 
+# OpenCV、MediaPipe 與依賴它們的模組在視窗顯示後於背景匯入，
+# 完成前以下名稱為 None，由 bind_heavy_modules() 綁定
+# 使用偵測常駐程式時不預先載入 MediaPipe（"utils.hand_detector"），連線失敗才匯入
+HEAVY_MODULES = (
+    "cv2",
+    "numpy",
+    "utils.hand_detector",  # mediapipe hands
+    "models.gesture_model",
+    "utils.frame_source",
+    "utils.image_convert",
+    "utils.camera_negotiation",
+    "utils.remote_detector",
+    "utils.motion_gate",
+    "utils.mirror",
+    "utils.frame_pool",
+)
+cv2 = None
+HandDetector = None
+MEDIAPIPE_AVAILABLE = False
+RemoteHandDetector = None
+DummyModel = None
+open_frame_source = None
+frame_to_qimage = None
+negotiate = None
+mode_to_cache = None
+MotionGate = None
+mirror_landmarks = None
+mirror_handedness = None
+FramePool = None
+
+
+def bind_heavy_modules():
+    """匯入（或從 sys.modules 取用）重量級模組並綁定為本模組的全域名稱
+    
+    背景執行緒載入完成後呼叫幾乎不花時間；尚未載入完成時會在呼叫端同步匯入。
+    MediaPipe 由 bind_detector_module() 另外綁定。
+    """
+    global cv2, RemoteHandDetector, DummyModel
+    global open_frame_source, frame_to_qimage, negotiate, mode_to_cache, MotionGate
+    global mirror_landmarks, mirror_handedness, FramePool
+    
+    import cv2
+    from utils.remote_detector import RemoteHandDetector
+    from models.gesture_model import DummyModel
+    from utils.frame_source import open_frame_source
+    from utils.image_convert import frame_to_qimage
+    from utils.camera_negotiation import negotiate, mode_to_cache
+    from utils.motion_gate import MotionGate
+    from utils.mirror import mirror_landmarks, mirror_handedness
+    from utils.frame_pool import FramePool
+    
+    opencv_threads = current_thread_plan().opencv_threads
+    if opencv_threads is not None:
+        cv2.setNumThreads(opencv_threads)
+
+
+# 執行緒預算與 CPU 親和性（setup_threads() 建立）
+thread_plan = None
+
+
+def current_thread_plan():
+    """目前的執行緒預算；尚未呼叫 setup_threads() 時只依預算推導，不綁定核心"""
+    return thread_plan or plan_threads(config.THREAD_BUDGET, config.OPENCV_NUM_THREADS)
+
+
+def setup_threads():
+    """依執行緒預算建立設定，並將主執行緒綁定到 ui 核心
+    
+    必須在建立 QApplication 之前呼叫，Qt 之後建立的執行緒才會繼承主執行緒的親和性。
+    """
+    global thread_plan
+    try:
+        thread_plan = plan_threads(config.THREAD_BUDGET, config.OPENCV_NUM_THREADS, config.THREAD_AFFINITY)
+    except ValueError as e:
+        print(f"⚠️  CPU 親和性設定無效，不綁定核心: {e}")
+        thread_plan = plan_threads(config.THREAD_BUDGET, config.OPENCV_NUM_THREADS)
+    pin_current_thread(thread_plan.cores("ui"))
+    if thread_plan.budget is not None or thread_plan.affinity:
+        print(f"🧵 執行緒預算: {thread_plan.describe()}")
+
+
+def bind_detector_module():
+    """匯入本機 MediaPipe 偵測器"""
+    global HandDetector, MEDIAPIPE_AVAILABLE
+    from utils.hand_detector import HandDetector, MEDIAPIPE_AVAILABLE
+
+
+class PreviewLabel(QLabel):
+    """攝影機預覽標籤，追蹤模式下記錄重繪耗時"""
+    
+    def paintEvent(self, event):
+        with tracer.span("repaint"):
+            super().paintEvent(event)
+
 
 class GestureRecognitionWindow(QMainWindow):
     """手勢識別主視窗"""
     
-    def __init__(self):
+    # 未偵測到手部時的手勢標籤樣式
+    NO_HAND_STYLE = """
+                QLabel {
+                    font-size: 48px;
+                    font-weight: bold;
+                    color: #999;
+                    padding: 30px;
+                    background-color: white;
+                    border-radius: 8px;
+                }
+            """
+    
+    def __init__(self, frame_source: str = None, profile: str = None):
+        """初始化主視窗
+        
+        Args:
+            frame_source: 影像來源（影片檔、圖片資料夾或 "synthetic"），
+                None 表示使用選單中的攝影機
+            profile: 效能設定檔名稱，None 表示 config.PERFORMANCE_PROFILE
+        """
         super().__init__()
+        
+        # 具名效能設定檔（改寫 config 的常數，必須在讀取設定之前套用）
+        self.profiles = ProfileManager(config, config.PERFORMANCE_PROFILES)
+        self.profiles.apply(profile or config.PERFORMANCE_PROFILE)
+
         self.setWindowTitle("手勢識別 Demo")
         self.setGeometry(100, 100, 900, 600)
         
         # 初始化變數
+        self.frame_source = frame_source
         self.camera = None
         self.detector = None
+        self.detector_key = None      # 目前偵測器的設定（JSON），相同設定不重建
+        self._parked_detectors = {}   # 切換設定檔時暫存的暖機偵測器，切回時直接取用
+        self._daemon_failed = False   # 偵測常駐程式在本次偵測中失敗過，改用本機偵測器
+        self._detector_build = None   # 背景建立中的偵測器（DetectorBuildThread），完成後換上
         self.model = None
         self.is_detecting = False
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
         
+        # 攝影機列表與能力快取（啟動時不探測硬體）
+        self.camera_cache = CameraCache(config.CAMERA_CACHE_FILE)
+        self.camera_devices = []
+        self.camera_discovery = None
+        self.camera_watcher = None
+        self.preferred_camera = None  # 使用者在選單中選擇的攝影機編號
+        self.active_camera = None     # 偵測中使用的攝影機編號
+        self.capture_mode = None      # 協商出的擷取模式（CaptureMode）
+        self.motion_gate = None       # 畫面靜止時略過偵測（MotionGate）
+        self.hand_present = False     # 上次偵測是否有手部
+        self.activity = None          # 閒置分級（ActivityController）
+        self.quality = None           # 自適應品質（QualityController）
+        self.mirror_at_display = config.MIRROR_AT_DISPLAY  # 顯示時鏡像，影格不翻轉
+        self.frame_pool = None        # 擷取、翻轉、縮放與顯示轉換共用的影格緩衝池（FramePool）
+        self._gesture_style = None    # 目前 gesture_label 的樣式表，相同時不重新套用
+        
         # 效能監控
         self.performance_monitor = PerformanceMonitor()
         self.perf_timer = QTimer()
         self.perf_timer.timeout.connect(self.update_performance)
         self.perf_timer.start(config.PERF_UPDATE_INTERVAL_MS)
         
+        # 即時指標寫入共享記憶體，供 monitor.py --pid 與 performance_profiler.py 讀取
+        self.metrics = MetricsPublisher(enabled=config.METRICS_CHANNEL_ENABLED)
+        
         print(f"📊 效能監控已啟動")
         if self.performance_monitor.gpu_available:
             print(f"   GPU 類型: {self.performance_monitor.gpu_type}")
@@ -66,8 +222,24 @@ class GestureRecognitionWindow(QMainWindow):
         # 設置 UI
         self.setup_ui()
         
-        # 初始化模型
-        self.init_model()
+        # Ctrl+Shift+T: 輸出目前的追蹤紀錄
+        self.trace_shortcut = QShortcut(QKeySequence("Ctrl+Shift+T"), self)
+        self.trace_shortcut.activated.connect(self.dump_trace)
+        
+        # 執行期分析（cProfile / tracemalloc），由控制通道或訊號開關
+        self.runtime_profiler = RuntimeProfiler(schedule=QTimer.singleShot)
+        self.control_server = None
+        if config.CONTROL_SOCKET_ENABLED:
+            self.setup_control_server()
+        
+        # 事件迴圈開始（視窗顯示）後才在背景列舉攝影機與載入 MediaPipe
+        self.modules_ready = False
+        self.module_loader = None
+        self.exit_after_startup = False
+        self.start_button.setEnabled(False)
+        self.status_label.setText("狀態: 載入 MediaPipe...")
+        QTimer.singleShot(0, self.start_camera_discovery)
+        QTimer.singleShot(0, self.start_module_loading)
     
     def setup_ui(self):
         """設置使用者界面"""
@@ -80,7 +252,7 @@ class GestureRecognitionWindow(QMainWindow):
         # 左側：攝影機預覽
         left_layout = QVBoxLayout()
         
-        self.camera_label = QLabel("攝影機預覽")
+        self.camera_label = PreviewLabel("攝影機預覽")
         self.camera_label.setMinimumSize(640, 480)
         self.camera_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.camera_label.setStyleSheet("""
@@ -105,7 +277,11 @@ class GestureRecognitionWindow(QMainWindow):
         
         self.camera_combo = QComboBox()
         self.camera_combo.setMinimumHeight(30)
-        self.camera_combo.addItems(self._list_cameras())
+        # 先顯示上次列舉到的攝影機，背景列舉完成後再更新
+        self._populate_camera_combo(self.camera_cache.last_devices())
+        self.camera_combo.activated.connect(
+            lambda _: setattr(self, "preferred_camera", self._selected_camera_index())
+        )
         self.camera_combo.setStyleSheet("""
             QComboBox {
                 background-color: white;
@@ -116,6 +292,20 @@ class GestureRecognitionWindow(QMainWindow):
             }
         """)
         camera_select_layout.addWidget(self.camera_combo)
+        
+        # 效能設定檔下拉選單（偵測中也可切換）
+        profile_label = QLabel("效能模式:")
+        profile_label.setStyleSheet("font-size: 12px; color: #666;")
+        camera_select_layout.addWidget(profile_label)
+        self.profile_combo = QComboBox()
+        self.profile_combo.setMinimumHeight(30)
+        self.profile_combo.addItems(self.profiles.names)
+        self.profile_combo.setCurrentText(self.profiles.current)
+        self.profile_combo.activated.connect(
+            lambda _: self.apply_profile(self.profile_combo.currentText())
+        )
+        self.profile_combo.setStyleSheet(self.camera_combo.styleSheet())
+        camera_select_layout.addWidget(self.profile_combo)
         left_layout.addLayout(camera_select_layout)
         
         self.start_button = QPushButton("開始偵測")
@@ -304,97 +494,302 @@ class GestureRecognitionWindow(QMainWindow):
         main_layout.addLayout(left_layout, 2)  # 左側佔 2/3
         main_layout.addLayout(right_layout, 1)  # 右側佔 1/3
     
-    def _list_cameras(self):
-        """列出可用的攝影機及其名稱
+    def start_camera_discovery(self):
+        """在背景執行緒列舉攝影機，逐步填入下拉選單"""
+        if self.camera_discovery and self.camera_discovery.isRunning():
+            return
+        self._discovered_cameras = []
+        self.camera_discovery = CameraDiscoveryThread(self.camera_cache, self)
+        self.camera_discovery.device_found.connect(self._on_camera_found)
+        self.camera_discovery.discovery_finished.connect(self._on_camera_discovery_finished)
+        self.camera_discovery.start()
+    
+    def _on_camera_found(self, device):
+        """找到一支攝影機：加入選單，尚未重新找到的舊項目暫時保留"""
+        self._discovered_cameras.append(device)
+        found = {d.index for d in self._discovered_cameras}
+        pending = [d for d in self.camera_devices if d.index not in found]
+        self._populate_camera_combo(self._discovered_cameras + pending)
+    
+    def _on_camera_discovery_finished(self, devices):
+        self._populate_camera_combo(devices)
+        print(f"📷 找到 {len(devices)} 個攝影機")
         
-        注意: 攝影機順序已調整,讓 FaceTime HD 為索引 0
+        if config.CAMERA_HOTPLUG_ENABLED and self.camera_watcher is None:
+            self.camera_watcher = CameraHotplugWatcher(
+                self.camera_cache, config.CAMERA_HOTPLUG_POLL_MS, self
+            )
+            self.camera_watcher.set_known(devices)
+            self.camera_watcher.devices_changed.connect(self._on_cameras_changed)
+            if not self.camera_watcher.start():
+                self.camera_watcher = None
+    
+    def _on_cameras_changed(self, devices, added, removed):
+        """攝影機插拔：只更新選單，不影響進行中的偵測"""
+        for device in added:
+            print(f"🔌 攝影機接上: {device.label()}")
+        for device in removed:
+            print(f"🔌 攝影機移除: {device.label()}")
+        self._populate_camera_combo(devices)
+        
+        if (self.is_detecting and not self.frame_source
+                and any(d.index == self.active_camera for d in removed)):
+            self.status_label.setText("錯誤: 使用中的攝影機已移除")
+    
+    def _populate_camera_combo(self, devices):
+        """更新攝影機下拉選單
+        
+        使用者選過的攝影機仍在列表中就保留選擇，否則選第一個（預設攝影機）。
         """
-        cameras = []
-        
-        # macOS 使用 system_profiler 獲取攝影機名稱
-        camera_names_original = self._get_camera_names_macos()
-        
-        # system_profiler 輸出順序: [FaceTime HD, iPhone]
-        # OpenCV 實際順序: 0=iPhone, 1=FaceTime HD
-        # 需要反轉才能正確配對
-        camera_names = camera_names_original[::-1] if len(camera_names_original) > 1 else camera_names_original
-        
-        # 先檢測所有可用攝影機
-        available_cameras = []
-        for i in range(10):
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                available_cameras.append((i, width, height))
-                cap.release()
-        
-        # 如果有兩個攝影機,交換它們的順序
-        # 讓 FaceTime HD 變成索引 0
-        if len(available_cameras) >= 2:
-            available_cameras[0], available_cameras[1] = available_cameras[1], available_cameras[0]
-            # 同時交換名稱
-            if len(camera_names) >= 2:
-                camera_names[0], camera_names[1] = camera_names[1], camera_names[0]
-        
-        # 建立顯示列表
-        for new_idx, (original_idx, width, height) in enumerate(available_cameras):
-            if new_idx < len(camera_names):
-                name = camera_names[new_idx]
-                cameras.append(f"{original_idx}: {name} ({width}x{height})")
-            else:
-                cameras.append(f"{original_idx}: 攝影機 {original_idx} ({width}x{height})")
+        labels = [device.label() for device in devices] or ["0: 攝影機 0 (預設)"]
+        self.camera_devices = list(devices)
+        combo = self.camera_combo
+        if labels == [combo.itemText(i) for i in range(combo.count())]:
+            return
         
-        if not cameras:
-            cameras.append("0: 攝影機 0 (預設)")
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItems(labels)
+        for row, device in enumerate(devices):
+            if device.index == self.preferred_camera:
+                combo.setCurrentIndex(row)
+                break
+        combo.blockSignals(False)
+    
+    def _selected_camera_index(self):
+        """從下拉選單文字取得攝影機編號
         
-        return cameras
+        格式: "0: FaceTime HD相機 (1920x1080)" -> 提取數字 0
+        """
+        camera_text = self.camera_combo.currentText()
+        
+        # 提取冒號前的數字
+        if ":" in camera_text:
+            return int(camera_text.split(":")[0])
+        
+        # 後備方案: 尋找數字
+        import re
+        match = re.search(r'\d+', camera_text)
+        return int(match.group()) if match else 0
+    
+    def _remember_camera(self, camera_index):
+        """開啟攝影機後把實際解析度寫入快取，下次啟動直接顯示"""
+        device = next((d for d in self.camera_devices if d.index == camera_index), None)
+        if not device:
+            return
+        width = int(self.camera.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if width and height and (width, height) != (device.width, device.height):
+            device.width, device.height = width, height
+            self.camera_cache.remember(device, width, height)
+    
+    def _detector_options(self):
+        """目前應使用的偵測器設定：啟用自適應品質時依目前等級，否則依 config"""
+        level = self.quality.level if self.quality else None
+        return dict(
+            max_num_hands=level.max_hands if level else config.MEDIAPIPE_MAX_HANDS,
+            min_detection_confidence=config.MEDIAPIPE_MIN_DETECTION_CONFIDENCE,
+            min_tracking_confidence=config.MEDIAPIPE_MIN_TRACKING_CONFIDENCE,
+            model_complexity=level.model_complexity if level else config.MEDIAPIPE_MODEL_COMPLEXITY
+        )
+    
+    def _use_detector(self, options):
+        """換成符合 options 的偵測器
+        
+        設定相同時沿用目前的偵測器；之前用過的設定取回暫存的暖機偵測器；
+        換下的偵測器暫存起來（最多 config.PROFILE_PARKED_DETECTORS 個）。
+        
+        Returns:
+            是否更換了偵測器
+        """
+        key = json.dumps(options, sort_keys=True)
+        if self.detector is not None and key == self.detector_key:
+            return False
+        detector = self._parked_detectors.pop(key, None)
+        if detector is None:
+            detector = self._create_detector(options)
+        self._swap_detector(detector, key)
+        return True
+    
+    def _request_detector(self, options):
+        """與 _use_detector 相同，但需要建立新的偵測器時在背景建立，完成後才換上
+        
+        建立期間繼續使用目前的偵測器，計時器不會因 MediaPipe 建立計算圖而停頓。
+        
+        Returns:
+            是否立即更換了偵測器（目前或暫存的偵測器符合設定）
+        """
+        key = json.dumps(options, sort_keys=True)
+        if self.detector is not None and key == self.detector_key:
+            return False
+        if key in self._parked_detectors or self.detector is None:
+            return self._use_detector(options)
+        if self._detector_build is not None:
+            return False
+        build = DetectorBuildThread(self._create_detector, options, key, self)
+        build.detector_built.connect(self._on_detector_built)
+        build.build_failed.connect(self._on_detector_build_failed)
+        build.finished.connect(build.deleteLater)
+        self._detector_build = build
+        build.start()
+        return False
+    
+    def _on_detector_built(self, detector, elapsed_ms):
+        """背景建立的偵測器完成：設定仍相同時換上，否則暫存；偵測已停止時關閉"""
+        build = self.sender()
+        if build is not self._detector_build or not self.is_detecting:
+            detector.close()
+            return
+        self._detector_build = None
+        if build.key != json.dumps(self._detector_options(), sort_keys=True):
+            self._park_detector(detector, build.key)  # 建立期間切換了設定檔
+            return
+        self._swap_detector(detector, build.key)
+        if self.quality:
+            self.quality.restart_cooldown()  # 建立期間的樣本來自舊偵測器
+        print(f"   更換偵測器: 背景建立 {elapsed_ms:.0f} ms")
+    
+    def _on_detector_build_failed(self, error):
+        if self.sender() is self._detector_build:
+            self._detector_build = None
+            print(f"⚠️  無法建立偵測器，沿用目前的偵測器: {error}")
+    
+    def _swap_detector(self, detector, key):
+        """換上偵測器，換下的偵測器暫存起來"""
+        previous, previous_key = self.detector, self.detector_key
+        self.detector, self.detector_key = detector, key
+        self.hand_present = False
+        if previous is not None:
+            self._park_detector(previous, previous_key)
+    
+    def _park_detector(self, detector, key):
+        """暫存偵測器（最多 config.PROFILE_PARKED_DETECTORS 個），已有相同設定時關閉"""
+        if key in self._parked_detectors or key == self.detector_key:
+            detector.close()
+            return
+        self._parked_detectors[key] = detector
+        while len(self._parked_detectors) > config.PROFILE_PARKED_DETECTORS:
+            oldest = next(iter(self._parked_detectors))
+            self._parked_detectors.pop(oldest).close()
+    
+    def _close_detectors(self):
+        for detector in self._parked_detectors.values():
+            detector.close()
+        self._parked_detectors.clear()
+        if self.detector:
+            self.detector.close()
+            self.detector = None
+            self.detector_key = None
     
-    def _get_camera_names_macos(self):
-        """獲取 macOS 攝影機名稱列表"""
-        import platform
-        if platform.system() != "Darwin":
-            return []
+    def _create_detector(self, options):
+        """建立手部偵測器：優先借用偵測常駐程式的暖機偵測器，否則在本機建立"""
+        if config.DETECTION_DAEMON_ENABLED and not self._daemon_failed:
+            try:
+                detector = RemoteHandDetector(
+                    socket_path=config.DETECTION_DAEMON_SOCKET,
+                    timeout=config.DETECTION_DAEMON_FRAME_TIMEOUT_S,
+                    **options,
+                )
+                print(f"🛰️  使用偵測常駐程式: {detector.socket_path}")
+                return detector
+            except OSError as e:
+                print(f"⚠️  無法連線偵測常駐程式，改用本機偵測器: {e}")
         
+        bind_detector_module()
+        if not MEDIAPIPE_AVAILABLE:
+            raise RuntimeError("MediaPipe 未安裝")
+        # MediaPipe 的圖形執行緒在建立時啟動，繼承 detection 核心
+        with spawn_affinity(current_thread_plan().cores("detection")):
+            return HandDetector(**options)
+    
+    def _detect(self, frame):
+        """偵測手部；偵測常駐程式中斷、重新啟動或逾時時改用本機偵測器
+        
+        本次偵測期間不再連線常駐程式（下次開始偵測時重試），
+        避免例外在計時器中中止程式，也避免每個影格都等到逾時。
+        """
         try:
-            import subprocess
-            # 使用 system_profiler 獲取攝影機資訊
-            result = subprocess.run(
-                ["system_profiler", "SPCameraDataType"],
-                capture_output=True,
-                text=True,
-                timeout=3
-            )
-            
-            # 解析輸出，尋找攝影機名稱
-            camera_names = []
-            lines = result.stdout.split('\n')
-            
-            for line in lines:
-                stripped = line.strip()
-                
-                # 攝影機名稱格式: "    FaceTime HD相機:" 或 "    Akai's iphone相機:"
-                # 特徵: 有縮排、包含"相機"或"Camera"、結尾是冒號
-                if (("相機:" in stripped or "Camera:" in stripped) and 
-                    stripped.endswith(":") and 
-                    not stripped.startswith("Camera:")):  # 排除 "Camera:" 標題
-                    
-                    # 移除冒號
-                    name = stripped.rstrip(":")
-                    camera_names.append(name)
-            
-            # 如果解析失敗,嘗試簡單方法
-            if not camera_names:
-                # 查找包含 "Model ID" 的行來推斷有多少攝影機
-                model_count = result.stdout.count("Model ID:")
-                for i in range(model_count):
-                    camera_names.append(f"攝影機 {i}")
-            
-            return camera_names
-            
-        except Exception as e:
-            print(f"⚠️  無法獲取攝影機名稱: {e}")
-            return []
+            return self.detector.detect(frame)
+        except (OSError, RuntimeError) as e:
+            if not isinstance(self.detector, RemoteHandDetector):
+                raise
+            print(f"⚠️  偵測常駐程式失敗，改用本機偵測器: {e}")
+        
+        self._daemon_failed = True
+        self.detector.close()
+        self.detector = self.detector_key = None
+        for key, parked in list(self._parked_detectors.items()):
+            if isinstance(parked, RemoteHandDetector):
+                self._parked_detectors.pop(key).close()
+        self._use_detector(self._detector_options())
+        return self.detector.detect(frame)
+    
+    def _negotiate_camera(self, camera_index):
+        """協商像素格式、幀率與緩衝區，結果依裝置快取"""
+        device = next((d for d in self.camera_devices if d.index == camera_index), None)
+        cached = self.camera_cache.get_mode(device.identity) if device else None
+        mode = negotiate(
+            self.camera,
+            config.CAMERA_WIDTH,
+            config.CAMERA_HEIGHT,
+            config.CAMERA_FPS,
+            fourccs=config.CAMERA_FOURCC_PREFERENCE,
+            cached=cached,
+            buffer_size=config.CAMERA_BUFFER_SIZE,
+            frames=config.CAMERA_NEGOTIATION_FRAMES,
+        )
+        if mode is None:
+            print("⚠️  擷取模式協商失敗，使用攝影機預設模式")
+            return None
+        
+        print(f"📷 擷取模式: {mode.describe()}")
+        if not mode.ok(config.CAMERA_FPS):
+            print(f"⚠️  攝影機未達到目標 {config.CAMERA_FPS} FPS")
+        if device and (not cached or cached.get('requested') != mode.requested
+                       or (cached.get('width'), cached.get('height')) != (mode.width, mode.height)):
+            self.camera_cache.set_mode(device, mode_to_cache(mode))
+        self.capture_mode = mode
+        return mode
+    
+    def start_module_loading(self):
+        """在背景執行緒匯入 OpenCV / MediaPipe，完成後啟用「開始偵測」"""
+        if self.modules_ready or self.module_loader:
+            return
+        self._module_loading_started = time.time()
+        modules = HEAVY_MODULES
+        if config.DETECTION_DAEMON_ENABLED:
+            modules = tuple(m for m in modules if m != "utils.hand_detector")
+        self.module_loader = ModuleLoaderThread(modules, self)
+        self.module_loader.loading_finished.connect(self._on_modules_loaded)
+        self.module_loader.loading_failed.connect(self._on_module_load_failed)
+        self.module_loader.start()
+    
+    def _on_modules_loaded(self, elapsed_ms):
+        since_start = time.time() - _startup_start_time
+        print(f"⏱️  OpenCV/MediaPipe 背景載入: {elapsed_ms:.1f} ms"
+              f"（啟動後 {since_start*1000:.1f} ms 可開始偵測）")
+        self._finish_module_loading()
+    
+    def _on_module_load_failed(self, name, error):
+        print(f"❌ 模組載入失敗: {name}: {error}")
+        self.status_label.setText(f"錯誤: 無法載入 {name}")
+    
+    def _finish_module_loading(self):
+        """綁定模組、載入模型並啟用按鈕（重複呼叫無作用）"""
+        if self.modules_ready:
+            return
+        bind_heavy_modules()
+        self.modules_ready = True
+        self.init_model()
+        if not config.DETECTION_DAEMON_ENABLED:
+            bind_detector_module()
+            if not MEDIAPIPE_AVAILABLE:
+                self.status_label.setText("錯誤: MediaPipe 未安裝")
+        if not self.is_detecting:
+            self.start_button.setEnabled(True)
+        if self.exit_after_startup:
+            print("⏹️  啟動完成，自動結束", flush=True)
+            QTimer.singleShot(0, self.close)
     
     def init_model(self):
         """初始化 AI 模型"""
@@ -416,41 +811,46 @@ class GestureRecognitionWindow(QMainWindow):
     
     def start_detection(self):
         """開始手勢偵測"""
-        if not MEDIAPIPE_AVAILABLE:
-            self.status_label.setText("錯誤: MediaPipe 未安裝")
-            return
+        if not self.modules_ready:
+            # 腳本模式可能在背景載入完成前就開始偵測，直接在此同步匯入
+            self._finish_module_loading()
         
         try:
             # 獲取選擇的攝影機編號
-            # 格式: "0: FaceTime HD相機 (1920x1080)" -> 提取數字 0
-            camera_text = self.camera_combo.currentText()
+            camera_index = self._selected_camera_index()
+            self.active_camera = camera_index
+            self.capture_mode = None
             
-            # 提取冒號前的數字
-            if ":" in camera_text:
-                camera_index = int(camera_text.split(":")[0])
-            else:
-                # 後備方案: 尋找數字
-                import re
-                match = re.search(r'\d+', camera_text)
-                camera_index = int(match.group()) if match else 0
-            
-            # 開啟攝影機
-            self.camera = cv2.VideoCapture(camera_index)
+            # 開啟攝影機（或指定的影像來源）；擷取後端的執行緒繼承 capture 核心
+            with spawn_affinity(current_thread_plan().cores("capture")):
+                if self.frame_source:
+                    self.camera = open_frame_source(
+                        self.frame_source, config.CAMERA_WIDTH, config.CAMERA_HEIGHT
+                    )
+                else:
+                    self.camera = cv2.VideoCapture(camera_index)
             if not self.camera.isOpened():
                 self.status_label.setText(f"錯誤: 無法開啟攝影機 {camera_index}")
                 return
             
-            # 設置攝影機解析度（使用配置）
-            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_WIDTH)
-            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_HEIGHT)
+            if self.frame_source or not config.CAMERA_NEGOTIATE:
+                # 設置攝影機解析度（使用配置）
+                self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_WIDTH)
+                self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_HEIGHT)
+            else:
+                self._negotiate_camera(camera_index)
+            if not self.frame_source:
+                self._remember_camera(camera_index)
+            
+            # 動態閘門、閒置分級與自適應品質（使用配置）
+            self._build_frame_controllers()
+            self.frame_pool = FramePool(config.FRAME_POOL_MAX_FREE_PER_SHAPE)
             
             # 初始化手部偵測器（使用配置）
-            self.detector = HandDetector(
-                max_num_hands=config.MEDIAPIPE_MAX_HANDS,
-                min_detection_confidence=config.MEDIAPIPE_MIN_DETECTION_CONFIDENCE,
-                min_tracking_confidence=config.MEDIAPIPE_MIN_TRACKING_CONFIDENCE,
-                model_complexity=config.MEDIAPIPE_MODEL_COMPLEXITY
-            )
+            self._daemon_failed = False
+            detector_start = time.perf_counter()
+            self._use_detector(self._detector_options())
+            print(f"⏱️  偵測器就緒: {(time.perf_counter() - detector_start)*1000:.1f} ms")
             
             # 更新狀態
             self.is_detecting = True
@@ -461,27 +861,95 @@ class GestureRecognitionWindow(QMainWindow):
             
             # 啟動定時器（使用配置）
             self.timer.start(config.UI_UPDATE_INTERVAL_MS)
+            self.metrics.set_detecting(True, config.UI_UPDATE_INTERVAL_MS)
             
             print("✅ 開始手勢偵測")
-            print(f"   攝影機: {config.CAMERA_WIDTH}x{config.CAMERA_HEIGHT} @ {config.CAMERA_FPS} FPS")
+            if self.capture_mode:
+                mode = self.capture_mode
+                print(f"   攝影機: {mode.width}x{mode.height} {mode.fourcc} @ {mode.measured_fps:.1f} FPS"
+                      f"（目標 {config.CAMERA_FPS}）")
+                self.status_label.setText(
+                    f"狀態: 偵測中... 擷取 {mode.measured_fps:.0f} FPS / {mode.read_ms:.0f} ms"
+                )
+            else:
+                print(f"   攝影機: {config.CAMERA_WIDTH}x{config.CAMERA_HEIGHT} @ {config.CAMERA_FPS} FPS")
             print(f"   更新頻率: {1000/config.UI_UPDATE_INTERVAL_MS:.1f} FPS")
             
         except Exception as e:
+            if self.camera:
+                self.camera.release()
+                self.camera = None
+            self.motion_gate = self.activity = self.quality = self.frame_pool = None
             self.status_label.setText(f"錯誤: {e}")
             print(f"❌ 啟動失敗: {e}")
     
+    def _build_frame_controllers(self):
+        """依 config 建立動態閘門、閒置分級與自適應品質"""
+        self.motion_gate = None
+        if config.MOTION_GATE_ENABLED:
+            self.motion_gate = MotionGate(
+                size=config.MOTION_GATE_SIZE,
+                pixel_threshold=config.MOTION_GATE_PIXEL_THRESHOLD,
+                min_changed_ratio=config.MOTION_GATE_MIN_CHANGED_RATIO,
+                max_skip=config.MOTION_GATE_MAX_SKIP,
+            )
+        self.hand_present = False
+        self.activity = None
+        if config.ACTIVITY_CONTROL_ENABLED:
+            self.activity = ActivityController((
+                ActivityTier("active", 0, config.UI_UPDATE_INTERVAL_MS, 1),
+                ActivityTier("idle", config.ACTIVITY_IDLE_AFTER_S,
+                             config.ACTIVITY_IDLE_INTERVAL_MS, config.ACTIVITY_IDLE_DETECT_EVERY),
+                ActivityTier("deep_idle", config.ACTIVITY_DEEP_IDLE_AFTER_S,
+                             config.ACTIVITY_DEEP_IDLE_INTERVAL_MS, config.ACTIVITY_DEEP_IDLE_DETECT_EVERY),
+            ))
+        self.quality = None
+        if config.QUALITY_CONTROL_ENABLED:
+            self.quality = QualityController(
+                ladder_for(config.MEDIAPIPE_MODEL_COMPLEXITY, config.MEDIAPIPE_MAX_HANDS),
+                target_fps=config.QUALITY_TARGET_FPS,
+                p95_budget_ms=config.QUALITY_P95_BUDGET_MS,
+                upgrade_ratio=config.QUALITY_UPGRADE_RATIO,
+                min_cpu_headroom=config.QUALITY_MIN_CPU_HEADROOM,
+                degrade_after=config.QUALITY_DEGRADE_AFTER,
+                upgrade_after=config.QUALITY_UPGRADE_AFTER,
+                cooldown_s=config.QUALITY_COOLDOWN_S,
+            )
+            psutil.cpu_percent(interval=None)  # 建立系統 CPU 使用率的起點
+    
+    def _finish_frame_controllers(self):
+        """輸出動態閘門、閒置分級與自適應品質的統計並清除"""
+        if self.motion_gate:
+            gate = self.motion_gate
+            if gate.frames:
+                print(f"🚦 動態閘門: 略過 {gate.skipped}/{gate.frames} 個影格的偵測（{gate.skip_ratio:.0%}）")
+            self.motion_gate = None
+        
+        if self.activity:
+            print(f"💤 活動分級: {self.activity.summary()}")
+            self.activity = None
+        
+        if self.quality:
+            print(f"🎚️  自適應品質: {self.quality.status()}")
+            self._save_quality_log()
+            self.quality = None
+    
     def stop_detection(self):
         """停止手勢偵測"""
         self.is_detecting = False
         self.timer.stop()
+        self.metrics.set_detecting(False)
+        self._detector_build = None  # 背景建立中的偵測器完成時直接關閉
         
         if self.camera:
             self.camera.release()
             self.camera = None
         
-        if self.detector:
-            self.detector.close()
-            self.detector = None
+        self._close_detectors()
+        self._finish_frame_controllers()
+        if self.frame_pool:
+            print(f"♻️  影格緩衝池: {self.frame_pool.summary()}")
+            self.frame_pool = None
         
         # 更新 UI
         self.start_button.setEnabled(True)
@@ -495,26 +963,288 @@ class GestureRecognitionWindow(QMainWindow):
         
         print("⏸️ 停止手勢偵測")
     
+    def switch_frame_source(self, frame_source: str):
+        """偵測中切換影像來源，沿用現有的手部偵測器
+        
+        Args:
+            frame_source: 新的影像來源描述
+        """
+        with spawn_affinity(current_thread_plan().cores("capture")):
+            new_camera = open_frame_source(
+                frame_source, config.CAMERA_WIDTH, config.CAMERA_HEIGHT
+            )
+        if not new_camera.isOpened():
+            print(f"⚠️  無法開啟影像來源: {frame_source}")
+            return
+        
+        old_camera = self.camera
+        self.frame_source = frame_source
+        self.camera = new_camera
+        if old_camera:
+            old_camera.release()
+        if self.frame_pool:
+            self.frame_pool.clear()
+        if self.motion_gate:
+            self.motion_gate.reset()
+    
+    def apply_profile(self, name: str) -> str:
+        """切換具名效能設定檔，只重建受設定改變影響的部分
+        
+        Args:
+            name: config.PERFORMANCE_PROFILES 中的名稱
+            
+        Returns:
+            結果說明
+        
+        Raises:
+            KeyError: 未知的設定檔
+        """
+        start = time.perf_counter()
+        previous = self.profiles.current
+        changes = self.profiles.apply(name)
+        sections = affected_sections(changes)
+        self.profile_combo.setCurrentText(name)
+        
+        if "ui" in sections:
+            self.perf_timer.setInterval(config.PERF_UPDATE_INTERVAL_MS)
+        
+        rebuilt = []
+        if self.is_detecting:
+            if "camera" in sections:
+                self._reconfigure_capture()
+                rebuilt.append("擷取")
+            if sections & {"scheduling", "detector"}:
+                self._finish_frame_controllers()
+                self._build_frame_controllers()
+                self.timer.setInterval(config.UI_UPDATE_INTERVAL_MS)
+                self.metrics.set_frame_interval(config.UI_UPDATE_INTERVAL_MS)
+                rebuilt.append("排程")
+            if self._use_detector(self._detector_options()):
+                rebuilt.append("偵測器")
+        
+        elapsed = (time.perf_counter() - start) * 1000
+        message = (f"效能設定檔 {previous} → {name}：改變 {len(changes)} 項設定，"
+                   f"重建 {'、'.join(rebuilt) or '無'}（{elapsed:.0f} ms）")
+        print(f"🎛️  {message}")
+        for key, (old, new) in changes.items():
+            print(f"   {key}: {old} → {new}")
+        return message
+    
+    def _reconfigure_capture(self):
+        """依新的攝影機設定重新設定擷取（不重新建立偵測器）"""
+        if self.frame_source:
+            self.switch_frame_source(self.frame_source)
+        elif config.CAMERA_NEGOTIATE:
+            self._negotiate_camera(self.active_camera)
+        else:
+            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_WIDTH)
+            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_HEIGHT)
+            self.camera.set(cv2.CAP_PROP_FPS, config.CAMERA_FPS)
+        if self.frame_pool:
+            self.frame_pool.clear()  # 舊解析度的緩衝區不會再用到
+    
+    def setup_control_server(self):
+        """啟動本機控制通道並註冊命令"""
+        self.control_server = ControlServer(self)
+        profiler = self.runtime_profiler
+        window_seconds = config.PROFILE_WINDOW_SECONDS
+        
+        def profile(arg=None):
+            if arg == "stop":
+                return profiler.stop_cprofile()
+            return profiler.start_cprofile(float(arg or window_seconds))
+        
+        def memory(arg=None):
+            if arg == "stop":
+                return profiler.stop_tracemalloc()
+            return profiler.start_tracemalloc(float(arg or window_seconds))
+        
+        def trace(arg="dump"):
+            if arg == "start":
+                tracer.start()
+                return "追蹤已啟動"
+            if arg == "stop":
+                tracer.stop()
+                return "追蹤已停止"
+            path = self.dump_trace()
+            return f"已輸出: {path}" if path else "沒有追蹤紀錄"
+        
+        self.control_server.register(
+            "profile", profile, "profile [秒數|stop] - cProfile 分析（輸出 collapsed-stack）")
+        self.control_server.register(
+            "tracemalloc", memory, "tracemalloc [秒數|stop] - 記憶體配置位置分析")
+        self.control_server.register(
+            "trace", trace, "trace [start|stop|dump] - 影格管線追蹤")
+        self.control_server.register(
+            "status", profiler.status, "目前的分析狀態")
+        self.control_server.register(
+            "activity", lambda arg=None: self.activity.summary() if self.activity else "未偵測",
+            "activity - 閒置分級與各分級停留時間")
+        def mode(arg=None):
+            if not arg:
+                return (f"目前: {self.profiles.current}，可用: {', '.join(self.profiles.names)}")
+            return self.apply_profile(arg)
+        
+        self.control_server.register(
+            "mode", mode, "mode [名稱] - 列出或切換效能設定檔")
+        self.control_server.register(
+            "quality", lambda arg=None: self.quality.status() if self.quality else "未啟用",
+            "quality - 自適應品質目前的等級")
+        self.control_server.register(
+            "threads", lambda arg=None: thread_report(current_thread_plan()),
+            "threads - 執行緒預算與各核心上的執行緒數")
+        self.control_server.register(
+            "pool", lambda arg=None: self.frame_pool.summary() if self.frame_pool else "未偵測",
+            "pool - 影格緩衝池命中率與峰值記憶體")
+        self.control_server.start()
+    
+    def dump_trace(self):
+        """將追蹤緩衝區寫成 Chrome Trace JSON（performance_logs/）"""
+        if not tracer.event_count:
+            print("ℹ️  沒有追蹤紀錄（使用 --trace 啟用）")
+            return None
+        
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        event_count = tracer.event_count  # 已停止記錄時輸出後會釋放緩衝區
+        path = tracer.write_chrome_trace(f"performance_logs/trace_{timestamp}.json")
+        print(f"🧭 追蹤紀錄已輸出: {path} ({event_count} 個事件)")
+        return path
+    
+    @tracer.traced("update_frame")
     def update_frame(self):
         """更新攝影機畫面並進行手勢識別"""
         if not self.camera or not self.is_detecting:
             return
         
-        # 讀取攝影機畫面
-        ret, frame = self.camera.read()
+        metrics = self.metrics
+        metrics.begin_frame()
+        frame_start = time.perf_counter()
+        
+        # 讀取攝影機畫面（寫入緩衝池中的影格，本影格結束時歸還）
+        pool = self.frame_pool
+        with tracer.span("capture"):
+            ret, buffer = pool.read(self.camera)
         if not ret:
+            metrics.drop_frames()
             self.status_label.setText("錯誤: 無法讀取攝影機畫面")
             return
+        frame = buffer.array
+        metrics.mark("capture")
         
-        # 翻轉畫面（鏡像效果）
-        frame = cv2.flip(frame, 1)
+        try:
+            # 翻轉畫面（鏡像效果）；鏡像預覽模式下改在關鍵點座標與顯示時鏡像
+            if not self.mirror_at_display:
+                with tracer.span("flip"):
+                    source, buffer = buffer, pool.acquire(frame.shape)
+                    with source:  # 翻轉完成（或失敗）後歸還原始影格
+                        frame = cv2.flip(source.array, 1, dst=buffer.array)
+            metrics.mark("flip")
+            
+            # 偵測手部（畫面靜止且上次沒有手時由動態閘門略過，閒置分級下再降低偵測次數）
+            with tracer.span("detect"):
+                gate = self.motion_gate
+                activity = self.activity
+                skipped = gate is not None and not gate.should_detect(frame, self.hand_present)
+                motion = gate is not None and gate.motion
+                quality = self.quality
+                if (not skipped and activity and not activity.active and not motion
+                        and not self.hand_present and not activity.detect_due()):
+                    skipped = True
+                detected = False
+                if skipped:
+                    landmarks_list = None
+                elif quality and not quality.detect_due():
+                    # 品質等級降低偵測頻率：沿用上次的關鍵點
+                    landmarks_list = self.detector.landmarks_list
+                else:
+                    with self._detection_input(buffer) as detection_frame:
+                        landmarks_list = self._detect(detection_frame)
+                    self.hand_present = bool(landmarks_list)
+                    detected = True
+            metrics.mark("detect")
+            
+            # 繪製手部關鍵點
+            with tracer.span("draw_landmarks"):
+                frame = self.detector.draw_landmarks(frame)
+            metrics.mark("draw_landmarks")
+            
+            with tracer.span("classify"):
+                if self.mirror_at_display:
+                    landmarks_list = mirror_landmarks(landmarks_list)
+                self._update_gesture_display(landmarks_list)
+            metrics.mark("classify")
+            
+            # 轉換為 Qt 格式並顯示
+            with tracer.span("display"):
+                self._show_frame(frame)
+        finally:
+            # 任何階段拋出例外都要歸還影格，否則每個失敗的影格都會從池中流失一個緩衝區
+            buffer.release()
+        metrics.mark("display")
+        metrics.end_frame(detected=bool(landmarks_list), skipped=not detected)
+        if detected and quality:
+            quality.record((time.perf_counter() - frame_start) * 1000)
         
-        # 偵測手部
-        landmarks_list = self.detector.detect(frame)
+        if activity:
+            tier = activity.update(self.hand_present, motion)
+            if tier:
+                self._apply_activity_tier(tier)
+    
+    def _detection_input(self, buffer):
+        """依品質等級縮小偵測輸入（關鍵點為正規化座標，仍繪製在原始影格上）
         
-        # 繪製手部關鍵點
-        frame = self.detector.draw_landmarks(frame)
+        Returns:
+            偵測輸入的緩衝區，呼叫端用完後歸還；不縮放時即為影格本身（多持有一次）
+        """
+        scale = self.quality.level.scale if self.quality else 1.0
+        if scale >= 1.0:
+            return buffer.retain()
+        height, width = buffer.array.shape[:2]
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        scaled = self.frame_pool.acquire((size[1], size[0]) + buffer.array.shape[2:])
+        cv2.resize(buffer.array, size, dst=scaled.array, interpolation=cv2.INTER_AREA)
+        return scaled
+    
+    def _evaluate_quality(self):
+        """每個效能更新週期評估一次自適應品質（閒置分級時不評估）"""
+        if not self.quality or not self.is_detecting or (self.activity and not self.activity.active):
+            return
+        if self._detector_build is not None:
+            return  # 上次調整的偵測器還在背景建立，換上後才重新評估
+        previous_index = self.quality.index
+        level = self.quality.evaluate(psutil.cpu_percent(interval=None))
+        if level is None:
+            return
         
+        record = self.quality.adjustments[-1]
+        arrow = "⬇️ " if self.quality.index > previous_index else "⬆️ "
+        print(f"🎚️  {arrow}品質等級 {record['level']}: {level.describe()}"
+              f"（{record['reason']}，p95 {record['p95_ms']:.1f} ms，平均 {record['mean_ms']:.1f} ms，"
+              f"CPU {record['cpu_percent']:.0f}%）")
+        # 模型設定改變需要其他偵測器：之前用過的設定直接換上，否則在背景建立，完成前沿用目前的偵測器
+        if self._request_detector(self._detector_options()):
+            print("   更換偵測器: 使用暫存的偵測器")
+    
+    def _save_quality_log(self):
+        """將本次偵測期間的品質調整紀錄寫入 performance_logs/"""
+        if not self.quality.adjustments:
+            return None
+        path = f"performance_logs/quality_adjustments_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        os.makedirs("performance_logs", exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.quality.adjustments, f, indent=2, ensure_ascii=False)
+        print(f"💾 品質調整紀錄: {path}")
+        return path
+    
+    def _apply_activity_tier(self, tier):
+        """切換閒置分級：調整計時器間隔（下一個週期生效）"""
+        self.timer.setInterval(tier.interval_ms)
+        self.metrics.set_frame_interval(tier.interval_ms, self.activity.tiers.index(tier))
+        print(f"💤 活動分級 → {tier.name}（{1000 / tier.interval_ms:.0f} FPS，"
+              f"每 {tier.detect_every} 影格偵測）")
+    
+    def _update_gesture_display(self, landmarks_list):
+        """根據偵測結果進行手勢識別並更新右側資訊"""
         # 如果偵測到手部，進行手勢識別
         if landmarks_list:
             # 處理所有偵測到的手
@@ -526,7 +1256,7 @@ class GestureRecognitionWindow(QMainWindow):
                     result = self.model.predict(landmarks)
                     
                     # 獲取對應的手部資訊
-                    hand_info = self.detector.get_hand_info()
+                    hand_info = self._hand_info()
                     if i < len(hand_info):
                         handedness, conf = hand_info[i]
                         hand_label = "🫱 右手" if handedness == "Right" else "🫲 左手"
@@ -554,7 +1284,7 @@ class GestureRecognitionWindow(QMainWindow):
                 self.confidence_label.setText(f"偵測到 {len(gestures_text)} 隻手")
                 color = "#2196F3"  # 藍色
             
-            self.gesture_label.setStyleSheet(f"""
+            self._set_gesture_style(f"""
                 QLabel {{
                     font-size: {'36px' if len(gestures_text) > 1 else '48px'};
                     font-weight: bold;
@@ -566,7 +1296,7 @@ class GestureRecognitionWindow(QMainWindow):
             """)
             
             # 顯示手部資訊
-            hand_info = self.detector.get_hand_info()
+            hand_info = self._hand_info()
             if hand_info:
                 hand_texts = []
                 for handedness, conf in hand_info:
@@ -575,27 +1305,27 @@ class GestureRecognitionWindow(QMainWindow):
                 self.hand_info_label.setText("手部: " + ", ".join(hand_texts))
         else:
             self.gesture_label.setText("未偵測到手部")
-            self.gesture_label.setStyleSheet("""
-                QLabel {
-                    font-size: 48px;
-                    font-weight: bold;
-                    color: #999;
-                    padding: 30px;
-                    background-color: white;
-                    border-radius: 8px;
-                }
-            """)
+            self._set_gesture_style(self.NO_HAND_STYLE)
             self.confidence_label.setText("信心度: --")
             self.hand_info_label.setText("手部: --")
-        
-        # 轉換為 Qt 格式並顯示
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = frame_rgb.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(
-            frame_rgb.data, w, h, bytes_per_line, QImage.Format.Format_RGB888
-        )
-        pixmap = QPixmap.fromImage(qt_image)
+    
+    def _hand_info(self):
+        """偵測器的左右手資訊（鏡像預覽模式下換算為鏡像畫面的左右手）"""
+        hand_info = self.detector.get_hand_info()
+        return mirror_handedness(hand_info) if self.mirror_at_display else hand_info
+    
+    def _set_gesture_style(self, style):
+        """套用 gesture_label 樣式表；與目前相同時略過（setStyleSheet 會重新 polish 元件）"""
+        if style != self._gesture_style:
+            self._gesture_style = style
+            self.gesture_label.setStyleSheet(style)
+    
+    def _show_frame(self, frame):
+        """將 BGR 影像轉換為 QPixmap 並顯示在預覽區"""
+        # RGB 陣列只需保留到 QPixmap.fromImage 複製完成
+        with self.frame_pool.acquire(frame.shape) as frame_rgb:
+            qt_image, _ = frame_to_qimage(frame, mirror=self.mirror_at_display, dst=frame_rgb)
+            pixmap = QPixmap.fromImage(qt_image)
         self.camera_label.setPixmap(
             pixmap.scaled(
                 self.camera_label.size(),
@@ -604,10 +1334,13 @@ class GestureRecognitionWindow(QMainWindow):
             )
         )
     
+    @tracer.traced("update_performance")
     def update_performance(self):
         """更新效能監控顯示"""
         try:
             metrics = self.performance_monitor.get_metrics()
+            self.metrics.set_system(metrics.cpu_percent, metrics.memory_mb)
+            self._evaluate_quality()
             
             # 更新 CPU 標籤
             cpu_color = self._get_perf_color(
@@ -709,27 +1442,172 @@ class GestureRecognitionWindow(QMainWindow):
         """視窗關閉時清理資源"""
         self.perf_timer.stop()
         self.stop_detection()
+        for build in self.findChildren(DetectorBuildThread):
+            build.wait()
+        if self.module_loader and self.module_loader.isRunning():
+            self.module_loader.wait()
+        if self.camera_discovery and self.camera_discovery.isRunning():
+            self.camera_discovery.wait(3000)
+        if self.camera_watcher:
+            self.camera_watcher.stop()
+        if self.runtime_profiler.cprofile_active:
+            print(f"🔬 {self.runtime_profiler.stop_cprofile()}")
+        if self.runtime_profiler.tracemalloc_active:
+            print(f"🔬 {self.runtime_profiler.stop_tracemalloc()}")
+        if self.control_server:
+            self.control_server.close()
+        self.metrics.close()
+        if tracer.enabled:
+            tracer.stop()
+            self.dump_trace()
         event.accept()
 
 
+class ScriptedSession:
+    """腳本化執行流程
+    
+    依照時間軸自動切換三個階段（未偵測、偵測中、有手勢），
+    取代手動點擊按鈕，供 performance_profiler.py 自動化分析使用。
+    每次切換階段都會輸出一行 "📍 PHASE <階段代號>" 標記。
+    """
+    
+    PHASE_KEYS = {
+        "idle": "phase1_idle",
+        "detecting": "phase2_detecting",
+        "gesture": "phase3_gesture",
+    }
+    
+    def __init__(self, window, timeline, gesture_source=None):
+        """初始化腳本流程
+        
+        Args:
+            window: 主視窗
+            timeline: [(階段名稱, 秒數), ...]
+            gesture_source: 有手勢階段使用的影像來源（None 表示沿用目前來源）
+        """
+        self.window = window
+        self.timeline = timeline
+        self.gesture_source = gesture_source
+        self.step = 0
+    
+    @staticmethod
+    def parse_timeline(text):
+        """解析時間軸字串，例如 "idle:15,detecting:15,gesture:15" """
+        timeline = []
+        for item in text.split(","):
+            name, _, seconds = item.partition(":")
+            name = name.strip()
+            if name not in ScriptedSession.PHASE_KEYS:
+                raise ValueError(f"未知的階段: {name}")
+            timeline.append((name, float(seconds or 15)))
+        return timeline
+    
+    def start(self):
+        """開始執行時間軸"""
+        self._next_phase()
+    
+    def _next_phase(self):
+        if self.step >= len(self.timeline):
+            print("📍 PHASE done", flush=True)
+            self.window.close()
+            return
+        
+        name, seconds = self.timeline[self.step]
+        self.step += 1
+        
+        if name == "idle":
+            if self.window.is_detecting:
+                self.window.stop_detection()
+        elif name == "detecting":
+            if not self.window.is_detecting:
+                self.window.start_detection()
+        elif name == "gesture":
+            if not self.window.is_detecting:
+                self.window.start_detection()
+            if self.gesture_source:
+                self.window.switch_frame_source(self.gesture_source)
+        
+        print(f"📍 PHASE {self.PHASE_KEYS[name]}", flush=True)
+        QTimer.singleShot(int(seconds * 1000), self._next_phase)
+
+
+def parse_args(argv):
+    """解析命令列參數，未知參數保留給 Qt"""
+    parser = argparse.ArgumentParser(description="手勢識別 Demo")
+    parser.add_argument(
+        "--source",
+        help="影像來源：影片檔、圖片資料夾或 synthetic（預設使用攝影機）"
+    )
+    parser.add_argument(
+        "--script",
+        help="自動執行時間軸，例如 idle:15,detecting:15,gesture:15"
+    )
+    parser.add_argument(
+        "--gesture-source",
+        help="腳本模式下「有手勢」階段使用的影像來源"
+    )
+    parser.add_argument(
+        "--trace", action="store_true",
+        help="記錄影格管線追蹤（Chrome Trace JSON，關閉視窗或 Ctrl+Shift+T 輸出）"
+    )
+    parser.add_argument(
+        "--profile", choices=list(config.PERFORMANCE_PROFILES),
+        help=f"效能設定檔（預設 {config.PERFORMANCE_PROFILE}）"
+    )
+    parser.add_argument(
+        "--exit-after-startup", action="store_true",
+        help="視窗顯示且背景模組載入完成後自動結束（供啟動時間分析使用）"
+    )
+    return parser.parse_known_args(argv)
+
+
 def main():
     """主程式入口"""
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args(sys.argv[1:])
+    if args.trace or config.TRACE_ENABLED:
+        tracer.start()
+        print("🧭 影格管線追蹤已啟用")
+    
+    setup_threads()
+    app = QApplication(sys.argv[:1] + qt_args)
     
     # 設置應用程式樣式
     app.setStyle('Fusion')
     
     _before_window_time = time.time()
-    window = GestureRecognitionWindow()
+    window = GestureRecognitionWindow(frame_source=args.source, profile=args.profile)
+    window.exit_after_startup = args.exit_after_startup
     _after_window_time = time.time()
     print(f"⏱️  視窗初始化: {(_after_window_time - _before_window_time)*1000:.1f} ms")
     
     window.show()
     
+    # kill -USR1 / -USR2 <pid>: 開關 cProfile / tracemalloc
+    # （Qt 事件迴圈中每次計時器回呼都會執行 Python，訊號會在下一次回呼時處理）
+    if hasattr(signal, "SIGUSR1"):
+        profiler = window.runtime_profiler
+        seconds = config.PROFILE_WINDOW_SECONDS
+        signal.signal(
+            signal.SIGUSR1,
+            lambda *_: print(f"🔬 {profiler.toggle_cprofile(seconds)}")
+        )
+        signal.signal(
+            signal.SIGUSR2,
+            lambda *_: print(f"🔬 {profiler.toggle_tracemalloc(seconds)}")
+        )
+    
     _total_startup_time = time.time() - _startup_start_time
     print(f"\n🚀 總啟動時間: {_total_startup_time*1000:.1f} ms ({_total_startup_time:.2f} 秒)")
     print(f"{'='*60}\n")
     
+    if args.script:
+        session = ScriptedSession(
+            window,
+            ScriptedSession.parse_timeline(args.script),
+            gesture_source=args.gesture_source
+        )
+        session.start()
+    
     sys.exit(app.exec())
 
 
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+熱點函式微基準測試
+
+不需要攝影機，單獨量測管線中的熱點函式：
+- DummyModel.predict / _count_fingers / _calculate_finger_angles
+- HandDetector.detect（使用儲存的圖片）
+- HandDetector.draw_landmarks
+- 影格轉 QImage
+
+每個項目先暖機再重複量測，輸出 ops/sec 與延遲分佈 JSON，
+並可與儲存的基準比較，退步超過門檻時以非零狀態碼結束。
+
+範例：
+    python microbenchmark.py --images recordings/frames --save-baseline
+    python microbenchmark.py --images recordings/frames --max-regression 0.15
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from utils.perf_stats import summarize_latencies
+
+
+DEFAULT_BASELINE = Path("performance_logs/microbench_baseline.json")
+
+
+def synthetic_landmarks() -> np.ndarray:
+    """產生一組固定的張開手掌關鍵點 (21, 3)，沒有圖片中的手部時使用"""
+    landmarks = np.zeros((21, 3))
+    landmarks[0] = [0.50, 0.80, 0.0]  # 手腕
+
+    # 拇指向側邊伸出
+    for joint in range(4):
+        landmarks[1 + joint] = [0.44 - 0.04 * joint, 0.74 - 0.04 * joint, -0.01 * joint]
+
+    # 其餘四指向上伸直
+    for finger, base_x in enumerate([0.44, 0.50, 0.56, 0.62]):
+        for joint in range(4):
+            landmarks[5 + finger * 4 + joint] = [base_x, 0.62 - 0.07 * joint, -0.01 * joint]
+
+    return landmarks
+
+
+class MicroBenchmark:
+    """單一項目的微基準測試
+
+    自動決定每個樣本的呼叫次數，讓計時器誤差遠小於樣本時間。
+    """
+
+    def __init__(self, name: str, func, warmup: int = 20, repeat: int = 200,
+                 min_sample_ms: float = 0.5):
+        self.name = name
+        self.func = func
+        self.warmup = warmup
+        self.repeat = repeat
+        self.min_sample_ms = min_sample_ms
+
+    def _calibrate(self) -> int:
+        start = time.perf_counter_ns()
+        self.func()
+        single_ms = (time.perf_counter_ns() - start) / 1e6
+        if single_ms <= 0:
+            return 1000
+        return max(1, int(self.min_sample_ms / single_ms))
+
+    def run(self) -> dict:
+        for _ in range(self.warmup):
+            self.func()
+
+        number = self._calibrate()
+        latencies_ms = []
+        for _ in range(self.repeat):
+            start = time.perf_counter_ns()
+            for _ in range(number):
+                self.func()
+            elapsed_ms = (time.perf_counter_ns() - start) / 1e6
+            latencies_ms.append(elapsed_ms / number)
+
+        result = summarize_latencies(latencies_ms)
+        result['calls_per_sample'] = number
+        result['latencies_ms'] = latencies_ms
+        return result
+
+
+def load_images(path):
+    """載入儲存的測試圖片，未指定時使用合成畫面"""
+    from utils.frame_source import ImageFolderSource, SyntheticFrameSource
+
+    if path:
+        source = ImageFolderSource(path)
+        if not source.images:
+            raise SystemExit(f"❌ {path} 中沒有可用的圖片")
+        return source.images, f"圖片資料夾 {path} ({len(source.images)} 張)"
+
+    source = SyntheticFrameSource()
+    frames = [source.read()[1] for _ in range(8)]
+    return frames, "合成畫面（無手部）"
+
+
+def build_benchmarks(images, args):
+    """建立所有微基準測試項目
+
+    Returns:
+        (項目列表, 偵測器, 關鍵點來源說明)；圖片中沒有手部時，
+        模型與繪製項目使用 synthetic_landmarks()
+    """
+    from models.gesture_model import DummyModel
+
+    benchmarks = []
+    model = DummyModel()
+    model.load_model()
+
+    detector = None
+    landmarks = None
+    try:
+        from utils.hand_detector import HandDetector, MEDIAPIPE_AVAILABLE
+        if MEDIAPIPE_AVAILABLE:
+            detector = HandDetector(
+                max_num_hands=args.max_hands,
+                model_complexity=args.model_complexity
+            )
+    except Exception as e:
+        print(f"⚠️  無法建立 HandDetector，略過偵測相關項目: {e}")
+
+    # 從圖片中找出一幀有手的畫面，作為模型與繪製的輸入
+    hand_frame = images[0]
+    if detector:
+        for image in images:
+            found = detector.detect(image)
+            if found:
+                landmarks, hand_frame = found[0], image
+                break
+    detected = landmarks is not None
+    if detected:
+        landmarks_desc = "圖片中偵測到的手部"
+    else:
+        landmarks = synthetic_landmarks()
+        landmarks_desc = "合成關鍵點（圖片中未偵測到手部）"
+
+    benchmarks.append(("model.predict", lambda: model.predict(landmarks)))
+    benchmarks.append(("model._count_fingers", lambda: model._count_fingers(landmarks)))
+    benchmarks.append((
+        "model._calculate_finger_angles",
+        lambda: model._calculate_finger_angles(landmarks)
+    ))
+
+    if detector:
+        image_index = [0]
+
+        def detect_next():
+            frame = images[image_index[0] % len(images)]
+            image_index[0] += 1
+            detector.detect(frame)
+
+        benchmarks.append(("detector.detect", detect_next))
+
+        draw_target = hand_frame.copy()
+        if detected:
+            detector.detect(hand_frame)
+            benchmarks.append(("detector.draw_landmarks", lambda: detector.draw_landmarks(draw_target)))
+        else:
+            # 沒有手部時 draw_landmarks 不會繪製任何東西，改以相同的繪製函式畫合成關鍵點
+            from utils.hand_drawing import draw_hands
+            benchmarks.append(("detector.draw_landmarks", lambda: draw_hands(draw_target, [landmarks])))
+
+    try:
+        from utils.image_convert import frame_to_qimage
+        frame = images[0]
+        benchmarks.append(("frame_to_qimage", lambda: frame_to_qimage(frame)))
+    except ImportError as e:
+        print(f"⚠️  PyQt6 不可用，略過 frame_to_qimage: {e}")
+
+    return benchmarks, detector, landmarks_desc
+
+
+def compare_with_baseline(results, baseline, max_regression):
+    """與基準比較 p50 延遲
+
+    Returns:
+        退步項目列表 [(名稱, 基準 ms, 目前 ms, 變化比例), ...]
+    """
+    regressions = []
+    print(f"\n{'='*72}")
+    print(f"📏 與基準比較（允許退步 {max_regression:.0%}，依 p50 延遲）")
+    print(f"{'='*72}")
+    for name, result in results.items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if not base:
+            print(f"  {name:<32} 無基準資料")
+            continue
+        change = result['p50_ms'] / base['p50_ms'] - 1 if base['p50_ms'] > 0 else 0.0
+        status = "✅"
+        if change > max_regression:
+            status = "❌"
+            regressions.append((name, base['p50_ms'], result['p50_ms'], change))
+        print(f"  {status} {name:<30} {base['p50_ms']:9.4f} → {result['p50_ms']:9.4f} ms ({change:+.1%})")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="熱點函式微基準測試")
+    parser.add_argument("--images", help="儲存的測試圖片資料夾（預設使用合成畫面）")
+    parser.add_argument("--warmup", type=int, default=20, help="暖機次數")
+    parser.add_argument("--repeat", type=int, default=200, help="量測樣本數")
+    parser.add_argument("--filter", help="只執行名稱包含此字串的項目")
+    parser.add_argument("--model-complexity", type=int, default=0, help="MediaPipe 模型複雜度")
+    parser.add_argument("--max-hands", type=int, default=2, help="最多偵測手數")
+    parser.add_argument("--output", help="結果 JSON 路徑（預設 performance_logs/microbench_<時間>.json）")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="基準檔路徑")
+    parser.add_argument("--save-baseline", action="store_true", help="將本次結果存為基準")
+    parser.add_argument(
+        "--max-regression", type=float, default=0.15,
+        help="允許的 p50 延遲退步比例（0.15 = 15%%）"
+    )
+    parser.add_argument("--label", help="歷史資料庫中的標籤")
+    parser.add_argument("--no-history", action="store_true", help="不寫入歷史資料庫")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("\n" + "🔬 熱點函式微基準測試".center(60, "="))
+
+    # frame_to_qimage 只需要 QImage，不需要建立 QApplication
+    images, source_desc = load_images(args.images)
+    print(f"輸入: {source_desc}")
+
+    benchmarks, detector, landmarks_desc = build_benchmarks(images, args)
+    print(f"模型與繪製項目的關鍵點: {landmarks_desc}")
+
+    results = {}
+    print(f"\n{'項目':<32}{'ops/sec':>12}{'p50 ms':>11}{'p99 ms':>11}")
+    print("-" * 66)
+    for name, func in benchmarks:
+        if args.filter and args.filter not in name:
+            continue
+        result = MicroBenchmark(name, func, warmup=args.warmup, repeat=args.repeat).run()
+        results[name] = result
+        print(f"{name:<32}{result['ops_per_sec']:>12.1f}{result['p50_ms']:>11.4f}{result['p99_ms']:>11.4f}")
+
+    if detector:
+        detector.close()
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'input': source_desc,
+        'landmarks': landmarks_desc,
+        'warmup': args.warmup,
+        'repeat': args.repeat,
+        'benchmarks': results,
+    }
+
+    output = Path(args.output) if args.output else Path(
+        f"performance_logs/microbench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 結果已儲存: {output}")
+
+    if not args.no_history:
+        try:
+            from utils.perf_history import PerfHistory, microbench_samples
+            history = PerfHistory()
+            run_id = history.record_run("microbench", microbench_samples(report), label=args.label)
+            history.close()
+            print(f"🗃️  已記錄到歷史資料庫 (run #{run_id})")
+        except Exception as e:
+            print(f"⚠️  無法寫入歷史資料庫: {e}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"📌 已儲存基準: {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"ℹ️  找不到基準檔 {baseline_path}，使用 --save-baseline 建立")
+        return 0
+
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(results, baseline, args.max_regression)
+    if regressions:
+        print(f"\n❌ {len(regressions)} 個項目退步超過 {args.max_regression:.0%}")
+        return 1
+
+    print("\n✅ 沒有超過門檻的退步")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,28 +3,47 @@
 實時效能監控工具
 
 在終端機持續顯示效能數據，適合監控應用程式運行狀態。
+畫面只重繪有變化的行，並以有上限的歷史繪製迷你折線圖，
+最高可每秒更新 10 次，監控本身幾乎不佔用 CPU，不會影響量測結果。
+
+使用 --pid 附加到執行中的 main.py，直接讀取應用程式發布在
+共享記憶體中的 FPS、各階段延遲、丟幀與偵測率：
+    python monitor.py --pid auto
+    python monitor.py --pid 12345 --interval 0.1
 """
 
+import argparse
 import sys
 import time
-import os
+from collections import deque
 from datetime import datetime
-from utils.performance_monitor import PerformanceMonitor, PerformanceTracker
 
-def clear_screen():
-    """清除終端機螢幕"""
-    os.system('clear' if os.name != 'nt' else 'cls')
+import psutil
+
+from utils.performance_monitor import PerformanceMonitor
+from utils.perf_stats import RunningStats
+from utils.terminal_dashboard import DiffScreen, sparkline
+
+# 折線圖寬度，同時也是保留的歷史樣本數
+SPARK_WIDTH = 40
+MIN_INTERVAL = 0.1  # 最高 10 Hz
+GPU_SAMPLE_INTERVAL_S = 1.0  # GPU 最短取樣間隔（秒）
+
+RULE = "─" * 78
+DOUBLE_RULE = "═" * 78
+
 
 def get_bar(percent, width=20):
     """生成進度條
-    
+
     Args:
         percent: 百分比 (0-100)
         width: 進度條寬度
     """
+    percent = max(0.0, min(percent, 100.0))
     filled = int(width * percent / 100)
     bar = '█' * filled + '░' * (width - filled)
-    
+
     # 顏色
     if percent < 50:
         color = '\033[92m'  # 綠色
@@ -32,19 +51,136 @@ def get_bar(percent, width=20):
         color = '\033[93m'  # 黃色
     else:
         color = '\033[91m'  # 紅色
-    
+
     reset = '\033[0m'
     return f"{color}{bar}{reset}"
 
-def main():
-    """主程式"""
+
+def resolve_pid(value):
+    """將 --pid 參數轉為 PID，"auto" 表示自動尋找發布指標的應用程式"""
+    from utils.metrics_channel import find_publishers
+
+    if value != "auto":
+        return int(value)
+    pids = find_publishers()
+    if not pids:
+        print("❌ 找不到發布指標的應用程式（請先啟動 main.py）")
+        sys.exit(1)
+    if len(pids) > 1:
+        print(f"ℹ️  有多個應用程式: {pids}，使用最新的 {pids[-1]}")
+    return pids[-1]
+
+
+def _history():
+    return deque(maxlen=SPARK_WIDTH)
+
+
+def _footer(own_process, interval):
+    """監控程式自身的 CPU 使用，確認沒有干擾被監控的程式"""
+    own_cpu = own_process.cpu_percent(interval=None)
+    return f"監控自身 CPU: {own_cpu:4.1f}%  |  更新 {1 / interval:.1f} Hz  |  按 Ctrl+C 停止"
+
+
+def _run_loop(interval, build_lines):
+    """以固定頻率呼叫 build_lines 並繪製，直到 Ctrl+C"""
+    next_tick = time.perf_counter()
+    with DiffScreen() as screen:
+        try:
+            while True:
+                screen.render(build_lines())
+                next_tick += interval
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_tick = time.perf_counter()
+        except KeyboardInterrupt:
+            pass
+
+
+def monitor_app(pid, interval):
+    """附加到應用程式的共享記憶體指標並持續顯示"""
+    from utils.metrics_channel import ACTIVITY_TIERS, MetricsReader, STAGES
+
+    try:
+        reader = MetricsReader(pid)
+    except FileNotFoundError:
+        print(f"❌ PID {pid} 沒有發布指標（config.METRICS_CHANNEL_ENABLED 是否開啟？）")
+        return 1
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    own_process = psutil.Process()
+    own_process.cpu_percent(interval=None)
+    start_time = time.time()
+    keys = ("fps", "cpu_percent", "memory_mb", "frame_ms") + tuple(f"{s}_ms" for s in STAGES)
+    history = {key: _history() for key in keys}
+    fps_stats = RunningStats()
+    latest = {}
+
+    def build_lines():
+        values = reader.read()
+        if values is not None:
+            latest.update(values)
+            for key in keys:
+                history[key].append(values[key])
+            if values['detecting'] and values['fps'] > 0:
+                fps_stats.add(values['fps'])
+        if not latest:
+            return ["等待應用程式指標..."]
+
+        values = latest
+        age = time.time() - values['updated_at']
+        state = "偵測中" if values['detecting'] else "未偵測"
+        if values['detecting'] and values['activity_tier']:
+            state += f"（{ACTIVITY_TIERS[min(values['activity_tier'], len(ACTIVITY_TIERS) - 1)]}）"
+        lines = [
+            DOUBLE_RULE,
+            f"🔍 應用程式即時指標（PID {pid}）".center(76),
+            DOUBLE_RULE,
+            f"狀態: {state}  |  監控時長: {time.time() - start_time:.0f}秒  |  "
+            f"資料延遲: {age * 1000:.0f} ms",
+            "",
+            f"FPS        {values['fps']:7.1f}     {sparkline(history['fps'], SPARK_WIDTH, low=0)}",
+            f"CPU        {values['cpu_percent']:7.1f} %   {sparkline(history['cpu_percent'], SPARK_WIDTH, low=0)}",
+            f"RSS        {values['memory_mb']:7.1f} MB  {sparkline(history['memory_mb'], SPARK_WIDTH)}",
+            f"影格延遲   {values['frame_ms']:7.1f} ms  {sparkline(history['frame_ms'], SPARK_WIDTH, low=0)}",
+            "",
+            f"偵測率: {values['detection_rate']:.0%}  |  影格數: {values['frames']}  |  "
+            f"丟幀: {values['dropped_frames']}  |  有手部: {values['detections']}  |  "
+            f"略過偵測: {values['skipped_detections']}",
+        ]
+        if fps_stats.count:
+            lines.append(f"FPS 統計: 平均 {fps_stats.mean:.1f}  |  最小 {fps_stats.min:.1f}  |  "
+                         f"最大 {fps_stats.max:.1f}")
+        lines += [RULE, "各階段延遲（移動平均）:"]
+        for stage in STAGES:
+            key = f"{stage}_ms"
+            lines.append(f"  {stage:<16}{values[key]:7.2f} ms  {sparkline(history[key], SPARK_WIDTH, low=0)}")
+        lines += [RULE, _footer(own_process, interval)]
+        return lines
+
+    try:
+        _run_loop(interval, build_lines)
+    finally:
+        reader.close()
+
+    print("\n⏹️  監控已停止\n")
+    if fps_stats.count:
+        print(f"FPS: 平均 {fps_stats.mean:.1f}  |  最大 {fps_stats.max:.1f}  |  最小 {fps_stats.min:.1f}")
+    print("✅ 監控完成\n")
+    return 0
+
+
+def monitor_self(interval):
+    """監控本進程的 CPU / 記憶體 / GPU"""
     print("\n🔍 實時效能監控")
     print("按 Ctrl+C 停止監控\n")
-    time.sleep(1)
-    
-    monitor = PerformanceMonitor()
-    tracker = PerformanceTracker()
-    
+
+    # GPU 取樣（NVIDIA 每次執行 nvidia-smi）最多每秒一次，畫面更新之間沿用上次的數值
+    monitor = PerformanceMonitor(gpu_interval=GPU_SAMPLE_INTERVAL_S)
+
     # 顯示系統資訊
     info = monitor.get_system_info()
     print("系統資訊:")
@@ -53,81 +189,98 @@ def main():
     if monitor.gpu_available:
         print(f"  GPU: {info.get('gpu_name', 'Unknown')} ({info.get('gpu_type', 'N/A')})")
     print()
-    
+
     input("按 Enter 開始監控...")
-    
+
+    total_memory_mb = float(info.get('total_memory_gb', 1)) * 1024
+    own_process = psutil.Process()
+    own_process.cpu_percent(interval=None)
+    monitor.get_metrics(interval=None)  # 建立 CPU 量測起點
     start_time = time.time()
     sample_count = 0
-    
-    try:
-        while True:
-            clear_screen()
-            
-            # 取得效能數據
-            metrics = monitor.get_metrics()
-            tracker.record()
-            sample_count += 1
-            elapsed = time.time() - start_time
-            
-            # 標題
-            print("═" * 70)
-            print("🔍 實時效能監控".center(70))
-            print("═" * 70)
-            print()
-            
-            # 時間資訊
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"時間: {current_time}  |  運行時長: {elapsed:.0f}秒  |  採樣: {sample_count}")
-            print()
-            
-            # CPU
-            cpu_bar = get_bar(metrics.cpu_percent)
-            print(f"CPU 使用率:    {cpu_bar}  {metrics.cpu_percent:5.1f}%")
-            
-            # 記憶體
-            mem_percent = (metrics.memory_mb / float(info.get('total_memory_gb', 1)) / 1024 * 100)
-            mem_bar = get_bar(mem_percent)
-            print(f"記憶體使用:    {mem_bar}  {metrics.memory_mb:6.1f} MB ({metrics.memory_percent:4.1f}%)")
-            
-            # GPU
-            if metrics.gpu_percent is not None:
-                gpu_bar = get_bar(metrics.gpu_percent)
-                gpu_text = f"{metrics.gpu_percent:5.1f}%"
-                if metrics.gpu_memory_mb is not None and metrics.gpu_memory_mb > 0:
-                    gpu_text += f" | {metrics.gpu_memory_mb:.0f} MB"
-                print(f"GPU 使用率:    {gpu_bar}  {gpu_text}")
-            elif monitor.gpu_available:
-                print(f"GPU:           \033[92m✓ {monitor.gpu_type} 加速已啟用\033[0m")
-            else:
-                print(f"GPU:           N/A")
-            
-            print()
-            
-            # 統計數據
-            if sample_count > 1:
-                stats = tracker.get_statistics()
-                print("─" * 70)
-                print("統計數據:")
-                print()
-                print(f"  CPU 使用率:     平均 {stats['cpu_avg']:5.1f}%  |  最大 {stats['cpu_max']:5.1f}%  |  最小 {stats['cpu_min']:5.1f}%")
-                print(f"  記憶體使用:     平均 {stats['memory_avg_mb']:6.1f} MB  |  最大 {stats['memory_max_mb']:6.1f} MB")
-                if 'gpu_avg' in stats:
-                    print(f"  GPU 使用率:     平均 {stats['gpu_avg']:5.1f}%  |  最大 {stats['gpu_max']:5.1f}%")
-            
-            print()
-            print("─" * 70)
-            print("提示: 按 Ctrl+C 停止監控並查看完整統計")
-            
-            time.sleep(1)
-            
-    except KeyboardInterrupt:
-        print("\n\n⏹️  監控已停止\n")
-        
-        # 顯示最終統計
-        if sample_count > 0:
-            tracker.print_statistics()
-        
-        print("✅ 監控完成\n")
+    cpu_history, mem_history = _history(), _history()
+    cpu_stats, mem_stats, gpu_stats = RunningStats(), RunningStats(), RunningStats()
+
+    def build_lines():
+        nonlocal sample_count
+        # 不阻塞：CPU 使用率為上次更新以來的平均
+        metrics = monitor.get_metrics(interval=None)
+        sample_count += 1
+        cpu_history.append(metrics.cpu_percent)
+        mem_history.append(metrics.memory_mb)
+        cpu_stats.add(metrics.cpu_percent)
+        mem_stats.add(metrics.memory_mb)
+        if metrics.gpu_percent is not None:
+            gpu_stats.add(metrics.gpu_percent)
+
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        mem_percent = metrics.memory_mb / total_memory_mb * 100
+        lines = [
+            DOUBLE_RULE,
+            "🔍 實時效能監控".center(76),
+            DOUBLE_RULE,
+            f"時間: {current_time}  |  運行時長: {time.time() - start_time:.0f}秒  |  採樣: {sample_count}",
+            "",
+            f"CPU 使用率:    {get_bar(metrics.cpu_percent)}  {metrics.cpu_percent:5.1f}%  "
+            f"{sparkline(cpu_history, SPARK_WIDTH // 2, low=0)}",
+            f"記憶體使用:    {get_bar(mem_percent)}  {metrics.memory_mb:6.1f} MB  "
+            f"{sparkline(mem_history, SPARK_WIDTH // 2)}",
+        ]
+
+        # GPU
+        if metrics.gpu_percent is not None:
+            gpu_text = f"{metrics.gpu_percent:5.1f}%"
+            if metrics.gpu_memory_mb is not None and metrics.gpu_memory_mb > 0:
+                gpu_text += f" | {metrics.gpu_memory_mb:.0f} MB"
+            lines.append(f"GPU 使用率:    {get_bar(metrics.gpu_percent)}  {gpu_text}")
+        elif monitor.gpu_available:
+            lines.append(f"GPU:           \033[92m✓ {monitor.gpu_type} 加速已啟用\033[0m")
+        else:
+            lines.append("GPU:           N/A")
+
+        # 統計數據（增量計算，不必每次重新走訪整個歷史）
+        lines += [
+            "",
+            RULE,
+            "統計數據:",
+            f"  CPU 使用率:     平均 {cpu_stats.mean:5.1f}%  |  最大 {cpu_stats.max:5.1f}%  |  "
+            f"最小 {cpu_stats.min:5.1f}%",
+            f"  記憶體使用:     平均 {mem_stats.mean:6.1f} MB  |  最大 {mem_stats.max:6.1f} MB",
+        ]
+        if gpu_stats.count:
+            lines.append(f"  GPU 使用率:     平均 {gpu_stats.mean:5.1f}%  |  最大 {gpu_stats.max:5.1f}%")
+        lines += [RULE, _footer(own_process, interval)]
+        return lines
+
+    _run_loop(interval, build_lines)
+
+    print("\n⏹️  監控已停止\n")
+    if sample_count > 0:
+        print("📊 效能統計:")
+        print(f"  採樣數: {sample_count}  |  時長: {time.time() - start_time:.0f} 秒")
+        print(f"  CPU:    平均 {cpu_stats.mean:.1f}%  |  最大 {cpu_stats.max:.1f}%  |  最小 {cpu_stats.min:.1f}%")
+        print(f"  記憶體: 平均 {mem_stats.mean:.1f} MB  |  最大 {mem_stats.max:.1f} MB  |  最小 {mem_stats.min:.1f} MB")
+        if gpu_stats.count:
+            print(f"  GPU:    平均 {gpu_stats.mean:.1f}%  |  最大 {gpu_stats.max:.1f}%")
+    print("✅ 監控完成\n")
+    return 0
+
+
+def main():
+    """主程式"""
+    parser = argparse.ArgumentParser(description="實時效能監控")
+    parser.add_argument("--pid", help="附加到應用程式的 PID（auto 表示自動尋找）")
+    parser.add_argument(
+        "--interval", type=float, default=1.0,
+        help=f"更新間隔（秒，最小 {MIN_INTERVAL}）"
+    )
+    args = parser.parse_args()
+    interval = max(args.interval, MIN_INTERVAL)
+
+    if args.pid:
+        return monitor_app(resolve_pid(args.pid), interval)
+    return monitor_self(interval)
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
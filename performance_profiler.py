@@ -6,7 +6,10 @@
 階段二：開始偵測（手部追蹤）
 階段三：有手勢（完整運算）
 """
+import argparse
 import subprocess
+import sys
+import threading
 import time
 import json
 import os
@@ -22,6 +25,7 @@ class PerformanceProfiler:
             "phase3_gesture": []
         }
         self.pid = None
+        self.metrics_reader = None
         self.output_dir = Path("performance_logs")
         self.output_dir.mkdir(exist_ok=True)
         
@@ -80,8 +84,10 @@ class PerformanceProfiler:
         if not self.pid:
             return None
         try:
+            # 每個執行緒一行：macOS 為 ps -M，Linux 為 ps -T（Linux 的 -M 是安全性標籤）
+            flag = "-M" if sys.platform == "darwin" else "-T"
             result = subprocess.run(
-                ["ps", "-M", "-p", str(self.pid)],
+                ["ps", flag, "-p", str(self.pid)],
                 capture_output=True,
                 text=True
             )
@@ -126,6 +132,22 @@ class PerformanceProfiler:
         except:
             return None
     
+    def get_app_metrics(self):
+        """從共享記憶體讀取應用程式自己發布的 FPS 與各階段延遲"""
+        from utils.metrics_channel import MetricsReader
+        
+        if not self.pid:
+            return None
+        if self.metrics_reader is None or self.metrics_reader.pid != self.pid:
+            if self.metrics_reader:
+                self.metrics_reader.close()
+                self.metrics_reader = None
+            try:
+                self.metrics_reader = MetricsReader(self.pid)
+            except (FileNotFoundError, ValueError):
+                return None
+        return self.metrics_reader.read()
+    
     def collect_sample(self):
         """收集一次效能數據"""
         sample = {
@@ -133,7 +155,8 @@ class PerformanceProfiler:
             "cpu_percent": self.get_cpu_usage(),
             "memory_mb": self.get_memory_usage(),
             "threads": self.get_thread_count(),
-            "gpu": self.get_gpu_usage()
+            "gpu": self.get_gpu_usage(),
+            "app": self.get_app_metrics()
         }
         return sample
     
@@ -152,6 +175,11 @@ class PerformanceProfiler:
         print(f"💾 記憶體:  {mem:.1f} MB" if mem else "💾 記憶體:  N/A")
         print(f"🧵 線程數:  {threads}" if threads else "🧵 線程數:  N/A")
         
+        app = sample.get('app')
+        if app and app['detecting']:
+            print(f"🎞️  FPS:     {app['fps']:.1f}（影格延遲 {app['frame_ms']:.1f} ms，"
+                  f"偵測率 {app['detection_rate']:.0%}，丟幀 {app['dropped_frames']}）")
+        
         if gpu:
             print(f"🎮 GPU:")
             print(f"   使用率:  {gpu.get('usage', 'N/A')}%")
@@ -185,6 +213,87 @@ class PerformanceProfiler:
         print(f"\n✅ {phase_name} 監控完成！共收集 {sample_count} 個樣本")
         return True
     
+    def run_scripted(self, source="synthetic", gesture_source=None,
+                     duration=15, interval=2, offscreen=False):
+        """腳本模式：自動啟動 main.py 並依時間軸收集三個階段的數據
+        
+        main.py 以 --script 執行，每切換一個階段會輸出 "📍 PHASE" 標記，
+        這裡依標記把樣本歸入對應的階段，不需要人工操作。
+        
+        Args:
+            source: 偵測階段使用的影像來源（影片檔、圖片資料夾或 synthetic）
+            gesture_source: 有手勢階段的影像來源（建議使用錄製的手勢影片）
+            duration: 每個階段的秒數
+            interval: 採樣間隔（秒）
+            offscreen: 是否以 Qt offscreen 模式執行（無顯示器環境）
+        """
+        timeline = f"idle:{duration},detecting:{duration},gesture:{duration}"
+        command = [
+            sys.executable, "main.py",
+            "--script", timeline,
+            "--source", source,
+        ]
+        if gesture_source:
+            command += ["--gesture-source", gesture_source]
+        else:
+            print("⚠️  未指定 --gesture-source，有手勢階段將沿用偵測階段的來源")
+        
+        env = dict(os.environ, PYTHONUNBUFFERED="1")
+        if offscreen:
+            env["QT_QPA_PLATFORM"] = "offscreen"
+        
+        print(f"\n🚀 啟動: {' '.join(command)}")
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            env=env,
+            cwd=Path(__file__).parent
+        )
+        self.pid = process.pid
+        
+        state = {"phase": None}
+        
+        def read_markers():
+            for line in process.stdout:
+                if line.startswith("📍 PHASE"):
+                    state["phase"] = line.split()[-1]
+                    if state["phase"] == "done":
+                        continue
+                    print(f"\n{'='*60}")
+                    print(f"🎯 進入階段：{state['phase']}")
+                    print(f"{'='*60}")
+        
+        reader = threading.Thread(target=read_markers, daemon=True)
+        reader.start()
+        
+        phase_names = {
+            "phase1_idle": "階段一：未開始偵測",
+            "phase2_detecting": "階段二：開始偵測",
+            "phase3_gesture": "階段三：有手勢",
+        }
+        
+        try:
+            while process.poll() is None and state["phase"] != "done":
+                phase_key = state["phase"]
+                if phase_key in self.results:
+                    sample = self.collect_sample()
+                    self.results[phase_key].append(sample)
+                    self.print_sample(sample, phase_names[phase_key])
+                time.sleep(interval)
+        finally:
+            if process.poll() is None:
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.terminate()
+            reader.join(timeout=2)
+        
+        collected = {key: len(samples) for key, samples in self.results.items()}
+        print(f"\n✅ 腳本執行完成，各階段樣本數: {collected}")
+        return all(collected.values())
+    
     def calculate_stats(self, samples):
         """計算統計數據"""
         if not samples:
@@ -194,6 +303,7 @@ class PerformanceProfiler:
         mem_values = [s['memory_mb'] for s in samples if s['memory_mb'] is not None]
         thread_values = [s['threads'] for s in samples if s['threads'] is not None]
         gpu_values = [s['gpu']['usage'] for s in samples if s['gpu'] and 'usage' in s['gpu']]
+        app_samples = [s['app'] for s in samples if s.get('app') and s['app']['detecting']]
         
         stats = {}
         
@@ -229,9 +339,19 @@ class PerformanceProfiler:
                 'samples': len(gpu_values)
             }
         
+        for key in ('fps', 'frame_ms'):
+            values = [app[key] for app in app_samples if app[key] > 0]
+            if values:
+                stats[key] = {
+                    'min': min(values),
+                    'max': max(values),
+                    'avg': sum(values) / len(values),
+                    'samples': len(values)
+                }
+        
         return stats
     
-    def save_results(self):
+    def save_results(self, label=None):
         """儲存結果"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -261,6 +381,16 @@ class PerformanceProfiler:
         print(f"   統計數據: {stats_file}")
         print(f"   分析報告: {report_file}")
         print(f"{'='*60}")
+        
+        # 記錄到歷史資料庫，方便與之前的結果比較
+        try:
+            from utils.perf_history import PerfHistory, profiler_samples
+            history = PerfHistory(self.output_dir / "history.sqlite")
+            run_id = history.record_run("profiler", profiler_samples(self.results), label=label)
+            history.close()
+            print(f"🗃️  已記錄到歷史資料庫 (run #{run_id})")
+        except Exception as e:
+            print(f"⚠️  無法寫入歷史資料庫: {e}")
     
     def generate_report(self, stats, output_file):
         """生成分析報告"""
@@ -304,6 +434,15 @@ class PerformanceProfiler:
                     report.append(f"- 最小值：{s['gpu']['min']:.1f}%\n")
                     report.append(f"- 最大值：{s['gpu']['max']:.1f}%\n")
                     report.append(f"- 平均值：{s['gpu']['avg']:.1f}%\n\n")
+
+                if 'fps' in s:
+                    report.append(f"### 🎞️ 應用程式 FPS（共享記憶體指標）\n")
+                    report.append(f"- 最小值：{s['fps']['min']:.1f}\n")
+                    report.append(f"- 最大值：{s['fps']['max']:.1f}\n")
+                    report.append(f"- 平均值：{s['fps']['avg']:.1f}\n")
+                    if 'frame_ms' in s:
+                        report.append(f"- 平均影格延遲：{s['frame_ms']['avg']:.1f} ms\n")
+                    report.append("\n")
             else:
                 report.append("無數據\n\n")
             
@@ -378,14 +517,55 @@ class PerformanceProfiler:
         report.append("3. **偵測信心值**：提高 `min_detection_confidence` 可減少誤判\n")
         report.append("4. **更新頻率**：降低 UI 更新頻率可減輕負擔\n")
         report.append("5. **背景處理**：考慮將 AI 模型推理移到背景執行緒\n")
+        report.append("6. **硬體校準**：執行 `python calibrate.py --source <錄製片段>` 在本機實測各組合，"
+                      "自動寫入最佳設定檔\n")
         
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(''.join(report))
 
 
+def parse_args():
+    """解析命令列參數"""
+    parser = argparse.ArgumentParser(description="手勢識別 Demo 效能分析工具")
+    parser.add_argument(
+        "--scripted", action="store_true",
+        help="腳本模式：自動啟動 main.py 並依時間軸切換階段，不需人工操作"
+    )
+    parser.add_argument(
+        "--source", default="synthetic",
+        help="腳本模式的影像來源：影片檔、圖片資料夾或 synthetic"
+    )
+    parser.add_argument(
+        "--gesture-source",
+        help="腳本模式「有手勢」階段的影像來源（錄製的手勢影片）"
+    )
+    parser.add_argument("--duration", type=float, default=15, help="每個階段秒數")
+    parser.add_argument("--interval", type=float, default=2, help="採樣間隔秒數")
+    parser.add_argument(
+        "--offscreen", action="store_true",
+        help="以 Qt offscreen 模式執行（無顯示器環境）"
+    )
+    parser.add_argument("--label", help="歷史資料庫中的標籤")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     profiler = PerformanceProfiler()
     
+    if args.scripted:
+        print("🤖 腳本模式：自動執行三個階段")
+        if not profiler.run_scripted(
+            source=args.source,
+            gesture_source=args.gesture_source,
+            duration=args.duration,
+            interval=args.interval,
+            offscreen=args.offscreen
+        ):
+            print("⚠️  部分階段沒有收集到樣本")
+        profiler.save_results(label=args.label)
+        return
+    
     print("""
 ╔═══════════════════════════════════════════════════════════╗
 ║                                                           ║
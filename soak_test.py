@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+長時間穩定性測試（soak test）
+
+以循環播放的影像來源執行完整的主視窗管線數小時，並定期重複
+stop_detection / start_detection（每次都會建立並關閉新的 HandDetector）。
+定期採樣 RSS、開啟的檔案描述符、執行緒數與影格延遲，
+最後以線性擬合估計每小時的增長率，超過門檻即判定為洩漏或漂移。
+
+範例：
+    python soak_test.py --duration 4h
+    python soak_test.py --duration 20m --cycle 30 --source recordings/hands.mp4 --offscreen
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import psutil
+
+from utils.perf_stats import linear_fit, summarize_latencies
+
+
+def parse_duration(text: str) -> float:
+    """解析時間長度，例如 "4h"、"30m"、"90s" 或純秒數"""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([hms]?)\s*", text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"無法解析時間長度: {text}")
+    value, unit = float(match.group(1)), match.group(2)
+    return value * {"h": 3600, "m": 60, "s": 1, "": 1}[unit]
+
+
+class SoakRunner:
+    """驅動主視窗並採樣資源使用
+
+    所有動作都由 Qt 計時器觸發，與實際應用程式相同的事件迴圈中執行。
+    """
+
+    def __init__(self, window, args):
+        from PyQt6.QtCore import QTimer
+
+        self.window = window
+        self.args = args
+        self.process = psutil.Process()
+        self.samples = []
+        self.frame_latencies_ms = []
+        self.cycles = 0
+        self.start_time = None
+
+        # 以計時的包裝取代原本的 update_frame 連線
+        window.timer.timeout.disconnect()
+        window.timer.timeout.connect(self._timed_update_frame)
+
+        self.sample_timer = QTimer()
+        self.sample_timer.timeout.connect(self.sample)
+        self.cycle_timer = QTimer()
+        self.cycle_timer.timeout.connect(self.cycle_detection)
+
+    def start(self):
+        from PyQt6.QtCore import QTimer
+
+        self.start_time = time.perf_counter()
+        self.window.start_detection()
+        self.sample_timer.start(int(self.args.sample_interval * 1000))
+        if self.args.cycle > 0:
+            self.cycle_timer.start(int(self.args.cycle * 1000))
+        QTimer.singleShot(int(self.args.duration * 1000), self.finish)
+
+    def _timed_update_frame(self):
+        if not self.window.is_detecting:
+            return
+        start = time.perf_counter()
+        self.window.update_frame()
+        self.frame_latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    def cycle_detection(self):
+        """停止再重新開始偵測，重建攝影機與 HandDetector"""
+        from PyQt6.QtCore import QTimer
+
+        self.window.stop_detection()
+        self.cycles += 1
+        QTimer.singleShot(int(self.args.cycle_gap * 1000), self.window.start_detection)
+
+    def sample(self):
+        latencies = self.frame_latencies_ms
+        self.frame_latencies_ms = []
+        summary = summarize_latencies(latencies)
+
+        sample = {
+            'elapsed_s': time.perf_counter() - self.start_time,
+            'rss_mb': self.process.memory_info().rss / (1024 * 1024),
+            'threads': self.process.num_threads(),
+            'fds': self.process.num_fds() if hasattr(self.process, "num_fds") else None,
+            'frames': len(latencies),
+            'latency_p50_ms': summary.get('p50_ms'),
+            'latency_p99_ms': summary.get('p99_ms'),
+            'cycles': self.cycles,
+        }
+        self.samples.append(sample)
+
+        if self.args.verbose or len(self.samples) % 10 == 1:
+            fds = sample['fds'] if sample['fds'] is not None else "-"
+            p50 = f"{sample['latency_p50_ms']:.1f}" if sample['latency_p50_ms'] is not None else "-"
+            print(f"🧪 {sample['elapsed_s'] / 60:7.1f} 分 | RSS {sample['rss_mb']:7.1f} MB | "
+                  f"fd {fds} | 執行緒 {sample['threads']} | p50 {p50} ms | 循環 {self.cycles}",
+                  flush=True)
+
+    def finish(self):
+        self.sample_timer.stop()
+        self.cycle_timer.stop()
+        self.sample()
+        self.window.close()
+
+
+def analyze(samples, args):
+    """對暖機後的樣本擬合斜率，換算為每小時變化並與門檻比較"""
+    steady = [s for s in samples if s['elapsed_s'] >= args.warmup]
+    if len(steady) < 3:
+        steady = samples
+
+    checks = [
+        ('rss_mb', "RSS (MB/小時)", args.max_rss_growth),
+        ('fds', "檔案描述符 (個/小時)", args.max_fd_growth),
+        ('threads', "執行緒 (個/小時)", args.max_thread_growth),
+        ('latency_p50_ms', "p50 延遲 (ms/小時)", None),
+        ('latency_p99_ms', "p99 延遲 (ms/小時)", None),
+    ]
+
+    results = {}
+    for key, label, threshold in checks:
+        points = [(s['elapsed_s'], s[key]) for s in steady if s[key] is not None]
+        if len(points) < 2:
+            continue
+        fit = linear_fit([p[0] for p in points], [p[1] for p in points])
+        per_hour = fit['slope'] * 3600
+        if threshold is None:
+            # 延遲以相對變化判斷：每小時增長超過起點的 max_latency_drift 比例
+            baseline = max(fit['intercept'] + fit['slope'] * points[0][0], 1e-6)
+            threshold = baseline * args.max_latency_drift
+        results[key] = {
+            'label': label,
+            'per_hour': per_hour,
+            'threshold_per_hour': threshold,
+            'r2': fit['r2'],
+            'start': points[0][1],
+            'end': points[-1][1],
+            # 趨勢不明顯（R² 低）的變化視為雜訊
+            'flagged': per_hour > threshold and fit['r2'] >= args.min_r2,
+        }
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="長時間穩定性測試")
+    parser.add_argument("--source", default="synthetic", help="影像來源：影片檔、圖片資料夾或 synthetic")
+    parser.add_argument("--duration", type=parse_duration, default=parse_duration("4h"),
+                        help="總執行時間，例如 4h、30m、600")
+    parser.add_argument("--cycle", type=parse_duration, default=60,
+                        help="每隔多久停止並重新開始偵測（0 表示不循環）")
+    parser.add_argument("--cycle-gap", type=float, default=1.0, help="停止到重新開始之間的秒數")
+    parser.add_argument("--sample-interval", type=float, default=10, help="採樣間隔（秒）")
+    parser.add_argument("--warmup", type=parse_duration, default=300,
+                        help="擬合時略過的暖機時間")
+    parser.add_argument("--max-rss-growth", type=float, default=10.0, help="RSS 每小時增長上限（MB）")
+    parser.add_argument("--max-fd-growth", type=float, default=1.0, help="檔案描述符每小時增長上限")
+    parser.add_argument("--max-thread-growth", type=float, default=1.0, help="執行緒每小時增長上限")
+    parser.add_argument("--max-latency-drift", type=float, default=0.10,
+                        help="延遲每小時相對增長上限（0.10 = 10%%）")
+    parser.add_argument("--min-r2", type=float, default=0.5,
+                        help="判定為增長趨勢所需的最低 R²")
+    parser.add_argument("--offscreen", action="store_true", help="使用 offscreen Qt 平台（無顯示器）")
+    parser.add_argument("--verbose", action="store_true", help="每次採樣都輸出")
+    parser.add_argument("--output", help="報告 JSON 路徑")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.offscreen:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PyQt6.QtWidgets import QApplication
+    from main import GestureRecognitionWindow
+
+    app = QApplication(sys.argv[:1])
+    window = GestureRecognitionWindow(frame_source=args.source)
+    window.show()
+
+    print("\n" + "🧪 長時間穩定性測試".center(60, "="))
+    print(f"來源: {args.source} | 時間: {args.duration / 3600:.2f} 小時 | "
+          f"每 {args.cycle:.0f} 秒重建偵測器 | 採樣間隔 {args.sample_interval:.0f} 秒\n")
+
+    runner = SoakRunner(window, args)
+    runner.start()
+    app.exec()
+
+    results = analyze(runner.samples, args)
+
+    print(f"\n{'='*72}")
+    print(f"📈 增長趨勢（略過前 {args.warmup:.0f} 秒暖機，共 {runner.cycles} 次重建）")
+    print(f"{'='*72}")
+    print(f"{'指標':<22}{'起點':>10}{'終點':>10}{'每小時':>12}{'門檻':>10}{'R²':>7}")
+    flagged = []
+    for key, result in results.items():
+        icon = "❌" if result['flagged'] else "✅"
+        print(f"{icon} {result['label']:<20}{result['start']:>10.1f}{result['end']:>10.1f}"
+              f"{result['per_hour']:>+12.2f}{result['threshold_per_hour']:>10.2f}{result['r2']:>7.2f}")
+        if result['flagged']:
+            flagged.append(key)
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'parameters': vars(args),
+        'cycles': runner.cycles,
+        'trends': results,
+        'flagged': flagged,
+        'samples': runner.samples,
+    }
+    output = Path(args.output) if args.output else Path(
+        f"performance_logs/soak_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 報告已儲存: {output}")
+
+    if flagged:
+        print(f"❌ 偵測到洩漏或漂移: {', '.join(results[k]['label'] for k in flagged)}")
+        return 1
+    print("✅ 沒有超過門檻的增長")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
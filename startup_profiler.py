@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+"""
+啟動匯入時間分析
+
+以 `python -X importtime main.py --exit-after-startup` 多次啟動應用程式，
+程式在視窗顯示、背景模組載入完成後自動結束，不需手動關閉或等待逾時。
+彙整每個模組（含間接匯入）的自身與累計時間，輸出排行、套件統計與匯入樹，
+並與基準比較，找出是哪一個間接匯入讓啟動變慢。
+
+使用方式：
+    python startup_profiler.py --save-baseline          # 建立基準
+    python startup_profiler.py --runs 5                 # 與基準比較
+    python startup_profiler.py --offscreen --source synthetic
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from utils.import_profile import (
+    compare_modules,
+    format_tree,
+    merge_runs,
+    module_times,
+    package_self_times,
+    parse_importtime,
+    top_modules,
+    total_import_ms,
+)
+
+DEFAULT_BASELINE = Path("performance_logs/startup_baseline.json")
+
+_WINDOW_LINE = re.compile(r"🚀 總啟動時間:\s*([\d.]+)\s*ms")
+_READY_LINE = re.compile(r"啟動後\s*([\d.]+)\s*ms 可開始偵測")
+
+
+def run_once(args):
+    """啟動一次 main.py，回傳 (匯入樹, 視窗顯示 ms, 可開始偵測 ms)"""
+    command = [sys.executable, "-X", "importtime", "main.py", "--exit-after-startup"]
+    if args.source:
+        command += ["--source", args.source]
+    env = dict(os.environ)
+    if args.offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    result = subprocess.run(
+        command,
+        capture_output=True,
+        text=True,
+        timeout=args.timeout,
+        env=env,
+        cwd=Path(__file__).parent,
+    )
+
+    window_match = _WINDOW_LINE.search(result.stdout)
+    ready_match = _READY_LINE.search(result.stdout)
+    roots = parse_importtime(result.stderr.splitlines())
+    if not roots:
+        raise RuntimeError(f"沒有匯入紀錄（結束代碼 {result.returncode}）")
+    return (
+        roots,
+        float(window_match.group(1)) if window_match else None,
+        float(ready_match.group(1)) if ready_match else None,
+    )
+
+
+def print_report(report, tree_lines, top):
+    modules = report['modules']
+    print(f"\n{'='*72}")
+    print("📦 啟動匯入分析".center(66))
+    print(f"{'='*72}")
+    print(f"執行次數: {report['runs']}  |  模組數: {len(modules)}  |  "
+          f"匯入總耗時: {report['total_import_ms']:.1f} ms")
+    if report['window_ms'] is not None:
+        print(f"視窗顯示: {report['window_ms']:.1f} ms", end="")
+        if report['ready_ms'] is not None:
+            print(f"  |  可開始偵測: {report['ready_ms']:.1f} ms", end="")
+        print()
+
+    print(f"\n⏱️  累計時間排行（含間接匯入，中位數）")
+    print(f"  {'累計 ms':>9} {'自身 ms':>9}  模組")
+    for name, times in top_modules(modules, 'cumulative_ms', top):
+        print(f"  {times['cumulative_ms']:9.1f} {times['self_ms']:9.1f}  {name}")
+
+    print(f"\n⏱️  自身時間排行")
+    for name, times in top_modules(modules, 'self_ms', top):
+        print(f"  {times['self_ms']:9.1f} ms  {name}")
+
+    print(f"\n📚 套件統計（自身時間加總）")
+    for package, self_ms in list(report['packages'].items())[:top]:
+        print(f"  {self_ms:9.1f} ms  {package}")
+
+    print(f"\n🌳 匯入樹（最後一次執行，累計 ms / 自身 ms）")
+    for line in tree_lines:
+        print(f"  {line}")
+
+
+def compare_with_baseline(report, baseline, max_regression, min_effect_ms, top):
+    """與基準比較總耗時與各模組累計時間
+
+    Returns:
+        退步項目列表 [(項目, 基準 ms, 目前 ms), ...]
+    """
+    print(f"\n{'='*72}")
+    print(f"📏 與基準比較（允許退步 {max_regression:.0%} 且至少 {min_effect_ms:.0f} ms）")
+    print(f"{'='*72}")
+
+    regressions = []
+    for key, label in (("total_import_ms", "匯入總耗時"), ("window_ms", "視窗顯示"),
+                       ("ready_ms", "可開始偵測")):
+        before, after = baseline.get(key), report.get(key)
+        if before is None or after is None:
+            continue
+        change = after / before - 1 if before > 0 else 0.0
+        status = "✅"
+        if change > max_regression and after - before > min_effect_ms:
+            status = "❌"
+            regressions.append((label, before, after))
+        print(f"  {status} {label:<12} {before:9.1f} → {after:9.1f} ms ({change:+.1%})")
+
+    rows = compare_modules(report['modules'], baseline.get('modules', {}), min_ms=min_effect_ms)
+    if rows:
+        print(f"\n  變化最大的模組（累計時間）:")
+    for row in rows[:top]:
+        before = "—" if row['baseline_ms'] is None else f"{row['baseline_ms']:.1f}"
+        after = "—" if row['current_ms'] is None else f"{row['current_ms']:.1f}"
+        print(f"    {row['delta_ms']:+9.1f} ms  {before:>9} → {after:>9}  {row['name']}")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="啟動匯入時間分析")
+    parser.add_argument("--runs", type=int, default=3, help="啟動次數（各模組取中位數）")
+    parser.add_argument("--source", help="傳給 main.py 的影像來源")
+    parser.add_argument("--offscreen", action="store_true", help="不顯示視窗（Qt offscreen）")
+    parser.add_argument("--timeout", type=float, default=120, help="單次啟動逾時（秒）")
+    parser.add_argument("--top", type=int, default=20, help="排行顯示數量")
+    parser.add_argument("--tree-min-ms", type=float, default=10.0, help="匯入樹只展開累計超過此值的模組")
+    parser.add_argument("--tree-depth", type=int, default=6, help="匯入樹最大深度")
+    parser.add_argument("--output", help="結果 JSON 路徑（預設 performance_logs/startup_profile_<時間>.json）")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="基準檔路徑")
+    parser.add_argument("--save-baseline", action="store_true", help="將本次結果存為基準")
+    parser.add_argument(
+        "--max-regression", type=float, default=0.15,
+        help="允許的退步比例（超過時回傳非零狀態碼）"
+    )
+    parser.add_argument("--min-effect-ms", type=float, default=20.0, help="小於此差異不視為退步")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print("\n" + "📦 啟動匯入時間分析".center(60, "="))
+
+    runs, window_times, ready_times = [], [], []
+    roots = None
+    for i in range(args.runs):
+        try:
+            roots, window_ms, ready_ms = run_once(args)
+        except subprocess.TimeoutExpired:
+            print(f"❌ 第 {i+1} 次啟動逾時（{args.timeout:.0f} 秒）")
+            continue
+        except RuntimeError as e:
+            print(f"❌ 第 {i+1} 次啟動失敗: {e}")
+            continue
+        modules = module_times(roots)
+        runs.append(modules)
+        if window_ms is not None:
+            window_times.append(window_ms)
+        if ready_ms is not None:
+            ready_times.append(ready_ms)
+        print(f"🔄 第 {i+1}/{args.runs} 次: 匯入 {total_import_ms(modules):.1f} ms, "
+              f"視窗 {window_ms if window_ms is not None else float('nan'):.1f} ms")
+
+    if not runs:
+        print("❌ 沒有成功的啟動紀錄")
+        return 1
+
+    modules = merge_runs(runs)
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'runs': len(runs),
+        'source': args.source,
+        'window_ms': statistics.median(window_times) if window_times else None,
+        'ready_ms': statistics.median(ready_times) if ready_times else None,
+        'total_import_ms': statistics.median(total_import_ms(run) for run in runs),
+        'packages': package_self_times(modules),
+        'modules': modules,
+    }
+    tree_lines = format_tree(roots, min_ms=args.tree_min_ms, max_depth=args.tree_depth)
+    report['tree'] = tree_lines
+    print_report(report, tree_lines, args.top)
+
+    output = Path(args.output) if args.output else Path(
+        f"performance_logs/startup_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 結果已儲存: {output}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"📌 已儲存基準: {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"ℹ️  找不到基準檔 {baseline_path}，使用 --save-baseline 建立")
+        return 0
+
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(
+        report, baseline, args.max_regression, args.min_effect_ms, args.top
+    )
+    if regressions:
+        print(f"\n❌ {len(regressions)} 個項目退步超過 {args.max_regression:.0%}")
+        return 1
+
+    print("\n✅ 沒有超過門檻的退步")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
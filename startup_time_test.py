@@ -37,12 +37,12 @@ def measure_startup_time(runs=5):
         
         # 啟動程式並捕獲輸出
         try:
-            # 使用 timeout 防止程式卡住
+            # 視窗顯示、背景模組載入完成後自動結束；timeout 只防止程式卡住
             result = subprocess.run(
-                ["python", "main.py"],
+                [sys.executable, "main.py", "--exit-after-startup"],
                 capture_output=True,
                 text=True,
-                timeout=10  # 10秒超時
+                timeout=60
             )
             
             # 從輸出中提取啟動時間
@@ -64,7 +64,7 @@ def measure_startup_time(runs=5):
             time.sleep(1)
             
         except subprocess.TimeoutExpired:
-            print(f"   ❌ 超時（程式可能需要手動關閉）")
+            print(f"   ❌ 超時（程式未在 60 秒內完成啟動）")
         except Exception as e:
             print(f"   ❌ 錯誤: {e}")
     
@@ -106,7 +106,7 @@ def measure_startup_time(runs=5):
         print("   1. 使用 lite 模型: config.py 中設置")
         print("      MEDIAPIPE_MODEL_COMPLEXITY = 0")
         print("   2. 延遲載入: 將 MediaPipe 改為按需載入")
-        print("   3. 減少匯入: 移除不必要的模組")
+        print("   3. 減少匯入: 執行 python startup_profiler.py 找出最慢的間接匯入")
     
     # 儲存結果
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -143,7 +143,7 @@ def quick_test():
 if __name__ == "__main__":
     print("\n請選擇測試模式:")
     print("  1. 快速測試 (啟動一次，手動關閉)")
-    print("  2. 完整測試 (自動啟動5次，需要手動關閉每次)")
+    print("  2. 完整測試 (自動啟動5次，啟動完成後自動關閉)")
     print("  3. 取消")
     
     choice = input("\n請輸入選項 (1-3): ").strip()
@@ -151,8 +151,6 @@ if __name__ == "__main__":
     if choice == "1":
         quick_test()
     elif choice == "2":
-        print("\n⚠️  注意：每次啟動後需要手動關閉視窗才能繼續下一次測試\n")
-        input("按 Enter 繼續...")
         measure_startup_time(runs=5)
     else:
         print("\n已取消")
@@ -14,11 +14,11 @@ from pathlib import Path
 t1 = time.time()
 print(f"1️⃣  基礎模組: {(t1-t0)*1000:.0f} ms")
 
-# 第二階段: 匯入 config (包含 Matplotlib 快取設定)
+# 第二階段: 匯入 config
 t0 = time.time()
 import config
 t1 = time.time()
-print(f"2️⃣  Config (含 MPL 快取): {(t1-t0)*1000:.0f} ms")
+print(f"2️⃣  Config: {(t1-t0)*1000:.0f} ms")
 
 # 第三階段: 匯入 PyQt6
 t0 = time.time()
@@ -32,22 +32,20 @@ import cv2
 t1 = time.time()
 print(f"4️⃣  OpenCV: {(t1-t0)*1000:.0f} ms")
 
-# 第五階段: 匯入 MediaPipe
+# 第五階段: 匯入手部偵測器（只載入 MediaPipe Hands）
 t0 = time.time()
-try:
-    import mediapipe as mp
-    t1 = time.time()
-    print(f"5️⃣  MediaPipe: {(t1-t0)*1000:.0f} ms")
-except:
+from utils.hand_detector import MEDIAPIPE_AVAILABLE
+t1 = time.time()
+if MEDIAPIPE_AVAILABLE:
+    print(f"5️⃣  MediaPipe Hands: {(t1-t0)*1000:.0f} ms")
+else:
     print("5️⃣  MediaPipe: 未安裝")
 
-# 第六階段: 匯入 Matplotlib (最慢的部分)
-t0 = time.time()
-import matplotlib
-import matplotlib.pyplot as plt
-t1 = time.time()
-print(f"6️⃣  Matplotlib: {(t1-t0)*1000:.0f} ms")
-print(f"   快取目錄: {matplotlib.get_cachedir()}")
+# 第六階段: 確認沒有載入 Matplotlib（偵測器自行繪製關鍵點）
+if "matplotlib" in sys.modules:
+    print("6️⃣  Matplotlib: ⚠️  已被載入")
+else:
+    print("6️⃣  Matplotlib: ✅ 未載入")
 
 # 第七階段: 建立 QApplication
 t0 = time.time()
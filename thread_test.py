@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+執行緒預算測試
+
+以不同的執行緒預算（THREAD_BUDGET）與 CPU 親和性組合執行「擷取 → 偵測 → 繪製 → 顯示轉換」，
+每個組合在獨立的子進程中執行（BLAS / OpenMP 上限必須在匯入 numpy 之前設定，
+MediaPipe 的圖形執行緒在建立偵測器時決定核心），量測：
+    吞吐量與 p50 / p95 延遲
+    每影格 CPU 時間
+    執行緒數
+    每影格非自願切換次數（執行緒搶不到核心被迫讓出，超額訂閱的指標）
+
+親和性組合：
+    none   不綁定
+    split  ui / capture 使用第一個核心，detection 使用其餘核心（至少 2 個核心）
+
+範例：
+    python thread_test.py
+    python thread_test.py --source recordings/hands.mp4 --budgets 0 1 2 4 --frames 300
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from utils.thread_budget import BLAS_ENV_VARS, available_cpus
+
+
+def run_worker(spec: dict) -> dict:
+    """在子進程中以一組設定處理影格（config 已依 GESTURE_THREAD_BUDGET 設定環境變數）"""
+    import config
+    from utils.thread_budget import pin_current_thread, plan_threads, spawn_affinity, thread_affinities
+
+    plan = plan_threads(spec['budget'], config.OPENCV_NUM_THREADS, spec['affinity'])
+    pin_current_thread(plan.cores("ui"))
+
+    import cv2
+    import psutil
+    from utils.frame_source import open_frame_source
+    from utils.hand_detector import HandDetector
+    from utils.image_convert import frame_to_qimage
+    from utils.perf_stats import summarize_latencies
+
+    if plan.opencv_threads is not None:
+        cv2.setNumThreads(plan.opencv_threads)
+    with spawn_affinity(plan.cores("capture")):
+        source = open_frame_source(spec['source'], spec['width'], spec['height'])
+    with spawn_affinity(plan.cores("detection")):
+        detector = HandDetector(max_num_hands=spec['max_hands'], model_complexity=spec['model_complexity'])
+
+    def process_frame():
+        ret, frame = source.read()
+        if not ret:
+            return
+        detector.detect(frame)
+        detector.draw_landmarks(frame)
+        frame_to_qimage(frame, mirror=True)
+
+    for _ in range(spec['warmup']):
+        process_frame()
+
+    process = psutil.Process()
+    switches_before = process.num_ctx_switches().involuntary
+    cpu_before = time.process_time()
+    latencies_ms = []
+    for _ in range(spec['frames']):
+        start = time.perf_counter()
+        process_frame()
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+    cpu_seconds = time.process_time() - cpu_before
+    switches = process.num_ctx_switches().involuntary - switches_before
+    threads = process.num_threads()
+    affinities = thread_affinities()
+
+    detector.close()
+    source.release()
+
+    summary = summarize_latencies(latencies_ms)
+    return {
+        'budget': spec['budget'],
+        'affinity_mode': spec['affinity_mode'],
+        'plan': plan.describe(),
+        'opencv_threads': cv2.getNumThreads(),
+        'blas_env': {name: os.environ.get(name) for name in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS')},
+        'fps': summary['ops_per_sec'],
+        'p50_ms': summary['p50_ms'],
+        'p95_ms': summary['p95_ms'],
+        'cpu_ms_per_frame': cpu_seconds * 1000 / spec['frames'],
+        'threads': threads,
+        'involuntary_switches_per_frame': switches / spec['frames'],
+        'thread_affinities': {','.join(map(str, cores)): count for cores, count in affinities.items()},
+    }
+
+
+def run_config(spec: dict, timeout: float) -> dict:
+    """以子進程執行一組設定，結果為子進程輸出的最後一行 JSON"""
+    env = dict(os.environ)
+    env.pop("GESTURE_THREAD_BUDGET", None)
+    for name in BLAS_ENV_VARS:
+        env.pop(name, None)  # 由預算決定，不沿用父進程的設定
+    if spec['budget'] is not None:
+        env["GESTURE_THREAD_BUDGET"] = str(spec['budget'])
+    result = subprocess.run(
+        [sys.executable, __file__, "--worker", json.dumps(spec)],
+        capture_output=True, text=True, env=env, timeout=timeout,
+    )
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "子進程失敗")
+    return json.loads(lines[-1])
+
+
+def affinity_modes(cpus):
+    modes = {'none': None}
+    if len(cpus) >= 2:
+        modes['split'] = {'ui': cpus[:1], 'capture': cpus[:1], 'detection': cpus[1:]}
+    return modes
+
+
+def parse_args():
+    import config
+
+    cpus = available_cpus()
+    parser = argparse.ArgumentParser(description="執行緒預算測試")
+    parser.add_argument("--source", default="synthetic", help="影像來源：影片檔、圖片資料夾或 synthetic")
+    parser.add_argument("--budgets", nargs="+", type=int,
+                        default=sorted({0, 1, 2, len(cpus)}), help="執行緒預算，0 表示不限制")
+    parser.add_argument("--affinity", nargs="+", choices=["none", "split"], default=["none", "split"])
+    parser.add_argument("--frames", type=int, default=150, help="每組設定量測的影格數")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--model-complexity", type=int, default=config.MEDIAPIPE_MODEL_COMPLEXITY)
+    parser.add_argument("--max-hands", type=int, default=config.MEDIAPIPE_MAX_HANDS)
+    parser.add_argument("--width", type=int, default=config.CAMERA_WIDTH)
+    parser.add_argument("--height", type=int, default=config.CAMERA_HEIGHT)
+    parser.add_argument("--timeout", type=float, default=300, help="每組設定的最長秒數")
+    parser.add_argument("--output", help="結果 JSON 路徑")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.worker:
+        print(json.dumps(run_worker(json.loads(args.worker)), ensure_ascii=False))
+        return 0
+
+    cpus = available_cpus()
+    modes = affinity_modes(cpus)
+    print("\n" + "🧵 執行緒預算測試".center(60, "="))
+    print(f"來源: {args.source} | 可用核心: {list(cpus)} | 每組 {args.frames} 影格")
+    if "split" in args.affinity and "split" not in modes:
+        print("ℹ️  只有 1 個可用核心（或平台不支援親和性），略過 split")
+
+    print(f"\n{'預算':>4} {'親和性':>6} {'FPS':>7} {'p50':>7} {'p95':>7} {'CPU ms':>7} {'緒':>4} {'切換/影格':>9}")
+    # 超過可用核心數的預算與核心數相同，只執行一次
+    budgets = list(dict.fromkeys(min(budget, len(cpus)) for budget in args.budgets))
+    results = []
+    for budget in budgets:
+        for mode in args.affinity:
+            if mode not in modes:
+                continue
+            spec = {
+                'budget': budget or None,
+                'affinity_mode': mode,
+                'affinity': modes[mode],
+                'source': args.source,
+                'frames': args.frames,
+                'warmup': args.warmup,
+                'model_complexity': args.model_complexity,
+                'max_hands': args.max_hands,
+                'width': args.width,
+                'height': args.height,
+            }
+            try:
+                result = run_config(spec, args.timeout)
+            except (RuntimeError, subprocess.TimeoutExpired) as e:
+                print(f"{budget or '不限':>4} {mode:>6} ❌ {e}")
+                continue
+            results.append(result)
+            print(f"{budget or '不限':>4} {mode:>6} {result['fps']:7.1f} {result['p50_ms']:7.2f} "
+                  f"{result['p95_ms']:7.2f} {result['cpu_ms_per_frame']:7.2f} {result['threads']:>4} "
+                  f"{result['involuntary_switches_per_frame']:9.2f}")
+
+    if not results:
+        return 1
+    best = min(results, key=lambda r: (r['p95_ms'], -r['fps']))
+    print(f"\n🏆 p95 最低: 預算 {best['budget'] or '不限'}、{best['affinity_mode']}"
+          f"（{best['fps']:.1f} FPS，p95 {best['p95_ms']:.1f} ms，{best['threads']} 個執行緒）")
+    print(f"   {best['plan']}")
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'parameters': {k: v for k, v in vars(args).items() if k != 'worker'},
+        'cpus': list(cpus),
+        'results': results,
+        'best': best,
+    }
+    output = Path(args.output) if args.output else Path(
+        f"performance_logs/thread_budget_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"💾 結果已儲存: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+活動分級控制：長時間沒有手部時降低擷取與偵測頻率
+
+分級（依序，after_s 為「最後一次看到手或畫面變動」之後的秒數）：
+    active      全速：每個計時器週期擷取並偵測
+    idle        降低計時器頻率，每 detect_every 個影格偵測一次
+    deep_idle   更低的頻率與偵測次數
+
+看到手部或動態閘門偵測到畫面變動時立即回到 active，
+下一個計時器週期就恢復全速（一到兩個影格內）。
+每個分級累計停留的時間可由 durations() 取得。
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Sequence
+
+
+@dataclass(frozen=True)
+class ActivityTier:
+    """一個活動分級"""
+    name: str
+    after_s: float       # 沒有活動多少秒後進入
+    interval_ms: int     # 計時器間隔
+    detect_every: int    # 沒有畫面變動時每幾個影格偵測一次
+
+
+class ActivityController:
+    """依最後一次活動的時間切換分級"""
+
+    def __init__(self, tiers: Sequence[ActivityTier], clock: Callable[[], float] = time.monotonic):
+        """建立控制器
+
+        Args:
+            tiers: 分級列表，依 after_s 由小到大，第一個為全速（after_s = 0）
+            clock: 時間來源（秒）
+        """
+        self.tiers = tuple(sorted(tiers, key=lambda tier: tier.after_s))
+        self.clock = clock
+        self.totals: Dict[str, float] = {}
+        self.transitions = 0
+        self.reset()
+
+    def reset(self):
+        """回到全速並清除統計（開始偵測時呼叫）"""
+        now = self.clock()
+        self.tier = self.tiers[0]
+        self.tier_since = now
+        self.last_activity = now
+        self.frames_in_tier = 0
+        self.totals = {tier.name: 0.0 for tier in self.tiers}
+        self.transitions = 0
+
+    @property
+    def active(self) -> bool:
+        return self.tier is self.tiers[0]
+
+    def detect_due(self) -> bool:
+        """目前分級下本影格是否輪到偵測（沒有手部、也沒有畫面變動時使用）"""
+        self.frames_in_tier += 1
+        return self.frames_in_tier % self.tier.detect_every == 0
+
+    def update(self, hand_present: bool, motion: bool) -> Optional[ActivityTier]:
+        """每個影格結束時呼叫
+
+        Args:
+            hand_present: 最近一次偵測是否有手部
+            motion: 本影格是否有畫面變動
+
+        Returns:
+            分級改變時回傳新的分級，否則 None
+        """
+        now = self.clock()
+        if hand_present or motion:
+            self.last_activity = now
+        quiet = now - self.last_activity
+        target = self.tiers[0]
+        for tier in self.tiers:
+            if quiet >= tier.after_s:
+                target = tier
+        if target is self.tier:
+            return None
+
+        self.totals[self.tier.name] += now - self.tier_since
+        self.tier = target
+        self.tier_since = now
+        self.frames_in_tier = 0
+        self.transitions += 1
+        return target
+
+    def durations(self) -> Dict[str, float]:
+        """每個分級累計停留的秒數（含目前分級到現在為止的時間）"""
+        durations = dict(self.totals)
+        durations[self.tier.name] += self.clock() - self.tier_since
+        return durations
+
+    def summary(self) -> str:
+        durations = self.durations()
+        total = sum(durations.values()) or 1.0
+        parts = [f"{name} {seconds:.1f} 秒（{seconds / total:.0%}）" for name, seconds in durations.items()]
+        return f"目前 {self.tier.name}，切換 {self.transitions} 次 | " + "，".join(parts)
@@ -0,0 +1,185 @@
+"""
+背景攝影機列舉與熱插拔監看
+
+在 QThread 中執行 camera_enum.discover_cameras，每找到一支攝影機就發出訊號，
+主視窗不必等待硬體探測就能顯示，下拉選單隨結果逐步更新。
+CameraHotplugWatcher 在攝影機插拔時重新讀取 sysfs 更新列表，不需重新啟動。
+"""
+
+import ctypes
+import os
+import struct
+from typing import List, Optional
+
+from PyQt6.QtCore import QObject, QSocketNotifier, QThread, QTimer, pyqtSignal
+
+from utils.camera_enum import (
+    CameraCache, CameraDevice, DEV_ROOT, IS_LINUX, SYSFS_ROOT,
+    discover_cameras, enumerate_linux
+)
+
+
+class CameraDiscoveryThread(QThread):
+    """背景列舉攝影機
+
+    Signals:
+        device_found(CameraDevice): 每找到一支攝影機
+        discovery_finished(list): 列舉完成，參數為最終排序的攝影機列表
+    """
+
+    device_found = pyqtSignal(object)
+    discovery_finished = pyqtSignal(list)
+
+    def __init__(self, cache: CameraCache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+
+    def run(self):
+        devices: List[CameraDevice] = []
+        try:
+            for device in discover_cameras(self.cache):
+                devices.append(device)
+                self.device_found.emit(device)
+            devices = self.cache.last_devices()
+        except Exception as e:
+            print(f"⚠️  攝影機列舉失敗: {e}")
+        self.discovery_finished.emit(devices)
+
+
+class CameraHotplugWatcher(QObject):
+    """攝影機熱插拔監看（Linux）
+
+    優先以 inotify 監看 /dev 中 video* 節點的建立與刪除，
+    無法使用 inotify 時改為定期比對 sysfs 節點名稱。
+    偵測到變化後重新讀取 sysfs（不開啟裝置）並發出 devices_changed。
+
+    Signals:
+        devices_changed(list, list, list): (目前所有攝影機, 新增的, 移除的)
+    """
+
+    devices_changed = pyqtSignal(list, list, list)
+
+    # udev 建立節點後還會設定權限與 by-id 連結，稍等再列舉
+    SETTLE_MS = 500
+
+    def __init__(self, cache: CameraCache, poll_interval_ms: int = 2000, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.poll_interval_ms = poll_interval_ms
+        self.known = {device.identity: device for device in cache.last_devices()}
+        self.inotify_fd = None
+        self.notifier = None
+        self._poll_nodes = None
+
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.timeout.connect(self.rescan)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self._poll)
+
+    @property
+    def mode(self) -> str:
+        if self.notifier:
+            return "inotify"
+        return "polling" if self.poll_timer.isActive() else "stopped"
+
+    def start(self) -> bool:
+        """開始監看，非 Linux 平台回傳 False"""
+        if not IS_LINUX:
+            return False
+        self.inotify_fd = _inotify_open(str(DEV_ROOT))
+        if self.inotify_fd is not None:
+            self.notifier = QSocketNotifier(self.inotify_fd, QSocketNotifier.Type.Read, self)
+            self.notifier.activated.connect(self._on_inotify)
+        else:
+            self._poll_nodes = _video_nodes()
+            self.poll_timer.start(self.poll_interval_ms)
+        return True
+
+    def stop(self):
+        self.poll_timer.stop()
+        self.settle_timer.stop()
+        if self.notifier:
+            self.notifier.setEnabled(False)
+            self.notifier = None
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+
+    def set_known(self, devices: List[CameraDevice]):
+        """以目前選單中的攝影機作為比對基準（背景列舉完成時呼叫）"""
+        self.known = {device.identity: device for device in devices}
+
+    def _on_inotify(self):
+        if any(name.startswith("video") for name in _inotify_read(self.inotify_fd)):
+            self.settle_timer.start(self.SETTLE_MS)
+
+    def _poll(self):
+        nodes = _video_nodes()
+        if nodes != self._poll_nodes:
+            self._poll_nodes = nodes
+            self.settle_timer.start(self.SETTLE_MS)
+
+    def rescan(self):
+        """重新讀取 sysfs，與已知的攝影機比對"""
+        devices = self.cache.apply(enumerate_linux())
+        current = {device.identity: device for device in devices}
+        added = [device for key, device in current.items() if key not in self.known]
+        removed = [device for key, device in self.known.items() if key not in current]
+        if not added and not removed:
+            return
+        self.known = current
+        self.cache.set_last(devices)
+        self.devices_changed.emit(devices, added, removed)
+
+
+# inotify 常數（linux/inotify.h）
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _inotify_open(path: str) -> Optional[int]:
+    """建立 inotify 並監看指定目錄，失敗時回傳 None"""
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO
+        if libc.inotify_add_watch(fd, path.encode(), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+def _inotify_read(fd: int) -> List[str]:
+    """讀出所有待處理的事件，回傳檔名列表"""
+    names = []
+    while True:
+        try:
+            data = os.read(fd, 4096)
+        except BlockingIOError:
+            break
+        if not data:
+            break
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            names.append(data[offset:offset + length].rstrip(b"\0").decode(errors="replace"))
+            offset += length
+    return names
+
+
+def _video_nodes() -> frozenset:
+    try:
+        return frozenset(name for name in os.listdir(SYSFS_ROOT) if name.startswith("video"))
+    except OSError:
+        return frozenset()
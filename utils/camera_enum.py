@@ -0,0 +1,306 @@
+"""
+攝影機列舉模組
+
+Linux 直接讀取 /sys/class/video4linux 與 /dev/v4l/by-id，不開啟任何裝置，
+以毫秒等級列出攝影機。解析度等能力資訊以裝置識別碼為鍵快取在磁碟上，
+只有在實際開啟攝影機後才會更新，啟動時完全不需要探測硬體。
+其他平台以 OpenCV 逐一探測，結果依攝影機名稱快取。
+"""
+
+import json
+import os
+import platform
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+IS_LINUX = platform.system() == "Linux"
+IS_MACOS = platform.system() == "Darwin"
+
+SYSFS_ROOT = Path("/sys/class/video4linux")
+DEV_ROOT = Path("/dev")
+
+CACHE_VERSION = 1
+
+
+@dataclass
+class CameraDevice:
+    """一個可擷取影像的攝影機"""
+    index: int                      # cv2.VideoCapture 使用的編號（/dev/videoN 的 N）
+    name: str
+    identity: str                   # 穩定識別碼（by-id 路徑優先）
+    path: str = ""                  # /dev/videoN
+    width: Optional[int] = None     # 快取的解析度，未知為 None
+    height: Optional[int] = None
+
+    def label(self) -> str:
+        """下拉選單顯示文字，格式 "編號: 名稱 (寬x高)" """
+        if self.width and self.height:
+            return f"{self.index}: {self.name} ({self.width}x{self.height})"
+        return f"{self.index}: {self.name}"
+
+
+def _read_text(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding="utf-8", errors="replace").strip()
+    except OSError:
+        return None
+
+
+def _stable_links(dev_root: Path) -> Dict[str, str]:
+    """建立 videoN → 穩定路徑（by-id 優先，其次 by-path）的對照"""
+    links: Dict[str, str] = {}
+    for kind in ("by-path", "by-id"):  # by-id 後處理以覆蓋 by-path
+        directory = dev_root / "v4l" / kind
+        if not directory.is_dir():
+            continue
+        for link in directory.iterdir():
+            try:
+                target = os.path.basename(os.path.realpath(link))
+            except OSError:
+                continue
+            if target.startswith("video"):
+                links[target] = f"{kind}/{link.name}"
+    return links
+
+
+def enumerate_linux(sys_root: Path = SYSFS_ROOT, dev_root: Path = DEV_ROOT) -> List[CameraDevice]:
+    """從 sysfs 列出攝影機，不開啟裝置
+
+    同一支 UVC 攝影機常有多個節點（影像與 metadata），
+    只保留 sysfs index 為 0 的主要擷取節點。
+    """
+    if not sys_root.is_dir():
+        return []
+
+    links = _stable_links(dev_root)
+    devices = []
+    for node in sys_root.iterdir():
+        if not node.name.startswith("video"):
+            continue
+        number = node.name[len("video"):]
+        if not number.isdigit():
+            continue
+        node_index = _read_text(node / "index")
+        if node_index not in (None, "0"):
+            continue
+
+        name = _read_text(node / "name") or f"攝影機 {number}"
+        identity = links.get(node.name)
+        if not identity:
+            # 沒有 udev 連結時，以名稱加上實體匯流排位置識別
+            try:
+                bus = os.path.basename(os.path.realpath(node / "device"))
+            except OSError:
+                bus = node.name
+            identity = f"{name}@{bus}"
+
+        devices.append(CameraDevice(
+            index=int(number),
+            name=name,
+            identity=identity,
+            path=str(dev_root / node.name),
+        ))
+    return sorted(devices, key=lambda device: device.index)
+
+
+def camera_names_macos() -> List[str]:
+    """獲取 macOS 攝影機名稱列表（system_profiler）"""
+    if not IS_MACOS:
+        return []
+
+    try:
+        # 使用 system_profiler 獲取攝影機資訊
+        result = subprocess.run(
+            ["system_profiler", "SPCameraDataType"],
+            capture_output=True,
+            text=True,
+            timeout=3
+        )
+
+        # 解析輸出，尋找攝影機名稱
+        camera_names = []
+        for line in result.stdout.split('\n'):
+            stripped = line.strip()
+
+            # 攝影機名稱格式: "    FaceTime HD相機:" 或 "    Akai's iphone相機:"
+            # 特徵: 有縮排、包含"相機"或"Camera"、結尾是冒號
+            if (("相機:" in stripped or "Camera:" in stripped) and
+                    stripped.endswith(":") and
+                    not stripped.startswith("Camera:")):  # 排除 "Camera:" 標題
+                camera_names.append(stripped.rstrip(":"))
+
+        # 如果解析失敗,嘗試簡單方法
+        if not camera_names:
+            # 查找包含 "Model ID" 的行來推斷有多少攝影機
+            model_count = result.stdout.count("Model ID:")
+            camera_names = [f"攝影機 {i}" for i in range(model_count)]
+
+        return camera_names
+
+    except Exception as e:
+        print(f"⚠️  無法獲取攝影機名稱: {e}")
+        return []
+
+
+def probe_opencv(camera_names: List[str], max_index: int = 10) -> Iterator[CameraDevice]:
+    """以 OpenCV 逐一開啟編號 0..max_index-1 探測，每找到一支就產出
+
+    產出順序是探測順序；macOS 的名稱配對（FaceTime HD 排在索引 0）
+    需要全部探測完才能決定，請以 order_probed() 整理最終列表。
+    """
+    import cv2
+
+    # system_profiler 輸出順序: [FaceTime HD, iPhone]
+    # OpenCV 實際順序: 0=iPhone, 1=FaceTime HD
+    # 需要反轉才能正確配對
+    names = camera_names[::-1] if len(camera_names) > 1 else list(camera_names)
+    found = 0
+    for i in range(max_index):
+        cap = cv2.VideoCapture(i)
+        if cap.isOpened():
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            cap.release()
+            name = names[found] if found < len(names) else f"攝影機 {i}"
+            found += 1
+            yield CameraDevice(index=i, name=name, identity=f"{name}#{i}",
+                               width=width, height=height)
+
+
+def order_probed(devices: List[CameraDevice]) -> List[CameraDevice]:
+    """整理 OpenCV 探測結果
+
+    如果有兩個攝影機，交換它們的順序，讓 FaceTime HD 變成第一個
+    （名稱在探測時已依 OpenCV 編號配對好）。
+    """
+    devices = list(devices)
+    if len(devices) >= 2:
+        devices[0], devices[1] = devices[1], devices[0]
+    return devices
+
+
+def discover_cameras(cache: "CameraCache") -> Iterator[CameraDevice]:
+    """依平台逐一產出攝影機（已套用快取的解析度）
+
+    最終順序請以 cache.last_devices() 取得（探測完成後寫入）。
+    """
+    if IS_LINUX:
+        devices = cache.apply(enumerate_linux())
+        yield from devices
+        cache.set_last(devices)
+        return
+
+    names = camera_names_macos()
+    cache_key = "|".join(names)
+    if names:
+        # 攝影機名稱沒變時沿用上次的探測結果
+        cached = cache.get_probe(cache_key)
+        if cached is not None:
+            devices = [CameraDevice(**camera) for camera in cached]
+            yield from devices
+            cache.set_last(devices)
+            return
+
+    devices = []
+    for device in probe_opencv(names):
+        devices.append(device)
+        yield device
+    devices = order_probed(devices)
+    if names:
+        cache.set_probe(cache_key, devices)
+    cache.set_last(devices)
+
+
+class CameraCache:
+    """攝影機能力快取（JSON 檔）
+
+    devices: {識別碼: {name, width, height, last_seen, mode}}
+             mode 為協商出的擷取模式（見 utils/camera_negotiation.py）
+    probe:   非 Linux 平台以 OpenCV 探測的結果 {key, cameras}
+    last:    上次列舉到的攝影機，啟動時先顯示，背景列舉完成後更新
+    """
+
+    def __init__(self, path):
+        self.path = Path(path).expanduser()
+        # 背景列舉執行緒與主執行緒都會寫入
+        self.lock = threading.RLock()
+        self.data = {'version': CACHE_VERSION, 'devices': {}, 'probe': {}}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                loaded = json.load(f)
+            if loaded.get('version') == CACHE_VERSION:
+                self.data = loaded
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def devices(self) -> Dict[str, dict]:
+        return self.data.setdefault('devices', {})
+
+    def apply(self, devices: List[CameraDevice]) -> List[CameraDevice]:
+        """以快取補上裝置的解析度"""
+        for device in devices:
+            cached = self.devices.get(device.identity)
+            if cached:
+                device.width = cached.get('width')
+                device.height = cached.get('height')
+        return devices
+
+    def remember(self, device: CameraDevice, width: int, height: int):
+        """實際開啟攝影機後記錄解析度"""
+        with self.lock:
+            entry = self.devices.setdefault(device.identity, {})
+            entry.update({
+                'name': device.name,
+                'width': width,
+                'height': height,
+                'last_seen': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            })
+            self.save()
+
+    def get_mode(self, identity: str) -> Optional[dict]:
+        return (self.devices.get(identity) or {}).get('mode')
+
+    def set_mode(self, device: CameraDevice, mode: dict):
+        """記錄協商成功的擷取模式"""
+        with self.lock:
+            entry = self.devices.setdefault(device.identity, {'name': device.name})
+            entry['mode'] = mode
+            self.save()
+
+    def get_probe(self, key: str) -> Optional[List[dict]]:
+        probe = self.data.get('probe') or {}
+        if probe.get('key') == key:
+            return probe.get('cameras')
+        return None
+
+    def set_probe(self, key: str, devices: List[CameraDevice]):
+        with self.lock:
+            self.data['probe'] = {'key': key, 'cameras': [asdict(d) for d in devices]}
+            self.save()
+
+    def last_devices(self) -> List[CameraDevice]:
+        return [CameraDevice(**camera) for camera in self.data.get('last') or []]
+
+    def set_last(self, devices: List[CameraDevice]):
+        with self.lock:
+            self.data['last'] = [asdict(d) for d in devices]
+            self.save()
+
+    def save(self):
+        with self.lock:
+            self._save()
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"⚠️  無法寫入攝影機快取: {e}")
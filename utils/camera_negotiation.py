@@ -0,0 +1,173 @@
+"""
+攝影機擷取模式協商模組
+
+只設定寬高時，許多 UVC 攝影機會退回未壓縮的 YUYV 並降低幀率，
+驅動程式也會預設排隊數個舊影格。這裡依序嘗試 MJPG / YUYV，
+套用解析度、幀率與最小緩衝區，再實際讀取影格確認裝置給了什麼，
+量測達成的擷取 FPS 與延遲，最佳模式依裝置識別碼快取。
+"""
+
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional, Sequence
+
+import cv2
+
+from utils.perf_stats import percentile
+
+# 快取的模式只需確認仍可用，讀取較少影格
+VERIFY_FRAMES = 5
+WARMUP_FRAMES = 3
+# 達成目標幀率的這個比例即視為成功，不再嘗試下一個格式
+FPS_TOLERANCE = 0.9
+
+
+@dataclass
+class CaptureMode:
+    """一次協商的結果"""
+    fourcc: str                     # 實際的像素格式（例如 "MJPG"）
+    width: int
+    height: int
+    fps: float                      # 驅動程式回報的幀率
+    buffer_size: Optional[int]      # 不支援查詢時為 None
+    measured_fps: float = 0.0       # 實際量測的擷取幀率
+    read_ms: float = 0.0            # read() 平均阻塞時間
+    frame_age_ms: Optional[float] = None  # 影格時間戳到取得的延遲（僅 V4L2 支援）
+    requested: str = ""             # 要求的像素格式
+
+    def ok(self, target_fps: float) -> bool:
+        return self.measured_fps >= target_fps * FPS_TOLERANCE
+
+    def describe(self) -> str:
+        text = (f"{self.fourcc} {self.width}x{self.height} @ {self.measured_fps:.1f} FPS"
+                f"（驅動回報 {self.fps:.0f}），read {self.read_ms:.1f} ms")
+        if self.frame_age_ms is not None:
+            text += f"，影格延遲 {self.frame_age_ms:.1f} ms"
+        return text
+
+
+def decode_fourcc(value: float) -> str:
+    """將 CAP_PROP_FOURCC 的數值轉為四字元字串"""
+    code = int(value)
+    if code <= 0:
+        return ""
+    return "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)).strip("\x00 ")
+
+
+def apply_mode(capture, fourcc: str, width: int, height: int, fps: float, buffer_size: int = 1):
+    """套用擷取參數
+
+    FOURCC 必須在解析度之前設定，V4L2 才會以該格式重新挑選解析度與幀率。
+    """
+    if fourcc:
+        capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    capture.set(cv2.CAP_PROP_FPS, fps)
+    capture.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+
+def measure(capture, frames: int, warmup: int = WARMUP_FRAMES) -> Optional[dict]:
+    """讀取影格量測擷取幀率與延遲，讀取失敗回傳 None
+
+    V4L2 後端的 CAP_PROP_POS_MSEC 是驅動程式的 CLOCK_MONOTONIC 時間戳，
+    與 time.monotonic() 相減即為影格在緩衝區中等待的時間；
+    其他後端的數值不是絕對時間，超出合理範圍時略過。
+    """
+    for _ in range(warmup):
+        if not capture.read()[0]:
+            return None
+
+    read_ms, ages = [], []
+    start = time.perf_counter()
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        ret, frame = capture.read()
+        read_ms.append((time.perf_counter() - t0) * 1000)
+        if not ret or frame is None:
+            return None
+        age = time.monotonic() * 1000 - capture.get(cv2.CAP_PROP_POS_MSEC)
+        if 0 <= age < 1000:
+            ages.append(age)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'measured_fps': frames / elapsed if elapsed > 0 else 0.0,
+        'read_ms': sum(read_ms) / len(read_ms),
+        'frame_age_ms': percentile(sorted(ages), 50) if len(ages) == frames else None,
+        'shape': frame.shape,
+    }
+
+
+def _try_mode(capture, fourcc: str, width: int, height: int, fps: float,
+              buffer_size: int, frames: int) -> Optional[CaptureMode]:
+    apply_mode(capture, fourcc, width, height, fps, buffer_size)
+    result = measure(capture, frames)
+    if result is None:
+        return None
+
+    actual_buffer = capture.get(cv2.CAP_PROP_BUFFERSIZE)
+    frame_height, frame_width = result['shape'][:2]
+    return CaptureMode(
+        fourcc=decode_fourcc(capture.get(cv2.CAP_PROP_FOURCC)) or fourcc,
+        width=frame_width,
+        height=frame_height,
+        fps=capture.get(cv2.CAP_PROP_FPS),
+        buffer_size=int(actual_buffer) if actual_buffer > 0 else None,
+        measured_fps=result['measured_fps'],
+        read_ms=result['read_ms'],
+        frame_age_ms=result['frame_age_ms'],
+        requested=fourcc,
+    )
+
+
+def negotiate(capture, width: int, height: int, fps: float,
+              fourccs: Sequence[str] = ("MJPG", "YUYV"),
+              cached: Optional[dict] = None,
+              buffer_size: int = 1,
+              frames: int = 15) -> Optional[CaptureMode]:
+    """協商擷取模式
+
+    有快取時先套用快取的格式並以少量影格確認；達成目標幀率就直接使用。
+    否則依序嘗試 fourccs，第一個達成目標幀率的模式勝出，
+    都達不到時使用量測幀率最高的模式。
+
+    Args:
+        capture: 已開啟的 cv2.VideoCapture
+        width, height, fps: 要求的解析度與幀率
+        fourccs: 依偏好排序的像素格式
+        cached: 上次協商的結果（CaptureMode 的 dict）
+        buffer_size: 驅動程式緩衝區影格數
+        frames: 每個格式量測的影格數
+
+    Returns:
+        採用的模式；所有格式都無法讀取影格時回傳 None
+    """
+    if cached and cached.get('requested'):
+        mode = _try_mode(capture, cached['requested'], width, height, fps,
+                         buffer_size, VERIFY_FRAMES)
+        if mode and mode.ok(fps):
+            return mode
+
+    best = None
+    current = None
+    for fourcc in fourccs:
+        current = fourcc
+        mode = _try_mode(capture, fourcc, width, height, fps, buffer_size, frames)
+        if mode is None:
+            continue
+        if mode.ok(fps):
+            return mode
+        if best is None or mode.measured_fps > best.measured_fps:
+            best = mode
+
+    if best and best.requested != current:
+        # 最後套用的不是最佳格式，切回最佳格式
+        apply_mode(capture, best.requested, width, height, fps, buffer_size)
+    return best
+
+
+def mode_to_cache(mode: CaptureMode) -> dict:
+    entry = asdict(mode)
+    entry['negotiated_at'] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    return entry
@@ -0,0 +1,118 @@
+"""
+本機控制通道
+
+在執行中的 main.py 開啟一個 Unix domain socket（Qt QLocalServer），
+接受單行文字命令，例如 "profile 30"、"tracemalloc stop"。
+命令在 Qt 主執行緒中處理，閒置時只是事件迴圈中的一個監聽 socket。
+
+用戶端請使用 control.py：
+    python control.py profile 30
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from PyQt6.QtCore import QObject
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+
+SOCKET_PREFIX = "gesture-demo-"
+
+
+def control_socket_path(pid: int = None) -> Path:
+    """取得指定進程的控制 socket 路徑
+
+    Args:
+        pid: 進程 ID，None 表示目前進程
+    """
+    if pid is None:
+        pid = os.getpid()
+    return Path(tempfile.gettempdir()) / f"{SOCKET_PREFIX}{pid}.sock"
+
+
+class ControlServer(QObject):
+    """本機控制伺服器
+
+    以 register() 註冊命令，處理函式接收字串參數並回傳回應文字。
+    """
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self.path = control_socket_path()
+        self.commands: Dict[str, Tuple[Callable[..., str], str]] = {}
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+        self.register("help", self._help, "列出所有命令")
+
+    def register(self, name: str, handler: Callable[..., str], description: str = ""):
+        """註冊命令
+
+        Args:
+            name: 命令名稱
+            handler: 處理函式，參數為命令後面的字串
+            description: 說明文字
+        """
+        self.commands[name] = (handler, description)
+
+    def start(self) -> bool:
+        """開始監聽
+
+        Returns:
+            是否成功
+        """
+        QLocalServer.removeServer(str(self.path))
+        if not self.server.listen(str(self.path)):
+            print(f"⚠️  控制通道啟動失敗: {self.server.errorString()}")
+            return False
+        print(f"🎛️  控制通道: {self.path}")
+        return True
+
+    def close(self):
+        """停止監聽並移除 socket 檔案"""
+        if self.server.isListening():
+            self.server.close()
+            QLocalServer.removeServer(str(self.path))
+
+    def execute(self, line: str) -> str:
+        """執行一行命令並回傳回應"""
+        parts = line.strip().split()
+        if not parts:
+            return "空白命令"
+
+        name, args = parts[0], parts[1:]
+        if name not in self.commands:
+            return f"未知命令: {name}（輸入 help 查看可用命令）"
+
+        handler, _ = self.commands[name]
+        try:
+            return handler(*args)
+        except Exception as e:
+            return f"命令執行失敗: {e}"
+
+    def _help(self) -> str:
+        return "\n".join(
+            f"{name:<14} {description}"
+            for name, (_, description) in sorted(self.commands.items())
+        )
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            connection.readyRead.connect(
+                lambda conn=connection: self._on_ready_read(conn)
+            )
+            connection.disconnected.connect(connection.deleteLater)
+            # 連線建立前資料可能已送達，readyRead 不會再觸發
+            if connection.canReadLine():
+                self._on_ready_read(connection)
+
+    def _on_ready_read(self, connection: QLocalSocket):
+        if not connection.canReadLine():
+            return
+        line = bytes(connection.readLine()).decode("utf-8", errors="replace")
+        response = self.execute(line)
+        connection.write((response + "\n").encode("utf-8"))
+        connection.flush()
+        connection.disconnectFromServer()
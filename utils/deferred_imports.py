@@ -0,0 +1,43 @@
+"""
+背景模組載入
+
+MediaPipe（連同 solutions 與 Matplotlib）首次匯入需要數秒，OpenCV 也要上百毫秒。
+主視窗只依賴 PyQt6 建立並顯示，這些重量級模組在背景執行緒匯入，
+完成後再由主執行緒從 sys.modules 取用（此時匯入已不需要任何時間）。
+"""
+
+import importlib
+import time
+from typing import Sequence
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class ModuleLoaderThread(QThread):
+    """依序匯入模組的背景執行緒
+
+    Signals:
+        module_loaded(str, float): 模組名稱、匯入耗時（毫秒）
+        loading_finished(float): 全部匯入完成，總耗時（毫秒）
+        loading_failed(str, str): 模組名稱、錯誤訊息
+    """
+
+    module_loaded = pyqtSignal(str, float)
+    loading_finished = pyqtSignal(float)
+    loading_failed = pyqtSignal(str, str)
+
+    def __init__(self, modules: Sequence[str], parent=None):
+        super().__init__(parent)
+        self.modules = list(modules)
+
+    def run(self):
+        start = time.perf_counter()
+        for name in self.modules:
+            t0 = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                self.loading_failed.emit(name, str(e))
+                return
+            self.module_loaded.emit(name, (time.perf_counter() - t0) * 1000)
+        self.loading_finished.emit((time.perf_counter() - start) * 1000)
@@ -0,0 +1,45 @@
+"""
+背景建立手部偵測器
+
+MediaPipe 建立計算圖與載入模型需要數十到數百毫秒，在計時器中同步建立會讓畫面停頓，
+延遲也會被自適應品質當成新等級的影格延遲。偵測中需要新的偵測器時（例如品質等級改變），
+在背景執行緒建立，完成後由主執行緒換上；建立期間繼續使用原本的偵測器。
+"""
+
+import time
+from typing import Callable
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class DetectorBuildThread(QThread):
+    """以 factory(options) 建立一個偵測器的背景執行緒
+
+    Signals:
+        detector_built(object, float): 偵測器、建立耗時（毫秒）
+        build_failed(str): 錯誤訊息
+    """
+
+    detector_built = pyqtSignal(object, float)
+    build_failed = pyqtSignal(str)
+
+    def __init__(self, factory: Callable[[dict], object], options: dict, key: str, parent=None):
+        """
+        Args:
+            factory: 建立偵測器的函式，參數為偵測器設定
+            options: 偵測器設定
+            key: 設定的識別字串，完成時由呼叫端比對是否仍需要這個偵測器
+        """
+        super().__init__(parent)
+        self.factory = factory
+        self.options = dict(options)
+        self.key = key
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            detector = self.factory(self.options)
+        except Exception as e:
+            self.build_failed.emit(str(e))
+            return
+        self.detector_built.emit(detector, (time.perf_counter() - start) * 1000)
@@ -0,0 +1,136 @@
+"""
+影格緩衝池：重複使用影像緩衝區，避免每個影格配置新的影像
+
+每個影格的擷取、翻轉、縮放與轉換顯示格式都需要一整張影像，
+以 numpy / OpenCV 預設行為每次都會配置新陣列（640x480 @ 30 FPS 每秒上百 MB）。
+緩衝池依 (形狀, dtype) 保存用完的緩衝區，下次取用相同規格時直接重用：
+    擷取  capture.read(image=緩衝區)（cv2.VideoCapture 與 FrameSource 皆支援）
+    處理  cv2.flip / cv2.resize / cv2.cvtColor 的 dst= 參數
+
+緩衝區以參考計數管理：acquire() 取得時為 1，需要交給其他持有者時 retain()，
+每個持有者用完各自 release()，計數歸零才回到池中，避免還在使用的影像被下一個影格覆寫。
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class FrameBuffer:
+    """池中的一個影像緩衝區"""
+
+    __slots__ = ("pool", "array", "refs")
+
+    def __init__(self, pool: "FramePool", array: np.ndarray):
+        self.pool = pool
+        self.array = array
+        self.refs = 1
+
+    def retain(self) -> "FrameBuffer":
+        """增加一個持有者"""
+        if self.refs <= 0:
+            raise RuntimeError("緩衝區已歸還，無法再持有")
+        self.refs += 1
+        return self
+
+    def release(self):
+        """持有者用完；最後一個持有者歸還時回到池中"""
+        if self.refs <= 0:
+            raise RuntimeError("緩衝區重複歸還")
+        self.refs -= 1
+        if self.refs == 0:
+            self.pool._recycle(self)
+
+    def __enter__(self) -> np.ndarray:
+        return self.array
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class FramePool:
+    """依形狀與 dtype 重用影像緩衝區"""
+
+    def __init__(self, max_free_per_shape: int = 4):
+        """
+        Args:
+            max_free_per_shape: 每種規格最多保留幾個閒置緩衝區，多的直接釋放
+        """
+        self.max_free_per_shape = max_free_per_shape
+        self._free: Dict[Tuple[Tuple[int, ...], str], List[FrameBuffer]] = {}
+        self._capture_shape: Optional[Tuple[int, ...]] = None
+        self.hits = 0
+        self.misses = 0
+        self.in_use = 0
+        self.allocated_bytes = 0  # 池管理的緩衝區總大小（使用中 + 閒置）
+        self.peak_bytes = 0
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> FrameBuffer:
+        """取得一個緩衝區（內容未初始化）"""
+        free = self._free.get(self._key(shape, dtype))
+        if free:
+            buffer = free.pop()
+            buffer.refs = 1
+            self.hits += 1
+        else:
+            buffer = self._adopt(np.empty(shape, dtype=dtype))
+        self.in_use += 1
+        return buffer
+
+    def read(self, capture) -> Tuple[bool, Optional[FrameBuffer]]:
+        """從擷取來源讀取一個影格到池中的緩衝區
+
+        以上一個影格的尺寸取用緩衝區；尺寸改變（或第一個影格）時
+        由來源配置新陣列，之後納入池中重用。
+
+        Returns:
+            (是否成功, 緩衝區)；失敗時不佔用緩衝區
+        """
+        buffer = self.acquire(self._capture_shape) if self._capture_shape else None
+        ret, frame = capture.read(buffer.array if buffer else None)
+        if not ret or frame is None:
+            if buffer:
+                buffer.release()
+            return False, None
+        if buffer is None or frame is not buffer.array:
+            if buffer:
+                buffer.release()
+            buffer = self._adopt(frame)
+            self.in_use += 1
+            self._capture_shape = frame.shape
+        return True, buffer
+
+    def clear(self):
+        """釋放所有閒置緩衝區（解析度改變或停止偵測時呼叫）"""
+        for free in self._free.values():
+            for buffer in free:
+                self.allocated_bytes -= buffer.array.nbytes
+        self._free.clear()
+        self._capture_shape = None
+
+    @staticmethod
+    def _key(shape, dtype) -> Tuple[Tuple[int, ...], str]:
+        return tuple(shape), np.dtype(dtype).str
+
+    def _adopt(self, array: np.ndarray) -> FrameBuffer:
+        self.misses += 1
+        self.allocated_bytes += array.nbytes
+        self.peak_bytes = max(self.peak_bytes, self.allocated_bytes)
+        return FrameBuffer(self, array)
+
+    def _recycle(self, buffer: FrameBuffer):
+        self.in_use -= 1
+        free = self._free.setdefault(self._key(buffer.array.shape, buffer.array.dtype), [])
+        if len(free) < self.max_free_per_shape:
+            free.append(buffer)
+        else:
+            self.allocated_bytes -= buffer.array.nbytes
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (f"命中率 {self.hit_rate:.1%}（取用 {self.hits + self.misses} 次，配置 {self.misses} 個），"
+                f"峰值 {self.peak_bytes / 1024 / 1024:.1f} MB，使用中 {self.in_use} 個")
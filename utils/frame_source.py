@@ -0,0 +1,198 @@
+"""
+影像來源模組
+
+提供與 cv2.VideoCapture 相同介面的影像來源，讓主程式與效能工具
+可以在沒有實體攝影機的情況下，改用錄製影片、圖片資料夾或合成畫面。
+"""
+
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+
+# 圖片資料夾支援的副檔名
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+class FrameSource:
+    """影像來源基類
+
+    介面與 cv2.VideoCapture 相容（read / isOpened / get / set / release），
+    主程式不需區分實體攝影機或檔案來源。
+    read(image) 與 VideoCapture 相同：傳入尺寸相符的陣列時寫入該陣列，否則配置新陣列。
+    """
+
+    def __init__(self, width: int = 640, height: int = 480, fps: float = 30.0):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_index = 0
+        self._opened = True
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """讀取下一幀
+
+        Args:
+            image: 重複使用的輸出陣列（可省略）
+
+        Returns:
+            (是否成功, BGR 影像)
+        """
+        raise NotImplementedError
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.frame_index)
+        return 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        """檔案來源不支援調整參數，與 VideoCapture 一樣回傳 False"""
+        return False
+
+    def release(self):
+        self._opened = False
+
+
+class SyntheticFrameSource(FrameSource):
+    """合成畫面來源
+
+    產生帶有輕微雜訊與移動方塊的畫面，模擬沒有手部的場景。
+    固定亂數種子，確保每次執行的輸入相同。
+    """
+
+    def __init__(self, width: int = 640, height: int = 480, fps: float = 30.0, seed: int = 0):
+        super().__init__(width, height, fps)
+        self._rng = np.random.default_rng(seed)
+        self._background = np.full((height, width, 3), 60, dtype=np.uint8)
+        # 預先產生少量雜訊圖樣輪流使用，避免每幀產生亂數
+        self._noise = [
+            self._rng.integers(0, 8, size=(height, width, 3), dtype=np.uint8)
+            for _ in range(8)
+        ]
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self._opened:
+            return False, None
+
+        frame = cv2.add(self._background, self._noise[self.frame_index % len(self._noise)], dst=image)
+
+        # 移動方塊，讓畫面有變化
+        size = max(self.height // 8, 4)
+        x = (self.frame_index * 4) % max(self.width - size, 1)
+        y = self.height // 2 - size // 2
+        cv2.rectangle(frame, (x, y), (x + size, y + size), (180, 180, 180), -1)
+
+        self.frame_index += 1
+        return True, frame
+
+
+class VideoFileSource(FrameSource):
+    """影片檔來源，播放到結尾時可自動從頭循環"""
+
+    def __init__(self, path: Union[str, Path], loop: bool = True):
+        self.path = Path(path)
+        self.loop = loop
+        self._capture = cv2.VideoCapture(str(self.path))
+        width = int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = self._capture.get(cv2.CAP_PROP_FPS) or 30.0
+        super().__init__(width, height, fps)
+        self._opened = self._capture.isOpened()
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self._opened:
+            return False, None
+
+        ret, frame = self._capture.read(image)
+        if not ret and self.loop:
+            self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._capture.read(image)
+
+        if ret:
+            self.frame_index += 1
+        return ret, frame
+
+    def release(self):
+        super().release()
+        self._capture.release()
+
+
+class ImageFolderSource(FrameSource):
+    """圖片資料夾來源，依檔名順序輪播
+
+    圖片在建立時全部載入記憶體，讀取時不再有磁碟 I/O。
+    """
+
+    def __init__(self, path: Union[str, Path], loop: bool = True):
+        self.path = Path(path)
+        self.loop = loop
+        self.images: List[np.ndarray] = []
+        for image_path in sorted(self.path.iterdir()):
+            if image_path.suffix.lower() in IMAGE_EXTENSIONS:
+                image = cv2.imread(str(image_path))
+                if image is not None:
+                    self.images.append(image)
+
+        if self.images:
+            height, width = self.images[0].shape[:2]
+        else:
+            width, height = 0, 0
+        super().__init__(width, height)
+        self._opened = bool(self.images)
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self._opened:
+            return False, None
+        if not self.loop and self.frame_index >= len(self.images):
+            return False, None
+
+        source = self.images[self.frame_index % len(self.images)]
+        if image is not None and image.shape == source.shape:
+            np.copyto(image, source)
+            frame = image
+        else:
+            frame = source.copy()
+        self.frame_index += 1
+        return True, frame
+
+
+def open_frame_source(
+    spec: Union[str, int],
+    width: int = 640,
+    height: int = 480,
+    loop: bool = True
+):
+    """根據描述字串開啟影像來源
+
+    Args:
+        spec: "synthetic"、影片檔路徑、圖片資料夾路徑，或攝影機編號
+        width: 合成畫面寬度
+        height: 合成畫面高度
+        loop: 檔案來源播放完畢是否循環
+
+    Returns:
+        FrameSource 或 cv2.VideoCapture
+    """
+    if isinstance(spec, int) or str(spec).isdigit():
+        return cv2.VideoCapture(int(spec))
+
+    if spec == "synthetic":
+        return SyntheticFrameSource(width, height)
+
+    path = Path(spec)
+    if path.is_dir():
+        return ImageFolderSource(path, loop=loop)
+    if path.is_file():
+        return VideoFileSource(path, loop=loop)
+
+    raise ValueError(f"無法識別的影像來源: {spec}")
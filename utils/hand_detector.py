@@ -2,16 +2,52 @@
 手部偵測模組：使用 MediaPipe 進行手部關鍵點追蹤
 
 提供簡單的手部偵測接口，用於手勢識別。
+只匯入 MediaPipe Hands 的計算圖，關鍵點以 utils.hand_drawing 自行繪製，
+執行期間不會載入 Matplotlib（不需要字型快取）。
 """
 
+import importlib.util
+import sys
+
 import cv2
 import numpy as np
 from typing import Optional, List, Tuple
 
+from utils.hand_drawing import draw_hands
+
+
+def _register_bare_package(name: str):
+    """在 sys.modules 放入不執行 __init__.py 的套件，之後仍可匯入其子模組"""
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+
+
+def _import_hands_solution():
+    """只匯入 mediapipe.python.solutions.hands
+
+    mediapipe/__init__.py 與 solutions/__init__.py 會匯入所有 solutions 與 tasks，
+    其中 drawing_utils 會載入 Matplotlib（首次啟動掃描字型需數秒）。
+    這兩層以空套件佔位後直接匯入 hands；mediapipe 已完整匯入時則直接使用。
+    佔位後同一進程內 `mediapipe.solutions` 等頂層屬性不可用。
+    """
+    if "mediapipe" not in sys.modules:
+        _register_bare_package("mediapipe")
+        _register_bare_package("mediapipe.python.solutions")
+    import mediapipe.python.solutions.hands as hands
+    return hands
+
+
 try:
-    import mediapipe as mp
+    mp_hands = _import_hands_solution()
     MEDIAPIPE_AVAILABLE = True
 except ImportError:
+    mp_hands = None
     MEDIAPIPE_AVAILABLE = False
     print("⚠️ MediaPipe 未安裝，請執行: pip install mediapipe")
 
@@ -40,9 +76,7 @@ class HandDetector:
         if not MEDIAPIPE_AVAILABLE:
             raise RuntimeError("MediaPipe 未安裝")
         
-        self.mp_hands = mp.solutions.hands
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_drawing_styles = mp.solutions.drawing_styles
+        self.mp_hands = mp_hands
         
         self.hands = self.mp_hands.Hands(
             static_image_mode=False,
@@ -53,6 +87,8 @@ class HandDetector:
         )
         
         self.results = None
+        self.landmarks_list = None
+        self._frame_rgb = None  # 重複使用的 RGB 轉換緩衝區（MediaPipe 處理時會複製輸入）
     
     def detect(self, frame: np.ndarray) -> Optional[List[np.ndarray]]:
         """偵測手部關鍵點
@@ -65,11 +101,12 @@ class HandDetector:
             包含 21 個關鍵點的 (x, y, z) 座標。
             如果沒有偵測到手部，返回 None。
         """
-        # 轉換為 RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # 轉換為 RGB（尺寸相同時寫入上次的緩衝區）
+        self._frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._frame_rgb)
         
         # 偵測
-        self.results = self.hands.process(frame_rgb)
+        self.results = self.hands.process(self._frame_rgb)
+        self.landmarks_list = None
         
         if not self.results.multi_hand_landmarks:
             return None
@@ -83,6 +120,7 @@ class HandDetector:
             ])
             landmarks_list.append(landmarks)
         
+        self.landmarks_list = landmarks_list
         return landmarks_list
     
     def draw_landmarks(self, frame: np.ndarray) -> np.ndarray:
@@ -94,15 +132,8 @@ class HandDetector:
         Returns:
             繪製了關鍵點的影像
         """
-        if self.results and self.results.multi_hand_landmarks:
-            for hand_landmarks in self.results.multi_hand_landmarks:
-                self.mp_drawing.draw_landmarks(
-                    frame,
-                    hand_landmarks,
-                    self.mp_hands.HAND_CONNECTIONS,
-                    self.mp_drawing_styles.get_default_hand_landmarks_style(),
-                    self.mp_drawing_styles.get_default_hand_connections_style()
-                )
+        if self.landmarks_list:
+            draw_hands(frame, self.landmarks_list)
         
         return frame
     
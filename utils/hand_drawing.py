@@ -0,0 +1,96 @@
+"""
+手部關鍵點繪製模組
+
+以 OpenCV 直接繪製，樣式與 MediaPipe 預設的手部樣式
+（drawing_styles.get_default_hand_landmarks_style / connections_style）相同。
+MediaPipe 的 drawing_utils 會載入 Matplotlib，這裡不依賴它。
+"""
+
+from typing import Dict, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+# BGR 顏色（與 MediaPipe drawing_styles 相同）
+_RED = (48, 48, 255)
+_GREEN = (48, 255, 48)
+_BLUE = (192, 101, 21)
+_YELLOW = (0, 204, 255)
+_GRAY = (128, 128, 128)
+_PURPLE = (128, 64, 128)
+_PEACH = (180, 229, 255)
+_WHITE = (224, 224, 224)
+
+RADIUS = 5
+BORDER_RADIUS = max(RADIUS + 1, int(RADIUS * 1.2))
+
+# 手部 21 個關鍵點的連線（與 mediapipe hands_connections 相同）
+PALM_CONNECTIONS = ((0, 1), (0, 5), (9, 13), (13, 17), (5, 9), (0, 17))
+THUMB_CONNECTIONS = ((1, 2), (2, 3), (3, 4))
+INDEX_FINGER_CONNECTIONS = ((5, 6), (6, 7), (7, 8))
+MIDDLE_FINGER_CONNECTIONS = ((9, 10), (10, 11), (11, 12))
+RING_FINGER_CONNECTIONS = ((13, 14), (14, 15), (15, 16))
+PINKY_FINGER_CONNECTIONS = ((17, 18), (18, 19), (19, 20))
+
+# (連線, 顏色, 線寬)，依序繪製
+CONNECTION_STYLE = (
+    (PALM_CONNECTIONS, _GRAY, 3),
+    (THUMB_CONNECTIONS, _PEACH, 2),
+    (INDEX_FINGER_CONNECTIONS, _PURPLE, 2),
+    (MIDDLE_FINGER_CONNECTIONS, _YELLOW, 2),
+    (RING_FINGER_CONNECTIONS, _GREEN, 2),
+    (PINKY_FINGER_CONNECTIONS, _BLUE, 2),
+)
+
+# 關鍵點編號 → 填色
+LANDMARK_COLORS: Dict[int, Tuple[int, int, int]] = {}
+for _indices, _color in (
+    ((0, 1, 5, 9, 13, 17), _RED),   # 手腕與掌根
+    ((2, 3, 4), _PEACH),            # 拇指
+    ((6, 7, 8), _PURPLE),           # 食指
+    ((10, 11, 12), _YELLOW),        # 中指
+    ((14, 15, 16), _GREEN),         # 無名指
+    ((18, 19, 20), _BLUE),          # 小指
+):
+    for _index in _indices:
+        LANDMARK_COLORS[_index] = _color
+
+
+def to_pixels(landmarks: np.ndarray, width: int, height: int) -> Dict[int, Tuple[int, int]]:
+    """將正規化座標轉為像素座標，超出 [0, 1] 的關鍵點略過（與 MediaPipe 相同）
+
+    Args:
+        landmarks: (21, 2) 或 (21, 3) 的正規化座標
+        width, height: 影像尺寸
+    """
+    points = {}
+    for index, (x, y) in enumerate(np.asarray(landmarks)[:, :2]):
+        if 0.0 <= x <= 1.0 and 0.0 <= y <= 1.0:
+            points[index] = (min(int(x * width), width - 1), min(int(y * height), height - 1))
+    return points
+
+
+def draw_hand(frame: np.ndarray, points: Dict[int, Tuple[int, int]]) -> np.ndarray:
+    """在影像上繪製一隻手（先畫連線，再畫關鍵點）
+
+    Args:
+        frame: BGR 影像（直接修改）
+        points: 關鍵點編號 → 像素座標
+    """
+    for connections, color, thickness in CONNECTION_STYLE:
+        for start, end in connections:
+            if start in points and end in points:
+                cv2.line(frame, points[start], points[end], color, thickness)
+
+    for index, point in points.items():
+        cv2.circle(frame, point, BORDER_RADIUS, _WHITE, -1)
+        cv2.circle(frame, point, RADIUS, LANDMARK_COLORS.get(index, _RED), -1)
+    return frame
+
+
+def draw_hands(frame: np.ndarray, hands: Sequence[np.ndarray]) -> np.ndarray:
+    """繪製多隻手的正規化關鍵點"""
+    height, width = frame.shape[:2]
+    for landmarks in hands:
+        draw_hand(frame, to_pixels(landmarks, width, height))
+    return frame
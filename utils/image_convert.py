@@ -0,0 +1,36 @@
+"""
+影像格式轉換模組
+
+OpenCV BGR 影像與 Qt 影像之間的轉換。
+"""
+
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+from PyQt6.QtGui import QImage
+
+
+def frame_to_qimage(
+    frame: np.ndarray, mirror: bool = False, dst: Optional[np.ndarray] = None
+) -> Tuple[QImage, np.ndarray]:
+    """將 BGR 影像轉換為 QImage
+
+    Args:
+        frame: BGR 格式的影像
+        mirror: 水平翻轉（在轉換出的 RGB 陣列上原地翻轉，不另外配置影像）
+        dst: 寫入 RGB 結果的陣列（尺寸相同時重複使用，可省略）
+
+    Returns:
+        (QImage, RGB 陣列)。QImage 直接引用 RGB 陣列的記憶體，
+        在轉為 QPixmap 之前必須保留該陣列。
+    """
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=dst)
+    if mirror:
+        cv2.flip(frame_rgb, 1, dst=frame_rgb)
+    h, w, ch = frame_rgb.shape
+    bytes_per_line = ch * w
+    qt_image = QImage(
+        frame_rgb.data, w, h, bytes_per_line, QImage.Format.Format_RGB888
+    )
+    return qt_image, frame_rgb
@@ -0,0 +1,144 @@
+"""
+匯入時間分析模組
+
+解析 `python -X importtime` 輸出到 stderr 的紀錄，重建匯入樹，
+彙整每個模組的自身時間與累計時間，並與基準比較。
+
+-X importtime 的格式（時間單位為微秒，子模組先於父模組輸出）：
+    import time: self [us] | cumulative | imported package
+    import time:       255 |        255 |       mediapipe.python.solutions.hands_connections
+
+注意：背景執行緒的匯入與主執行緒交錯輸出時，樹狀結構可能有少量誤判，
+但每個模組的自身與累計時間不受影響。
+"""
+
+import re
+import statistics
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$")
+
+
+@dataclass
+class ImportNode:
+    """匯入樹的一個節點（時間單位：毫秒）"""
+    name: str
+    self_ms: float
+    cumulative_ms: float
+    children: List["ImportNode"] = field(default_factory=list)
+
+
+def parse_importtime(lines: Iterable[str]) -> List[ImportNode]:
+    """解析 -X importtime 輸出，回傳最上層匯入的節點列表（依匯入順序）
+
+    子模組的紀錄先於父模組輸出，縮排每層兩個空白；
+    遇到某一層的模組時，收走暫存在下一層的節點作為它的子節點。
+    """
+    pending: Dict[int, List[ImportNode]] = {}
+    for line in lines:
+        match = _LINE.match(line.rstrip("\n"))
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        level = (len(indent) - 1) // 2
+        node = ImportNode(
+            name=name,
+            self_ms=int(self_us) / 1000,
+            cumulative_ms=int(cumulative_us) / 1000,
+            children=pending.pop(level + 1, []),
+        )
+        pending.setdefault(level, []).append(node)
+    return pending.get(0, [])
+
+
+def walk(nodes: Iterable[ImportNode]):
+    for node in nodes:
+        yield node
+        yield from walk(node.children)
+
+
+def module_times(roots: List[ImportNode]) -> Dict[str, Dict[str, float]]:
+    """每個模組的 {self_ms, cumulative_ms}（模組只會被匯入一次）"""
+    return {
+        node.name: {'self_ms': node.self_ms, 'cumulative_ms': node.cumulative_ms}
+        for node in walk(roots)
+    }
+
+
+def package_self_times(modules: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+    """依最上層套件加總自身時間，例如 matplotlib.* 全部歸入 matplotlib"""
+    totals: Dict[str, float] = {}
+    for name, times in modules.items():
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0.0) + times['self_ms']
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def merge_runs(runs: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+    """多次執行取每個模組的中位數，降低冷/熱快取造成的雜訊"""
+    names = {name for run in runs for name in run}
+    merged = {}
+    for name in names:
+        samples = [run[name] for run in runs if name in run]
+        merged[name] = {
+            'self_ms': statistics.median(s['self_ms'] for s in samples),
+            'cumulative_ms': statistics.median(s['cumulative_ms'] for s in samples),
+            'runs': len(samples),
+        }
+    return merged
+
+
+def format_tree(roots: List[ImportNode], min_ms: float = 10.0, max_depth: int = 6) -> List[str]:
+    """將匯入樹格式化為文字，只展開累計時間超過 min_ms 的節點"""
+    lines = []
+
+    def visit(node: ImportNode, depth: int):
+        lines.append(f"{node.cumulative_ms:9.1f} {node.self_ms:9.1f}  {'  ' * depth}{node.name}")
+        if depth + 1 >= max_depth:
+            return
+        children = sorted(node.children, key=lambda child: -child.cumulative_ms)
+        for child in children:
+            if child.cumulative_ms >= min_ms:
+                visit(child, depth + 1)
+
+    for root in sorted(roots, key=lambda node: -node.cumulative_ms):
+        if root.cumulative_ms >= min_ms:
+            visit(root, 0)
+    return lines
+
+
+def compare_modules(current: Dict[str, Dict[str, float]],
+                    baseline: Dict[str, Dict[str, float]],
+                    min_ms: float = 5.0) -> List[dict]:
+    """比較每個模組的累計時間
+
+    只列出任一方超過 min_ms 的模組，新增或移除的模組也會列出。
+
+    Returns:
+        [{name, baseline_ms, current_ms, delta_ms}, ...]，依變化量絕對值排序
+    """
+    rows = []
+    for name in set(current) | set(baseline):
+        before = baseline.get(name, {}).get('cumulative_ms')
+        after = current.get(name, {}).get('cumulative_ms')
+        if max(before or 0.0, after or 0.0) < min_ms:
+            continue
+        rows.append({
+            'name': name,
+            'baseline_ms': before,
+            'current_ms': after,
+            'delta_ms': (after or 0.0) - (before or 0.0),
+        })
+    return sorted(rows, key=lambda row: -abs(row['delta_ms']))
+
+
+def total_import_ms(modules: Dict[str, Dict[str, float]]) -> float:
+    """所有模組自身時間的總和（即匯入總耗時，不會重複計算）"""
+    return sum(times['self_ms'] for times in modules.values())
+
+
+def top_modules(modules: Dict[str, Dict[str, float]], key: str, limit: int) -> List[tuple]:
+    ranked = sorted(modules.items(), key=lambda item: -item[1][key])
+    return ranked[:limit]
+
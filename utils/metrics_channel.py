@@ -0,0 +1,271 @@
+"""
+共享記憶體效能指標通道
+
+執行中的應用程式把即時指標（FPS、各階段延遲、丟幀、偵測率等）
+寫入一塊命名的共享記憶體（gesture_metrics_<pid>），
+monitor.py 與 performance_profiler.py 以 PID 附加後可高頻讀取，
+不需要任何 IPC 往返。
+
+記憶體配置：
+    標頭  magic(4s) version(H) payload_size(H) sequence(Q)
+    內容  依 FIELDS 順序排列的數值
+
+寫入端採用 seqlock：寫入前後各遞增一次 sequence，
+讀取端在 sequence 為奇數或前後不一致時重試，避免讀到寫到一半的資料。
+"""
+
+import os
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional
+
+MAGIC = b"GMET"
+VERSION = 3
+
+# 與 main.py update_frame 中的 tracer span 相同
+STAGES = ("capture", "flip", "detect", "draw_landmarks", "classify", "display")
+
+# activity_tier 欄位的編號（與 utils.activity_controller 的分級順序相同）
+ACTIVITY_TIERS = ("active", "idle", "deep_idle")
+
+# (欄位名稱, struct 格式)。新增欄位時必須遞增 VERSION
+FIELDS = (
+    ("updated_at", "d"),       # time.time()
+    ("detecting", "q"),        # 0 / 1
+    ("frames", "q"),           # 累計處理的影格數
+    ("dropped_frames", "q"),   # 累計丟棄的影格數（讀取失敗或計時器延誤）
+    ("detections", "q"),       # 累計偵測到手部的影格數
+    ("skipped_detections", "q"),  # 累計略過偵測的影格數（動態閘門或閒置分級）
+    ("activity_tier", "q"),    # 0=active 1=idle 2=deep_idle
+    ("fps", "d"),
+    ("detection_rate", "d"),   # 最近一秒偵測到手部的比例
+    ("frame_ms", "d"),         # update_frame 總延遲（指數移動平均）
+    ("cpu_percent", "d"),
+    ("memory_mb", "d"),
+) + tuple((f"{stage}_ms", "d") for stage in STAGES)
+
+_HEADER = struct.Struct("<4sHHQ")
+_PAYLOAD = struct.Struct("<" + "".join(fmt for _, fmt in FIELDS))
+_FIELD_NAMES = tuple(name for name, _ in FIELDS)
+BLOCK_SIZE = _HEADER.size + _PAYLOAD.size
+
+# 延遲的指數移動平均係數
+_EMA_ALPHA = 0.1
+
+
+def metrics_block_name(pid: Optional[int] = None) -> str:
+    """取得指定進程的共享記憶體名稱"""
+    return f"gesture_metrics_{pid or os.getpid()}"
+
+
+def find_publishers() -> List[int]:
+    """列出目前有發布指標的 PID（僅 Linux 的 /dev/shm 可列舉）"""
+    pids = []
+    if os.path.isdir("/dev/shm"):
+        for name in os.listdir("/dev/shm"):
+            if name.startswith("gesture_metrics_"):
+                suffix = name.rsplit("_", 1)[-1]
+                if suffix.isdigit() and _pid_alive(int(suffix)):
+                    pids.append(int(suffix))
+    return sorted(pids)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsPublisher:
+    """應用程式端：彙整每個影格的統計並寫入共享記憶體
+
+    使用方式（每個影格）：
+        publisher.begin_frame()
+        ... 擷取 ...
+        publisher.mark("capture")
+        ... 其他階段 ...
+        publisher.end_frame(detected=True)
+    """
+
+    def __init__(self, pid: Optional[int] = None, enabled: bool = True):
+        """建立指標區塊
+
+        Args:
+            pid: 區塊名稱使用的 PID，None 表示目前進程
+            enabled: False 時只在記憶體中彙整，不建立共享記憶體
+        """
+        self.name = metrics_block_name(pid)
+        self.shm = None
+        if enabled:
+            try:
+                self.shm = shared_memory.SharedMemory(name=self.name, create=True, size=BLOCK_SIZE)
+            except FileExistsError:
+                # 同一 PID 的舊進程異常結束留下的區塊，直接沿用
+                self.shm = shared_memory.SharedMemory(name=self.name)
+
+        self.values = dict.fromkeys(_FIELD_NAMES, 0)
+        self.sequence = 0
+        self.frame_interval = 0.0
+        self._last_frame_start = None
+        self._frame_start = 0.0
+        self._stage_start = 0.0
+        self._window_start = time.perf_counter()
+        self._window_frames = 0
+        self._window_detections = 0
+        self._write()
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        # 計時器延誤超過 1.5 個間隔，錯過的影格計為丟棄
+        if self._last_frame_start is not None and self.frame_interval > 0:
+            gap = now - self._last_frame_start
+            if gap > self.frame_interval * 1.5:
+                self.values['dropped_frames'] += round(gap / self.frame_interval) - 1
+        self._last_frame_start = now
+        self._frame_start = now
+        self._stage_start = now
+
+    def mark(self, stage: str):
+        """記錄從上一個標記到現在的階段延遲"""
+        now = time.perf_counter()
+        self._ema(f"{stage}_ms", (now - self._stage_start) * 1000)
+        self._stage_start = now
+
+    def end_frame(self, detected: bool, skipped: bool = False):
+        """結束影格
+
+        Args:
+            detected: 是否偵測到手部
+            skipped: 是否由動態閘門略過偵測
+        """
+        now = time.perf_counter()
+        values = self.values
+        self._ema("frame_ms", (now - self._frame_start) * 1000)
+        values['frames'] += 1
+        if skipped:
+            values['skipped_detections'] += 1
+        self._window_frames += 1
+        if detected:
+            values['detections'] += 1
+            self._window_detections += 1
+
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            values['fps'] = self._window_frames / elapsed
+            values['detection_rate'] = self._window_detections / self._window_frames
+            self._window_start = now
+            self._window_frames = 0
+            self._window_detections = 0
+        self._write()
+
+    def drop_frames(self, count: int = 1):
+        self.values['dropped_frames'] += count
+        self._write()
+
+    def set_detecting(self, detecting: bool, frame_interval_ms: float = 0.0):
+        """偵測開始或停止
+
+        Args:
+            detecting: 是否偵測中
+            frame_interval_ms: 預期的影格間隔，用來估計計時器延誤造成的丟幀
+        """
+        self.values['detecting'] = int(detecting)
+        self.values['activity_tier'] = 0
+        self.frame_interval = frame_interval_ms / 1000
+        self._last_frame_start = None
+        if not detecting:
+            self.values['fps'] = 0.0
+            self.values['detection_rate'] = 0.0
+        self._window_start = time.perf_counter()
+        self._window_frames = 0
+        self._window_detections = 0
+        self._write()
+
+    def set_frame_interval(self, frame_interval_ms: float, activity_tier: int = 0):
+        """偵測中改變計時器間隔（閒置分級切換）"""
+        self.frame_interval = frame_interval_ms / 1000
+        self.values['activity_tier'] = activity_tier
+        self._write()
+
+    def set_system(self, cpu_percent: float, memory_mb: float):
+        self.values['cpu_percent'] = cpu_percent
+        self.values['memory_mb'] = memory_mb
+        self._write()
+
+    def close(self):
+        """關閉並移除共享記憶體"""
+        if self.shm is None:
+            return
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+        self.shm = None
+
+    def _ema(self, key: str, value: float):
+        previous = self.values[key]
+        self.values[key] = value if previous == 0 else previous + _EMA_ALPHA * (value - previous)
+
+    def _write(self):
+        if self.shm is None:
+            return
+        buf = self.shm.buf
+        self.values['updated_at'] = time.time()
+        # seqlock：奇數表示寫入中
+        self.sequence += 1
+        _HEADER.pack_into(buf, 0, MAGIC, VERSION, _PAYLOAD.size, self.sequence)
+        _PAYLOAD.pack_into(buf, _HEADER.size, *(self.values[name] for name in _FIELD_NAMES))
+        self.sequence += 1
+        _HEADER.pack_into(buf, 0, MAGIC, VERSION, _PAYLOAD.size, self.sequence)
+
+
+class MetricsReader:
+    """工具端：以 PID 附加到應用程式的共享記憶體並讀取指標"""
+
+    def __init__(self, pid: int):
+        """附加到指定進程的指標區塊
+
+        Raises:
+            FileNotFoundError: 該進程沒有發布指標
+            ValueError: 格式或版本不相容
+        """
+        self.pid = pid
+        # 附加預設也會被 resource_tracker 追蹤，讀取端結束時會誤刪區塊；
+        # 3.13 起可以 track=False 不追蹤，之前的版本附加後取消追蹤
+        if sys.version_info >= (3, 13):
+            self.shm = shared_memory.SharedMemory(name=metrics_block_name(pid), track=False)
+        else:
+            self.shm = shared_memory.SharedMemory(name=metrics_block_name(pid))
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+
+        magic, version, payload_size, _ = _HEADER.unpack_from(self.shm.buf, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("不是手勢 Demo 的指標區塊")
+        if version != VERSION or payload_size != _PAYLOAD.size:
+            self.close()
+            raise ValueError(f"指標格式版本不相容（應用程式 v{version}，工具 v{VERSION}）")
+
+    def read(self, retries: int = 100) -> Optional[Dict[str, float]]:
+        """讀取一份一致的指標快照，持續寫入衝突時回傳 None"""
+        buf = self.shm.buf
+        for _ in range(retries):
+            before = _HEADER.unpack_from(buf, 0)[3]
+            if before % 2:
+                continue
+            values = _PAYLOAD.unpack_from(buf, _HEADER.size)
+            if _HEADER.unpack_from(buf, 0)[3] == before:
+                return dict(zip(_FIELD_NAMES, values))
+        return None
+
+    def close(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
@@ -0,0 +1,32 @@
+"""
+鏡像預覽：在關鍵點座標上做鏡像，而不是翻轉整張影格
+
+偵測直接處理攝影機原始（未翻轉）影格，關鍵點也繪製在原始影格上，
+顯示前轉為 RGB 時才在轉換結果上原地翻轉（frame_to_qimage(mirror=True)），畫面與先翻轉影格相同。
+交給手勢模型與介面的結果換算到鏡像空間，與翻轉後再偵測的結果一致：
+    關鍵點  x → 1 - x（y、z 不變）
+    左右手  MediaPipe 假設輸入為鏡像（自拍）畫面，未翻轉的輸入左右相反，需對調
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_SWAPPED_HANDEDNESS = {"Left": "Right", "Right": "Left"}
+
+
+def mirror_landmarks(landmarks_list: Optional[Sequence[np.ndarray]]) -> Optional[List[np.ndarray]]:
+    """將每隻手的正規化 x 座標鏡像（回傳新陣列，不修改偵測器保存的關鍵點）"""
+    if not landmarks_list:
+        return landmarks_list
+    mirrored = []
+    for landmarks in landmarks_list:
+        hand = np.array(landmarks, dtype=np.float64)
+        hand[:, 0] = 1.0 - hand[:, 0]
+        mirrored.append(hand)
+    return mirrored
+
+
+def mirror_handedness(hand_info: Sequence[Tuple[str, float]]) -> List[Tuple[str, float]]:
+    """對調 [(handedness, confidence), ...] 的左右手標籤"""
+    return [(_SWAPPED_HANDEDNESS.get(label, label), confidence) for label, confidence in hand_info]
@@ -0,0 +1,93 @@
+"""
+動態閘門：畫面靜止且沒有手時略過 MediaPipe 偵測
+
+每個影格先縮成小張灰階圖（預設 64x48），與上次執行偵測時的縮圖比較，
+變化的像素比例低於門檻、且上次偵測沒有手部時，本影格不執行偵測。
+比較對象固定為上次偵測時的縮圖，緩慢的光線或場景變化累積到門檻後仍會觸發偵測。
+
+安全機制：
+    - 上次偵測到手部時一律偵測（手靜止不動也要持續追蹤）
+    - 連續略過 max_skip 個影格後強制偵測一次
+"""
+
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """以縮圖差異決定是否執行手部偵測"""
+
+    def __init__(
+        self,
+        size: Tuple[int, int] = (64, 48),
+        pixel_threshold: int = 12,
+        min_changed_ratio: float = 0.005,
+        max_skip: int = 15,
+    ):
+        """建立動態閘門
+
+        Args:
+            size: 比較用縮圖尺寸 (寬, 高)
+            pixel_threshold: 灰階差超過此值的像素視為變化
+            min_changed_ratio: 變化像素比例達到此值時執行偵測
+            max_skip: 最多連續略過的影格數，之後強制偵測一次
+        """
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_ratio = min_changed_ratio
+        self.max_skip = max_skip
+        self.reset()
+
+    def reset(self):
+        """清除參考縮圖與統計（開始偵測或切換影像來源時呼叫）"""
+        self.reference = None
+        self.skipped_in_row = 0
+        self.changed_ratio = 0.0
+        self.motion = False  # 本影格的變化是否達到門檻
+        self.frames = 0
+        self.skipped = 0
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        # 先縮小再轉灰階，轉換只處理縮圖
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def should_detect(self, frame: np.ndarray, hand_present: bool) -> bool:
+        """判斷本影格是否需要執行偵測
+
+        Args:
+            frame: BGR 影像（翻轉前後皆可，差異比例不受鏡像影響）
+            hand_present: 上次偵測是否有手部
+
+        Returns:
+            True 表示執行偵測；False 表示沿用上次「沒有手部」的結果
+        """
+        self.frames += 1
+        thumbnail = self._thumbnail(frame)
+
+        self.changed_ratio = 1.0 if self.reference is None else self._changed(thumbnail)
+        self.motion = self.changed_ratio >= self.min_changed_ratio
+        if self.motion or hand_present or self.skipped_in_row >= self.max_skip:
+            return self._accept(thumbnail)
+
+        self.skipped_in_row += 1
+        self.skipped += 1
+        return False
+
+    def _changed(self, thumbnail: np.ndarray) -> float:
+        diff = cv2.absdiff(thumbnail, self.reference)
+        changed = np.count_nonzero(diff > self.pixel_threshold)
+        return changed / diff.size
+
+    def _accept(self, thumbnail: np.ndarray) -> bool:
+        self.reference = thumbnail
+        self.skipped_in_row = 0
+        return True
+
+    @property
+    def skip_ratio(self) -> float:
+        return self.skipped / self.frames if self.frames else 0.0
@@ -0,0 +1,349 @@
+"""
+效能紀錄歷史資料庫
+
+以 SQLite 保存 benchmark.py、microbenchmark.py 與 performance_profiler.py
+每次執行的原始樣本，並標記 git commit、config 設定與機器資訊，
+讓不同版本或不同機器的結果可以用統計方法比較。
+
+同一次執行內的樣本彼此相關（同一個暖機狀態、同一段時間的系統負載），
+也不包含執行之間的變異，直接對樣本做 bootstrap 會把一般的執行間雜訊判定為顯著。
+比較時每邊使用多次重複執行：每次執行先取中位數，再對這些每次執行的數值做 bootstrap；
+任一邊少於 MIN_REPLICATES 次執行時不判定顯著性。
+"""
+
+import json
+import sqlite3
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+DEFAULT_DB_PATH = Path("performance_logs/history.sqlite")
+
+# 名稱包含這些字串的指標「越大越好」，其餘（延遲、CPU、記憶體）越小越好
+HIGHER_IS_BETTER = ("fps", "ops_per_sec", "throughput", "detection_rate")
+
+# 判定顯著性需要的每邊最少重複執行次數
+MIN_REPLICATES = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    label TEXT,
+    created_at TEXT NOT NULL,
+    git_commit TEXT,
+    git_dirty INTEGER,
+    config_json TEXT,
+    system_json TEXT
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_samples_run_metric ON samples(run_id, metric);
+"""
+
+
+def git_revision(cwd: Optional[Path] = None) -> Dict[str, Any]:
+    """取得目前的 git commit 與是否有未提交的修改"""
+    cwd = cwd or Path(__file__).resolve().parent.parent
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, cwd=cwd, timeout=5
+        ).stdout.strip() or None
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, cwd=cwd, timeout=5
+        ).stdout.strip()
+        return {'commit': commit, 'dirty': bool(status)}
+    except (OSError, subprocess.SubprocessError):
+        return {'commit': None, 'dirty': None}
+
+
+def config_snapshot() -> Dict[str, Any]:
+    """擷取 config 模組中所有大寫常數"""
+    import config
+
+    snapshot = {}
+    for name in dir(config):
+        if name.isupper():
+            value = getattr(config, name)
+            if isinstance(value, (int, float, str, bool)) or value is None:
+                snapshot[name] = value
+    return snapshot
+
+
+def system_snapshot() -> Dict[str, str]:
+    """透過 PerformanceMonitor.get_system_info 取得機器資訊"""
+    from utils.performance_monitor import PerformanceMonitor
+
+    return PerformanceMonitor().get_system_info()
+
+
+def bootstrap_relative_change(
+    before: Sequence[float],
+    after: Sequence[float],
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    seed: int = 0
+) -> Dict[str, float]:
+    """以 bootstrap 估計平均值相對變化的信賴區間
+
+    每個值應為一次獨立執行的摘要（例如該次執行的中位數），不是同一次執行內的樣本。
+
+    Args:
+        before: 基準各次執行的數值
+        after: 比較各次執行的數值
+        confidence: 信賴水準
+        resamples: 重抽次數
+        seed: 亂數種子（固定以便重現）
+
+    Returns:
+        {'change': 相對變化, 'ci_low': 下界, 'ci_high': 上界}
+    """
+    a = np.asarray(before, dtype=float)
+    b = np.asarray(after, dtype=float)
+    base_mean = a.mean()
+    if base_mean == 0:
+        return {'change': 0.0, 'ci_low': 0.0, 'ci_high': 0.0}
+
+    rng = np.random.default_rng(seed)
+    a_means = rng.choice(a, size=(resamples, len(a)), replace=True).mean(axis=1)
+    b_means = rng.choice(b, size=(resamples, len(b)), replace=True).mean(axis=1)
+    valid = a_means != 0
+    changes = b_means[valid] / a_means[valid] - 1
+
+    tail = (1 - confidence) / 2 * 100
+    return {
+        'change': float(b.mean() / base_mean - 1),
+        'ci_low': float(np.percentile(changes, tail)),
+        'ci_high': float(np.percentile(changes, 100 - tail)),
+    }
+
+
+def run_value(values: Sequence[float]) -> float:
+    """一次執行的代表值（中位數，不受個別離群樣本影響）"""
+    return float(np.median(values))
+
+
+def profiler_samples(results: Dict[str, List[dict]]) -> Dict[str, List[float]]:
+    """將 performance_profiler 的 results 轉為 {指標: 樣本} 格式"""
+    samples: Dict[str, List[float]] = {}
+    for phase, phase_samples in results.items():
+        for sample in phase_samples:
+            for key in ("cpu_percent", "memory_mb", "threads"):
+                if sample.get(key) is not None:
+                    samples.setdefault(f"{phase}.{key}", []).append(sample[key])
+            gpu = sample.get("gpu")
+            if gpu and "usage" in gpu:
+                samples.setdefault(f"{phase}.gpu_percent", []).append(gpu["usage"])
+            app = sample.get("app")
+            # 偵測剛開始的第一秒還沒有 FPS，略過
+            if app and app.get("detecting") and app.get("fps"):
+                for key in ("fps", "frame_ms", "detection_rate"):
+                    samples.setdefault(f"{phase}.{key}", []).append(app[key])
+    return samples
+
+
+def microbench_samples(report: Dict[str, Any]) -> Dict[str, List[float]]:
+    """將 microbenchmark.py 的報告轉為 {指標: 樣本} 格式"""
+    samples: Dict[str, List[float]] = {}
+    for name, result in report.get("benchmarks", {}).items():
+        latencies = result.get("latencies_ms") or [result["p50_ms"]]
+        samples[f"{name}.latency_ms"] = list(latencies)
+    return samples
+
+
+class PerfHistory:
+    """效能紀錄歷史資料庫"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        """開啟（或建立）資料庫
+
+        Args:
+            db_path: SQLite 檔案路徑
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def record_run(
+        self,
+        kind: str,
+        samples: Dict[str, Sequence[float]],
+        label: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None,
+        system_info: Optional[Dict[str, str]] = None,
+        created_at: Optional[str] = None
+    ) -> int:
+        """記錄一次執行
+
+        Args:
+            kind: 執行類型（benchmark / microbench / profiler）
+            samples: {指標名稱: 樣本列表}
+            label: 自訂標籤
+            config: config 設定，None 表示自動擷取
+            system_info: 機器資訊，None 表示自動擷取
+            created_at: 執行時間（ISO 格式），None 表示現在
+
+        Returns:
+            執行編號
+        """
+        revision = git_revision()
+        if config is None:
+            config = config_snapshot()
+        if system_info is None:
+            system_info = system_snapshot()
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (kind, label, created_at, git_commit, git_dirty, "
+                "config_json, system_json) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    kind, label, created_at or datetime.now().isoformat(timespec="seconds"),
+                    revision['commit'], revision['dirty'],
+                    json.dumps(config, ensure_ascii=False),
+                    json.dumps(system_info, ensure_ascii=False),
+                )
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO samples (run_id, metric, value) VALUES (?, ?, ?)",
+                [
+                    (run_id, metric, float(value))
+                    for metric, values in samples.items()
+                    for value in values
+                    if value is not None
+                ]
+            )
+        return run_id
+
+    def list_runs(self, kind: Optional[str] = None, limit: int = 20) -> List[sqlite3.Row]:
+        """列出最近的執行紀錄"""
+        query = "SELECT * FROM runs"
+        params: tuple = ()
+        if kind:
+            query += " WHERE kind = ?"
+            params = (kind,)
+        query += " ORDER BY id DESC LIMIT ?"
+        return self.conn.execute(query, params + (limit,)).fetchall()
+
+    def get_run(self, run_id: int) -> Optional[sqlite3.Row]:
+        return self.conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+
+    def resolve(self, ref: str, kind: Optional[str] = None) -> Optional[int]:
+        """將 "latest"、"latest~1" 或數字轉為執行編號"""
+        if ref.isdigit():
+            return int(ref)
+        if ref.startswith("latest"):
+            offset = int(ref.partition("~")[2] or 0)
+            runs = self.list_runs(kind, limit=offset + 1)
+            return runs[offset]['id'] if len(runs) > offset else None
+        return None
+
+    def resolve_runs(self, spec: str, kind: Optional[str] = None) -> Optional[List[int]]:
+        """將一組重複執行的描述轉為執行編號列表
+
+        支援以逗號分隔的編號、latest~N、範圍（3-5），以及 label:名稱（該標籤的所有執行）。
+
+        Returns:
+            執行編號列表；任一項目找不到時為 None
+        """
+        run_ids: List[int] = []
+        for part in spec.split(","):
+            part = part.strip()
+            if part.startswith("label:"):
+                query = "SELECT id FROM runs WHERE label = ?"
+                params: tuple = (part[len("label:"):],)
+                if kind:
+                    query += " AND kind = ?"
+                    params += (kind,)
+                ids = [row['id'] for row in self.conn.execute(query + " ORDER BY id", params)]
+            elif "-" in part and all(p.isdigit() for p in part.split("-", 1)):
+                first, last = (int(p) for p in part.split("-", 1))
+                ids = list(range(first, last + 1))
+            else:
+                run_id = self.resolve(part, kind)
+                ids = [run_id] if run_id else []
+            if not ids or any(self.get_run(run_id) is None for run_id in ids):
+                return None
+            run_ids.extend(run_id for run_id in ids if run_id not in run_ids)
+        return run_ids
+
+    def get_samples(self, run_id: int) -> Dict[str, List[float]]:
+        """取得一次執行的所有樣本"""
+        samples: Dict[str, List[float]] = {}
+        for row in self.conn.execute(
+            "SELECT metric, value FROM samples WHERE run_id = ? ORDER BY rowid", (run_id,)
+        ):
+            samples.setdefault(row['metric'], []).append(row['value'])
+        return samples
+
+    def compare(
+        self,
+        base_ids: Sequence[int],
+        new_ids: Sequence[int],
+        confidence: float = 0.95,
+        min_effect: float = 0.02
+    ) -> List[Dict[str, Any]]:
+        """比較兩組重複執行的共同指標
+
+        每次執行取中位數，以各次執行的數值做 bootstrap；
+        信賴區間不包含 0 且變化幅度超過 min_effect 才視為顯著。
+        任一邊少於 MIN_REPLICATES 次執行時只計算變化，結論為「重複次數不足」。
+
+        Args:
+            base_ids: 基準執行編號（重複執行）
+            new_ids: 比較執行編號（重複執行）
+            confidence: 信賴水準
+            min_effect: 最小有意義的相對變化
+
+        Returns:
+            每個指標的比較結果列表（base_mean / new_mean 為各次執行中位數的平均）
+        """
+        base_runs = [self.get_samples(run_id) for run_id in base_ids]
+        new_runs = [self.get_samples(run_id) for run_id in new_ids]
+        metrics = set.intersection(*(set(samples) for samples in base_runs + new_runs))
+
+        rows = []
+        for metric in sorted(metrics):
+            a = [run_value(samples[metric]) for samples in base_runs]
+            b = [run_value(samples[metric]) for samples in new_runs]
+            row = {
+                'metric': metric,
+                'base_mean': float(np.mean(a)),
+                'new_mean': float(np.mean(b)),
+                'base_runs': len(a),
+                'new_runs': len(b),
+            }
+            if len(a) < MIN_REPLICATES or len(b) < MIN_REPLICATES:
+                row.update(change=row['new_mean'] / row['base_mean'] - 1 if row['base_mean'] else 0.0,
+                           ci_low=None, ci_high=None, verdict="重複次數不足")
+                rows.append(row)
+                continue
+
+            row.update(bootstrap_relative_change(a, b, confidence))
+            significant = (
+                (row['ci_low'] > 0 or row['ci_high'] < 0)
+                and abs(row['change']) >= min_effect
+            )
+            if not significant:
+                row['verdict'] = "無顯著差異"
+            else:
+                higher_better = any(key in metric for key in HIGHER_IS_BETTER)
+                improved = (row['change'] > 0) == higher_better
+                row['verdict'] = "改善" if improved else "退步"
+            rows.append(row)
+        return rows
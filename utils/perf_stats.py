@@ -0,0 +1,111 @@
+"""
+效能統計工具
+
+延遲分佈摘要（百分位數、平均、標準差）、線性趨勢擬合、增量統計等共用計算，
+供微基準測試、壓力測試、長時間測試與即時監控等工具使用。
+"""
+
+import math
+from typing import Dict, Sequence
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """計算百分位數（線性內插）
+
+    Args:
+        sorted_values: 已排序的數值
+        q: 百分位 (0-100)
+    """
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return float(sorted_values[0])
+
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return float(sorted_values[lower])
+    weight = position - lower
+    return float(sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight)
+
+
+def summarize_latencies(latencies_ms: Sequence[float]) -> Dict[str, float]:
+    """計算延遲分佈摘要
+
+    Args:
+        latencies_ms: 每次操作的延遲（毫秒）
+
+    Returns:
+        包含 count、mean、stdev、min、p50、p90、p95、p99、max、ops_per_sec 的字典
+    """
+    values = sorted(latencies_ms)
+    count = len(values)
+    if count == 0:
+        return {'count': 0}
+
+    mean = sum(values) / count
+    variance = sum((v - mean) ** 2 for v in values) / (count - 1) if count > 1 else 0.0
+
+    return {
+        'count': count,
+        'mean_ms': mean,
+        'stdev_ms': math.sqrt(variance),
+        'min_ms': values[0],
+        'p50_ms': percentile(values, 50),
+        'p90_ms': percentile(values, 90),
+        'p95_ms': percentile(values, 95),
+        'p99_ms': percentile(values, 99),
+        'max_ms': values[-1],
+        'ops_per_sec': 1000.0 / mean if mean > 0 else 0.0,
+    }
+
+
+def linear_fit(xs: Sequence[float], ys: Sequence[float]) -> Dict[str, float]:
+    """最小平方法線性擬合 y = slope * x + intercept
+
+    Args:
+        xs: 自變數（例如經過的秒數）
+        ys: 應變數（例如 RSS）
+
+    Returns:
+        包含 slope、intercept、r2 的字典，樣本不足兩點時斜率為 0
+    """
+    n = len(xs)
+    if n < 2:
+        return {'slope': 0.0, 'intercept': float(ys[0]) if n else 0.0, 'r2': 0.0}
+
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    if sxx == 0:
+        return {'slope': 0.0, 'intercept': mean_y, 'r2': 0.0}
+
+    slope = sxy / sxx
+    intercept = mean_y - slope * mean_x
+    r2 = (sxy * sxy) / (sxx * syy) if syy > 0 else 0.0
+    return {'slope': slope, 'intercept': intercept, 'r2': r2}
+
+
+class RunningStats:
+    """增量統計（次數、平均、最小、最大），每次更新 O(1)，不保留樣本"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
@@ -38,11 +38,13 @@ class PerformanceMonitor:
     監控 CPU、記憶體和 GPU（如果可用）的使用情況。
     """
     
-    def __init__(self, process_id: Optional[int] = None):
+    def __init__(self, process_id: Optional[int] = None, gpu_interval: float = 0.0):
         """初始化效能監控器
         
         Args:
             process_id: 要監控的進程 ID，None 表示當前進程
+            gpu_interval: GPU 最短取樣間隔（秒），期間內重複使用上次的數值；
+                GPUtil 每次取樣都會執行 nvidia-smi，高頻率更新時應設定
         """
         if process_id is None:
             self.process = psutil.Process()
@@ -52,6 +54,9 @@ class PerformanceMonitor:
         # 檢查 GPU 可用性
         self.gpu_available = False
         self.gpu_type = None
+        self.gpu_interval = gpu_interval
+        self._gpu_sample = (None, None)  # (使用率 %, 記憶體 MB)
+        self._gpu_sampled_at = None
         
         if IS_MACOS:
             # macOS: 使用 Metal GPU 監控
@@ -87,14 +92,18 @@ class PerformanceMonitor:
             except Exception as e:
                 print(f"⚠️  GPU 偵測失敗: {e}")
     
-    def get_metrics(self) -> PerformanceMetrics:
+    def get_metrics(self, interval: Optional[float] = 0.1) -> PerformanceMetrics:
         """獲取當前效能指標
         
+        Args:
+            interval: CPU 使用率的量測區間（秒）。None 表示計算自上次呼叫以來的
+                平均值，不會阻塞，適合固定頻率呼叫（第一次呼叫回傳 0）
+        
         Returns:
             PerformanceMetrics 對象，包含所有效能數據
         """
         # CPU 使用率（當前進程）
-        cpu_percent = self.process.cpu_percent(interval=0.1)
+        cpu_percent = self.process.cpu_percent(interval=interval)
         
         # 記憶體使用
         mem_info = self.process.memory_info()
@@ -114,14 +123,7 @@ class PerformanceMonitor:
                     
             elif self.gpu_type == "NVIDIA":
                 # NVIDIA GPU 監控
-                try:
-                    gpus = self.GPUtil.getGPUs()
-                    if gpus:
-                        gpu = gpus[0]  # 使用第一個 GPU
-                        gpu_percent = gpu.load * 100
-                        gpu_memory_mb = gpu.memoryUsed
-                except Exception as e:
-                    print(f"⚠️  GPU 讀取失敗: {e}")
+                gpu_percent, gpu_memory_mb = self._sample_nvidia()
         
         return PerformanceMetrics(
             cpu_percent=cpu_percent,
@@ -131,6 +133,21 @@ class PerformanceMonitor:
             gpu_memory_mb=gpu_memory_mb
         )
     
+    def _sample_nvidia(self):
+        """讀取第一個 NVIDIA GPU 的使用率與記憶體，gpu_interval 內重複使用上次的數值"""
+        now = time.monotonic()
+        if self._gpu_sampled_at is not None and now - self._gpu_sampled_at < self.gpu_interval:
+            return self._gpu_sample
+        self._gpu_sampled_at = now
+        try:
+            gpus = self.GPUtil.getGPUs()
+            if gpus:
+                gpu = gpus[0]  # 使用第一個 GPU
+                self._gpu_sample = (gpu.load * 100, gpu.memoryUsed)
+        except Exception as e:
+            print(f"⚠️  GPU 讀取失敗: {e}")
+        return self._gpu_sample
+    
     def get_system_info(self) -> Dict[str, str]:
         """獲取系統資訊
         
@@ -256,6 +273,21 @@ class PerformanceTracker:
         
         return stats
     
+    def get_samples(self) -> Dict[str, list]:
+        """取得原始樣本，供歷史資料庫做統計比較
+        
+        Returns:
+            {'cpu_percent': [...], 'memory_mb': [...], 'gpu_percent': [...]}
+        """
+        samples = {
+            'cpu_percent': [m.cpu_percent for m in self.metrics_history],
+            'memory_mb': [m.memory_mb for m in self.metrics_history],
+        }
+        gpu_values = [m.gpu_percent for m in self.metrics_history if m.gpu_percent is not None]
+        if gpu_values:
+            samples['gpu_percent'] = gpu_values
+        return samples
+    
     def print_statistics(self):
         """列印統計數據"""
         stats = self.get_statistics()
@@ -0,0 +1,87 @@
+"""
+具名效能設定檔
+
+config.PERFORMANCE_PROFILES 中每個設定檔是一組 config 常數的覆寫值，
+套用時直接改寫 config 模組的屬性（程式各處都以 config.X 在使用時讀取），
+切換到其他設定檔前先還原為載入時的原始值，因此設定檔之間不會互相殘留。
+
+apply() 回傳實際改變的設定，依 SECTIONS 分類，呼叫端只需重建受影響的部分：
+    camera      重新設定擷取解析度與幀率
+    detector    需要不同設定的偵測器
+    scheduling  計時器間隔、動態閘門、閒置分級、自適應品質
+    ui          效能監控更新頻率
+"""
+
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# 設定名稱前綴 → 分類
+SECTIONS = (
+    ("CAMERA_", "camera"),
+    ("MEDIAPIPE_", "detector"),
+    ("DETECTION_DAEMON_", "detector"),
+    ("UI_UPDATE_", "scheduling"),
+    ("MOTION_GATE_", "scheduling"),
+    ("ACTIVITY_", "scheduling"),
+    ("QUALITY_", "scheduling"),
+    ("PERF_", "ui"),
+)
+
+
+def section_of(key: str) -> Optional[str]:
+    for prefix, section in SECTIONS:
+        if key.startswith(prefix):
+            return section
+    return None
+
+
+def affected_sections(keys: Iterable[str]) -> Set[str]:
+    return {section_of(key) for key in keys} - {None}
+
+
+class ProfileManager:
+    """套用與還原具名效能設定檔"""
+
+    def __init__(self, config_module, profiles: Dict[str, Dict[str, object]]):
+        """
+        Args:
+            config_module: 要改寫的 config 模組
+            profiles: 設定檔名稱 → {常數名稱: 值}
+        """
+        for name, overrides in profiles.items():
+            for key in overrides:
+                if not hasattr(config_module, key):
+                    raise ValueError(f"設定檔 {name} 包含未知的設定: {key}")
+                if section_of(key) is None:
+                    raise ValueError(f"設定檔 {name} 的 {key} 不支援執行期切換")
+        self.config = config_module
+        self.profiles = profiles
+        # 所有設定檔會改到的常數，在第一次套用前的原始值
+        keys = sorted({key for overrides in profiles.values() for key in overrides})
+        self.base = {key: getattr(config_module, key) for key in keys}
+        self.current = None
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self.profiles)
+
+    def values_for(self, name: str) -> Dict[str, object]:
+        """設定檔完整的值（原始值 + 覆寫）"""
+        if name not in self.profiles:
+            raise KeyError(f"未知的設定檔: {name}（可用: {', '.join(self.profiles)}）")
+        return {**self.base, **self.profiles[name]}
+
+    def apply(self, name: str) -> Dict[str, Tuple[object, object]]:
+        """套用設定檔
+
+        Returns:
+            實際改變的設定 {名稱: (舊值, 新值)}
+        """
+        values = self.values_for(name)
+        changes = {}
+        for key, value in values.items():
+            old = getattr(self.config, key)
+            if old != value:
+                setattr(self.config, key, value)
+                changes[key] = (old, value)
+        self.current = name
+        return changes
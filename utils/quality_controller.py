@@ -0,0 +1,241 @@
+"""
+自適應品質控制：依每個影格的延遲與 CPU 餘裕調整偵測品質
+
+品質等級由高到低排成階梯，每一級包含：
+    scale           偵測輸入縮放比例（關鍵點為正規化座標，繪製仍用原始影格）
+    model_complexity
+    max_hands
+    detect_every    每幾個影格執行一次偵測，其餘影格沿用上次的關鍵點
+
+控制器收集實際執行偵測的影格延遲，每個評估週期（約 1 秒）比較：
+    降級  p95 超過 p95_budget_ms，或平均超過影格預算（1000 / target_fps）
+    升級  p95 低於預算 × upgrade_ratio，且系統 CPU 餘裕足夠
+為避免來回震盪（hysteresis）：
+    - 降級需要連續 degrade_after 個不合格週期，升級需要連續 upgrade_after 個合格週期
+    - 每次調整後有 cooldown_s 秒冷卻，並清除樣本
+    - 升級後 probation_s 秒內又降回來，下次升級到該級需要的合格週期加倍
+每次調整都記錄在 adjustments。
+"""
+
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.perf_stats import percentile
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """一個品質等級"""
+    scale: float
+    model_complexity: int
+    max_hands: int
+    detect_every: int = 1
+
+    def no_heavier_than(self, other: "QualityLevel") -> bool:
+        """每一項成本（輸入大小、模型、手數、偵測頻率）都不高於 other"""
+        return (self.scale <= other.scale
+                and self.model_complexity <= other.model_complexity
+                and self.max_hands <= other.max_hands
+                and self.detect_every >= other.detect_every)
+
+    def describe(self) -> str:
+        text = f"輸入 {self.scale:.0%}、complexity {self.model_complexity}、最多 {self.max_hands} 隻手"
+        if self.detect_every > 1:
+            text += f"、每 {self.detect_every} 影格偵測"
+        return text
+
+
+# 由高到低的預設階梯
+DEFAULT_LADDER = (
+    QualityLevel(1.0, 1, 2),
+    QualityLevel(1.0, 0, 2),
+    QualityLevel(0.75, 0, 2),
+    QualityLevel(0.75, 0, 1),
+    QualityLevel(0.5, 0, 1),
+    QualityLevel(0.5, 0, 1, detect_every=2),
+    QualityLevel(0.5, 0, 1, detect_every=3),
+)
+
+
+def ladder_for(model_complexity: int, max_hands: int,
+               ladder: Sequence[QualityLevel] = DEFAULT_LADDER) -> Tuple[QualityLevel, ...]:
+    """以設定（輸入不縮放、每個影格偵測）為最高等級的階梯
+
+    只保留每一項成本都不高於前一級的等級，降級時不會換成較重的模型或更多手數
+    （例如設定為 complexity 0、1 隻手時，略過預設階梯中 complexity 1 或 2 隻手的等級）。
+    """
+    levels = [QualityLevel(1.0, model_complexity, max_hands)]
+    for level in ladder:
+        if level != levels[-1] and level.no_heavier_than(levels[-1]):
+            levels.append(level)
+    return tuple(levels)
+
+
+def check_ladder(ladder: Sequence[QualityLevel]):
+    """確認階梯由高到低，每一級都不比上一級重
+
+    Raises:
+        ValueError: 階梯為空，或某一級比上一級重
+    """
+    if not ladder:
+        raise ValueError("品質階梯不可為空")
+    for upper, lower in zip(ladder, ladder[1:]):
+        if not lower.no_heavier_than(upper):
+            raise ValueError(f"品質階梯順序錯誤: {lower.describe()} 比上一級 {upper.describe()} 重")
+
+
+class QualityController:
+    """以影格延遲與 CPU 餘裕驅動品質階梯"""
+
+    def __init__(
+        self,
+        ladder: Sequence[QualityLevel] = DEFAULT_LADDER,
+        start_level: int = 0,
+        target_fps: float = 30.0,
+        p95_budget_ms: float = 40.0,
+        upgrade_ratio: float = 0.6,
+        min_cpu_headroom: float = 30.0,
+        degrade_after: int = 2,
+        upgrade_after: int = 5,
+        cooldown_s: float = 3.0,
+        probation_s: float = 10.0,
+        min_samples: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """建立控制器
+
+        Args:
+            ladder: 品質階梯，索引 0 為最高品質，每一級都不可比上一級重
+            start_level: 起始等級索引
+            target_fps: 目標幀率，平均延遲不可超過 1000 / target_fps
+            p95_budget_ms: p95 延遲預算
+            upgrade_ratio: p95 低於預算的此比例才考慮升級
+            min_cpu_headroom: 升級需要的系統 CPU 閒置百分比
+            degrade_after: 連續幾個不合格週期後降級
+            upgrade_after: 連續幾個合格週期後升級
+            cooldown_s: 調整後的冷卻秒數
+            probation_s: 升級後在此秒數內降級，視為升級失敗
+            min_samples: 評估週期內至少需要的偵測影格數
+            clock: 時間來源（秒）
+        """
+        check_ladder(ladder)
+        self.ladder = tuple(ladder)
+        self.index = max(0, min(start_level, len(self.ladder) - 1))
+        self.frame_budget_ms = 1000.0 / target_fps
+        self.p95_budget_ms = p95_budget_ms
+        self.upgrade_ratio = upgrade_ratio
+        self.min_cpu_headroom = min_cpu_headroom
+        self.degrade_after = degrade_after
+        self.upgrade_after = upgrade_after
+        self.cooldown_s = cooldown_s
+        self.probation_s = probation_s
+        self.min_samples = min_samples
+        self.clock = clock
+
+        self.samples: List[float] = []
+        self.bad_windows = 0
+        self.good_windows = 0
+        self.failed_upgrades: Dict[int, int] = {}
+        self.last_change = clock()
+        self.last_upgrade = None  # (從哪一級升上來, 時間)
+        self.adjustments: List[dict] = []
+        self._frame_counter = 0
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.ladder[self.index]
+
+    def detect_due(self) -> bool:
+        """依目前等級的 detect_every 判斷本影格是否執行偵測"""
+        self._frame_counter += 1
+        return self._frame_counter % self.level.detect_every == 0
+
+    def record(self, frame_ms: float):
+        """記錄一個實際執行偵測的影格延遲"""
+        self.samples.append(frame_ms)
+
+    def evaluate(self, cpu_percent: float) -> Optional[QualityLevel]:
+        """評估一個週期
+
+        Args:
+            cpu_percent: 系統整體 CPU 使用率（0-100）
+
+        Returns:
+            等級改變時回傳新的等級，否則 None
+        """
+        now = self.clock()
+        if now - self.last_change < self.cooldown_s:
+            # 冷卻期間的樣本包含切換造成的暫時延遲，不列入評估
+            self.samples.clear()
+            return None
+        if len(self.samples) < self.min_samples:
+            return None
+
+        values = sorted(self.samples)
+        self.samples.clear()
+        p95 = percentile(values, 95)
+        mean = sum(values) / len(values)
+        headroom = 100.0 - cpu_percent
+
+        if p95 > self.p95_budget_ms or mean > self.frame_budget_ms:
+            self.bad_windows += 1
+            self.good_windows = 0
+            if self.bad_windows >= self.degrade_after and self.index < len(self.ladder) - 1:
+                return self._change(self.index + 1, now, p95, mean, cpu_percent, "延遲超過預算")
+            return None
+
+        self.bad_windows = 0
+        if p95 < self.p95_budget_ms * self.upgrade_ratio and headroom >= self.min_cpu_headroom:
+            self.good_windows += 1
+            required = self.upgrade_after * 2 ** self.failed_upgrades.get(self.index - 1, 0)
+            if self.good_windows >= required and self.index > 0:
+                return self._change(self.index - 1, now, p95, mean, cpu_percent, "延遲與 CPU 有餘裕")
+        else:
+            self.good_windows = 0
+        return None
+
+    def restart_cooldown(self):
+        """從現在重新開始冷卻並捨棄已收集的樣本
+
+        新等級的偵測器在背景建立完成、實際換上時呼叫，
+        建立期間（仍使用舊偵測器）的樣本不代表新等級。
+        """
+        now = self.clock()
+        self.last_change = now
+        if self.last_upgrade:
+            self.last_upgrade = (self.last_upgrade[0], now)
+        self.samples.clear()
+
+    def _change(self, index: int, now: float, p95: float, mean: float,
+                cpu_percent: float, reason: str) -> QualityLevel:
+        if index > self.index:
+            # 剛升級上來的等級撐不住：之後升級到該級需要更久
+            if self.last_upgrade and self.last_upgrade[0] == index and \
+                    now - self.last_upgrade[1] < self.probation_s:
+                self.failed_upgrades[self.index] = self.failed_upgrades.get(self.index, 0) + 1
+            self.last_upgrade = None
+        else:
+            self.last_upgrade = (self.index, now)
+
+        previous = self.level
+        self.index = index
+        self.adjustments.append({
+            'time': time.time(),
+            'from': asdict(previous),
+            'to': asdict(self.level),
+            'level': index,
+            'reason': reason,
+            'p95_ms': round(p95, 2),
+            'mean_ms': round(mean, 2),
+            'cpu_percent': round(cpu_percent, 1),
+        })
+        self.last_change = now
+        self.bad_windows = 0
+        self.good_windows = 0
+        self.samples.clear()
+        return self.level
+
+    def status(self) -> str:
+        return (f"等級 {self.index}/{len(self.ladder) - 1}: {self.level.describe()} | "
+                f"調整 {len(self.adjustments)} 次")
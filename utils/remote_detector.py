@@ -0,0 +1,215 @@
+"""
+遠端手部偵測器（偵測常駐程式的用戶端）
+
+detection_daemon.py 常駐載入 MediaPipe 並保留已建立好的偵測器，
+應用程式重新啟動時不必再等待 MediaPipe 建立計算圖與載入模型。
+
+通訊方式：
+    控制訊息  Unix domain socket，每則訊息為 4 位元組長度 + UTF-8 JSON
+    影格資料  用戶端建立的共享記憶體區塊，常駐程式附加後直接讀取，不經過 socket
+
+訊息：
+    open    {op, options}               取得（或建立）符合 options 的偵測器
+    buffer  {op, shm, shape}            附加影格共享記憶體（第一次偵測與尺寸改變時）
+    detect  {op}                        偵測目前在共享記憶體中的影格
+    status  {op}                        常駐程式狀態
+    close   {op}                        歸還偵測器
+回應一律包含 ok；失敗時附 error。
+
+RemoteHandDetector 與 HandDetector 介面相同，可直接替換。
+"""
+
+import json
+import os
+import socket
+import struct
+import sys
+import tempfile
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from utils.hand_drawing import draw_hands
+
+_LENGTH = struct.Struct("<I")
+MAX_MESSAGE = 1 << 20
+OPEN_TIMEOUT = 60.0
+
+
+def default_socket_path() -> Path:
+    return Path(tempfile.gettempdir()) / "gesture-detector.sock"
+
+
+def send_message(sock: socket.socket, message: dict):
+    data = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    sock.sendall(_LENGTH.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Optional[dict]:
+    """讀取一則訊息，連線關閉時回傳 None"""
+    header = _recv_exact(sock, _LENGTH.size)
+    if header is None:
+        return None
+    (length,) = _LENGTH.unpack(header)
+    if length > MAX_MESSAGE:
+        raise ValueError(f"訊息過大: {length} bytes")
+    data = _recv_exact(sock, length)
+    if data is None:
+        return None
+    return json.loads(data.decode("utf-8"))
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """附加到其他進程建立的共享記憶體，不交給本進程的 resource_tracker 管理"""
+    # 附加預設也會被追蹤，常駐程式結束時會誤刪用戶端的區塊；
+    # 3.13 起可以 track=False 不追蹤，之前的版本附加後取消追蹤
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class RemoteHandDetector:
+    """透過偵測常駐程式執行的手部偵測器
+
+    建構時即向常駐程式借用偵測器；連線失敗時拋出 OSError
+    （ConnectionRefusedError / FileNotFoundError），呼叫端可改用本機的 HandDetector。
+    偵測時常駐程式中斷或逾時（timeout 秒）拋出 OSError，之後這個連線不再使用。
+    """
+
+    def __init__(
+        self,
+        max_num_hands: int = 2,
+        min_detection_confidence: float = 0.7,
+        min_tracking_confidence: float = 0.5,
+        model_complexity: int = 1,
+        socket_path=None,
+        timeout: float = 5.0,
+    ):
+        self.options = {
+            'max_num_hands': max_num_hands,
+            'min_detection_confidence': min_detection_confidence,
+            'min_tracking_confidence': min_tracking_confidence,
+            'model_complexity': model_complexity,
+        }
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(str(self.socket_path))
+        except OSError:
+            self.sock.close()
+            raise
+
+        self.shm = None
+        self.frame = None  # 共享記憶體上的 ndarray
+        self.opened = False
+        self.landmarks_list = None
+        self.handedness: List[Tuple[str, float]] = []
+
+        # 沒有閒置偵測器時常駐程式要建立新的，需要較長的等待時間
+        self.sock.settimeout(OPEN_TIMEOUT)
+        try:
+            reply = self._request({'op': 'open', 'options': self.options})
+        except (OSError, RuntimeError):
+            self.sock.close()
+            raise
+        self.sock.settimeout(timeout)
+        self.opened = True
+        self.warm = reply.get('warm', False)  # 是否借用到已暖機的偵測器
+
+    def _request(self, message: dict) -> dict:
+        send_message(self.sock, message)
+        reply = recv_message(self.sock)
+        if reply is None:
+            raise ConnectionError("偵測常駐程式已中斷連線")
+        if not reply.get('ok'):
+            raise RuntimeError(reply.get('error', '偵測常駐程式錯誤'))
+        return reply
+
+    def _prepare_buffer(self, shape):
+        """建立（或在尺寸改變時重建）影格共享記憶體"""
+        if self.frame is not None and self.frame.shape == shape:
+            return
+        old = self.shm
+        self.shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        self.frame = np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf)
+        self._request({'op': 'buffer', 'shm': self.shm.name, 'shape': list(shape)})
+        if old is not None:
+            old.close()
+            old.unlink()
+
+    def detect(self, frame: np.ndarray) -> Optional[List[np.ndarray]]:
+        """偵測手部關鍵點（與 HandDetector.detect 相同）"""
+        try:
+            self._prepare_buffer(frame.shape)
+            np.copyto(self.frame, frame)
+            reply = self._request({'op': 'detect'})
+        except OSError:
+            # 逾時後的回應可能晚到，連線已不同步；close() 不再送出請求
+            self.opened = False
+            raise
+
+        hands = reply.get('hands') or []
+        self.handedness = [(label, score) for label, score in reply.get('handedness') or []]
+        if not hands:
+            self.landmarks_list = None
+            return None
+        self.landmarks_list = [np.asarray(hand, dtype=np.float64) for hand in hands]
+        return self.landmarks_list
+
+    def draw_landmarks(self, frame: np.ndarray) -> np.ndarray:
+        if self.landmarks_list:
+            draw_hands(frame, self.landmarks_list)
+        return frame
+
+    def get_hand_info(self) -> List[Tuple[str, float]]:
+        return list(self.handedness)
+
+    def status(self) -> dict:
+        return self._request({'op': 'status'})
+
+    def close(self):
+        """歸還偵測器並釋放共享記憶體"""
+        if self.sock:
+            try:
+                if self.opened:
+                    self._request({'op': 'close'})
+            except (OSError, RuntimeError):
+                pass
+            self.sock.close()
+            self.sock = None
+        if self.shm is not None:
+            self.frame = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+def daemon_status(socket_path=None, timeout: float = 2.0) -> Optional[dict]:
+    """查詢常駐程式狀態，未執行時回傳 None"""
+    path = Path(socket_path) if socket_path else default_socket_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            send_message(sock, {'op': 'status'})
+            return recv_message(sock)
+    except OSError:
+        return None
@@ -0,0 +1,294 @@
+"""
+執行期效能分析模組
+
+可在程式執行中開關 cProfile 與 tracemalloc，分析一段有限時間後
+自動停止並把結果寫入 performance_logs/：
+- cProfile: .prof 原始檔、耗時排行，以及 collapsed-stack 火焰圖文字
+  （可用 flamegraph.pl 或 speedscope 開啟）
+- tracemalloc: 記憶體配置位置排行
+
+未啟用時不安裝任何 hook，對執行效能沒有影響。
+注意: cProfile 只分析呼叫 start_cprofile() 的執行緒（主程式中即 Qt 主執行緒）。
+"""
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# pstats 中的函式鍵: (檔名, 行號, 函式名稱)
+FuncKey = Tuple[str, int, str]
+
+
+def _format_func(func: FuncKey) -> str:
+    """將 pstats 函式鍵轉為火焰圖使用的框架名稱"""
+    filename, line, name = func
+    if filename == "~":
+        # 內建函式，例如 <built-in method cv2.cvtColor>
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def collapsed_stacks(
+    stats: pstats.Stats,
+    max_depth: int = 64,
+    max_nodes: int = 200_000
+) -> List[str]:
+    """將 cProfile 統計轉為 collapsed-stack 格式
+
+    cProfile 只記錄呼叫者/被呼叫者的邊，因此依各條邊的累計時間比例，
+    把每個函式的自身時間分攤到不同呼叫路徑上（與 flameprof 相同做法）。
+
+    Args:
+        stats: pstats.Stats 物件
+        max_depth: 最大堆疊深度
+        max_nodes: 最多展開的節點數，避免呼叫圖過大時耗時過久
+
+    Returns:
+        "框架1;框架2;... 微秒" 格式的文字列
+    """
+    raw = stats.stats
+    callees: Dict[FuncKey, Dict[FuncKey, float]] = {}
+    roots = []
+    for func, (_, _, _, _, callers) in raw.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            # edge: (原始呼叫次數, 呼叫次數, 自身時間, 累計時間)
+            callees.setdefault(caller, {})[func] = edge[3]
+
+    totals: Dict[str, float] = {}
+    visited = [0]
+
+    def walk(func: FuncKey, path: List[str], scale: float, on_stack: set):
+        visited[0] += 1
+        _, _, self_time, _, _ = raw[func]
+        frame_path = path + [_format_func(func)]
+        key = ";".join(frame_path)
+        totals[key] = totals.get(key, 0.0) + self_time * scale
+
+        if len(frame_path) >= max_depth or visited[0] >= max_nodes:
+            return
+        for callee, edge_time in callees.get(func, {}).items():
+            if callee in on_stack or callee not in raw:
+                continue
+            callee_cum = raw[callee][3]
+            if callee_cum <= 0:
+                continue
+            child_scale = min(edge_time * scale / callee_cum, 1.0)
+            if child_scale * callee_cum < 1e-6:
+                continue
+            walk(callee, frame_path, child_scale, on_stack | {callee})
+
+    for root in roots:
+        walk(root, [], 1.0, {root})
+
+    lines = []
+    for key, seconds in sorted(totals.items()):
+        micros = int(round(seconds * 1_000_000))
+        if micros > 0:
+            lines.append(f"{key} {micros}")
+    return lines
+
+
+class RuntimeProfiler:
+    """執行期 cProfile / tracemalloc 開關"""
+
+    def __init__(
+        self,
+        output_dir="performance_logs",
+        schedule: Optional[Callable[[int, Callable[[], None]], None]] = None,
+        top_n: int = 25,
+        tracemalloc_frames: int = 25
+    ):
+        """初始化執行期分析器
+
+        Args:
+            output_dir: 輸出目錄
+            schedule: 排程函式 schedule(毫秒, 回呼)，用於時間到自動停止；
+                Qt 程式應傳入 QTimer.singleShot，確保在主執行緒停止 cProfile
+            top_n: 排行顯示的項目數
+            tracemalloc_frames: tracemalloc 保存的堆疊深度
+        """
+        self.output_dir = Path(output_dir)
+        self.schedule = schedule or self._thread_schedule
+        self.top_n = top_n
+        self.tracemalloc_frames = tracemalloc_frames
+
+        self._profile: Optional[cProfile.Profile] = None
+        self._profile_started = 0.0
+        self._profile_token = 0
+        self._tracemalloc_started = 0.0
+        self._tracemalloc_token = 0
+        self._tracemalloc_baseline = None
+
+    @staticmethod
+    def _thread_schedule(delay_ms: int, callback: Callable[[], None]):
+        timer = threading.Timer(delay_ms / 1000.0, callback)
+        timer.daemon = True
+        timer.start()
+
+    @property
+    def cprofile_active(self) -> bool:
+        return self._profile is not None
+
+    @property
+    def tracemalloc_active(self) -> bool:
+        return self._tracemalloc_started > 0
+
+    def _output_path(self, prefix: str, suffix: str) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        return self.output_dir / f"{prefix}_{timestamp}{suffix}"
+
+    # ---- cProfile ----
+
+    def start_cprofile(self, seconds: float = 30.0) -> str:
+        """開始 cProfile 分析，seconds 秒後自動停止並輸出
+
+        Returns:
+            狀態訊息
+        """
+        if self._profile is not None:
+            return "cProfile 已在執行中"
+
+        self._profile = cProfile.Profile()
+        self._profile_started = time.time()
+        self._profile_token += 1
+        token = self._profile_token
+        self._profile.enable()
+
+        self.schedule(int(seconds * 1000), lambda: self._auto_stop_cprofile(token))
+        return f"cProfile 已啟動，{seconds:.0f} 秒後自動停止"
+
+    def _auto_stop_cprofile(self, token: int):
+        if self._profile is not None and token == self._profile_token:
+            print(f"🔬 {self.stop_cprofile()}")
+
+    def stop_cprofile(self) -> str:
+        """停止 cProfile 並輸出 .prof、排行與 collapsed-stack 檔案
+
+        Returns:
+            狀態訊息
+        """
+        if self._profile is None:
+            return "cProfile 未啟動"
+
+        profile = self._profile
+        profile.disable()
+        self._profile = None
+        duration = time.time() - self._profile_started
+
+        prof_path = self._output_path("cprofile", ".prof")
+        profile.dump_stats(str(prof_path))
+
+        stats = pstats.Stats(profile)
+        collapsed_path = prof_path.with_suffix(".collapsed.txt")
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(collapsed_stacks(stats)))
+            f.write("\n")
+
+        top_path = prof_path.with_suffix(".top.txt")
+        buffer = io.StringIO()
+        stats.stream = buffer
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        stats.sort_stats("tottime").print_stats(self.top_n)
+        with open(top_path, "w", encoding="utf-8") as f:
+            f.write(f"cProfile 分析時間: {duration:.1f} 秒\n\n")
+            f.write(buffer.getvalue())
+
+        return f"cProfile 已停止 ({duration:.1f} 秒)，輸出: {collapsed_path}"
+
+    def toggle_cprofile(self, seconds: float = 30.0) -> str:
+        if self.cprofile_active:
+            return self.stop_cprofile()
+        return self.start_cprofile(seconds)
+
+    # ---- tracemalloc ----
+
+    def start_tracemalloc(self, seconds: float = 30.0) -> str:
+        """開始追蹤記憶體配置，seconds 秒後自動停止並輸出
+
+        Returns:
+            狀態訊息
+        """
+        if self.tracemalloc_active:
+            return "tracemalloc 已在執行中"
+
+        tracemalloc.start(self.tracemalloc_frames)
+        self._tracemalloc_started = time.time()
+        self._tracemalloc_baseline = tracemalloc.take_snapshot()
+        self._tracemalloc_token += 1
+        token = self._tracemalloc_token
+
+        self.schedule(int(seconds * 1000), lambda: self._auto_stop_tracemalloc(token))
+        return f"tracemalloc 已啟動，{seconds:.0f} 秒後自動停止"
+
+    def _auto_stop_tracemalloc(self, token: int):
+        if self.tracemalloc_active and token == self._tracemalloc_token:
+            print(f"🔬 {self.stop_tracemalloc()}")
+
+    def stop_tracemalloc(self) -> str:
+        """停止 tracemalloc 並輸出配置位置排行
+
+        Returns:
+            狀態訊息
+        """
+        if not self.tracemalloc_active:
+            return "tracemalloc 未啟動"
+
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        duration = time.time() - self._tracemalloc_started
+        self._tracemalloc_started = 0.0
+
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ]
+        snapshot = snapshot.filter_traces(filters)
+        baseline = self._tracemalloc_baseline.filter_traces(filters)
+        self._tracemalloc_baseline = None
+
+        path = self._output_path("tracemalloc", ".txt")
+        lines = [
+            f"tracemalloc 分析時間: {duration:.1f} 秒",
+            f"目前追蹤記憶體: {current / 1024 / 1024:.2f} MB，峰值: {peak / 1024 / 1024:.2f} MB",
+            "",
+            f"== 配置位置排行（存活中，前 {self.top_n} 名）==",
+        ]
+        for stat in snapshot.statistics("lineno")[:self.top_n]:
+            lines.append(str(stat))
+
+        lines += ["", f"== 分析期間增加最多的位置（前 {self.top_n} 名）=="]
+        for stat in snapshot.compare_to(baseline, "lineno")[:self.top_n]:
+            lines.append(str(stat))
+
+        lines += ["", "== 最大配置的完整堆疊（前 5 名）=="]
+        for stat in snapshot.statistics("traceback")[:5]:
+            lines.append(f"{stat.count} 個區塊, {stat.size / 1024:.1f} KiB")
+            lines.extend(f"    {line}" for line in stat.traceback.format())
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+            f.write("\n")
+
+        return f"tracemalloc 已停止 ({duration:.1f} 秒)，輸出: {path}"
+
+    def toggle_tracemalloc(self, seconds: float = 30.0) -> str:
+        if self.tracemalloc_active:
+            return self.stop_tracemalloc()
+        return self.start_tracemalloc(seconds)
+
+    def status(self) -> str:
+        """目前的分析狀態"""
+        return (
+            f"cProfile: {'執行中' if self.cprofile_active else '停止'} | "
+            f"tracemalloc: {'執行中' if self.tracemalloc_active else '停止'}"
+        )
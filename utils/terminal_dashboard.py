@@ -0,0 +1,105 @@
+"""
+終端機儀表板模組
+
+以 ANSI 控制碼只重繪有變化的行，取代每次清除整個畫面，
+讓 monitor.py 可以高頻更新而幾乎不佔用 CPU。
+"""
+
+import sys
+from typing import Iterable, List, Optional, Sequence
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+_ALT_SCREEN_ON = "\033[?1049h"
+_ALT_SCREEN_OFF = "\033[?1049l"
+_CURSOR_HIDE = "\033[?25l"
+_CURSOR_SHOW = "\033[?25h"
+
+
+def sparkline(values: Iterable[float], width: int = 40,
+              low: Optional[float] = None, high: Optional[float] = None) -> str:
+    """將最近的數值畫成一行迷你折線圖
+
+    Args:
+        values: 數值序列（只取最後 width 個）
+        width: 輸出字元數，不足時左側補空白
+        low: 下限，None 表示使用資料最小值
+        high: 上限，None 表示使用資料最大值
+    """
+    data = list(values)[-width:]
+    if not data:
+        return " " * width
+
+    lo = min(data) if low is None else low
+    hi = max(data) if high is None else high
+    span = hi - lo
+    top = len(SPARK_CHARS) - 1
+    chars = []
+    for value in data:
+        if span <= 0:
+            level = 0
+        else:
+            level = int((min(max(value, lo), hi) - lo) / span * top + 0.5)
+        chars.append(SPARK_CHARS[level])
+    return " " * (width - len(data)) + "".join(chars)
+
+
+class DiffScreen:
+    """只重繪有變化的行的終端機畫面
+
+    使用替代畫面緩衝區（離開後還原原本的終端機內容），
+    每次 render 只輸出與上一幀不同的行，並在一次 write 中送出。
+    輸出不是終端機時（例如導向檔案），改為逐幀完整輸出。
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.interactive = self.stream.isatty()
+        self.previous: List[str] = []
+        self.active = False
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        if self.interactive and not self.active:
+            self.stream.write(_ALT_SCREEN_ON + _CURSOR_HIDE + "\033[2J")
+            self.stream.flush()
+        self.active = True
+        self.previous = []
+
+    def close(self):
+        if self.interactive and self.active:
+            self.stream.write(_CURSOR_SHOW + _ALT_SCREEN_OFF)
+            self.stream.flush()
+        self.active = False
+
+    def render(self, lines: Sequence[str]):
+        """繪製一幀
+
+        Args:
+            lines: 每一行的內容（可包含顏色控制碼）
+        """
+        if not self.interactive:
+            self.stream.write("\n".join(lines) + "\n\n")
+            self.stream.flush()
+            return
+
+        out = []
+        previous = self.previous
+        for row, line in enumerate(lines):
+            if row < len(previous) and previous[row] == line:
+                continue
+            # 移到該行開頭、輸出新內容、清除行尾殘留
+            out.append(f"\033[{row + 1};1H{line}\033[K")
+        if len(lines) < len(previous):
+            out.append(f"\033[{len(lines) + 1};1H\033[J")
+
+        if out:
+            self.stream.write("".join(out))
+            self.stream.flush()
+        self.previous = list(lines)
@@ -0,0 +1,187 @@
+"""
+執行緒預算與 CPU 親和性
+
+OpenCV、BLAS / OpenMP、MediaPipe 與 Qt 各自建立執行緒，在核心數少的機器上會超額訂閱。
+THREAD_BUDGET 是整個程式同時可執行的執行緒數，依本程式的管線分配：
+    主執行緒    擷取、繪製與介面（1 個）
+    OpenCV      cv2.setNumThreads：縮放、轉色與偵測依序在主執行緒上執行，不會同時進行，
+                因此可使用主執行緒以外的全部預算（config.OPENCV_NUM_THREADS 有設定時以其為準）；
+                執行緒池在第一次平行運算時由主執行緒建立，繼承 ui 核心，
+                ui 綁定核心時最多為 ui 的核心數，多的執行緒只會擠在相同核心上
+    BLAS/OpenMP 只有小陣列運算，多執行緒只增加喚醒成本，固定 1；
+                必須在匯入 numpy / OpenCV 之前設定環境變數（由 config.py 套用）
+    MediaPipe   solutions API 無法設定執行緒數：XNNPACK 推論在桌面版預設單執行緒，
+                圖形排程執行緒依核心數建立，只能以 CPU 親和性限制可使用的核心
+
+CPU 親和性（僅 Linux 的 os.sched_setaffinity）：
+    ui          主執行緒，以及之後由主執行緒建立的執行緒（Qt、背景載入）
+    capture     開啟擷取來源時建立的後端執行緒（影片解碼等；讀取本身在主執行緒）
+    detection   建立 MediaPipe 偵測器時啟動的圖形執行緒；偵測常駐程式整個程式綁定
+Linux 的執行緒在建立時繼承建立者的親和性，spawn_affinity() 暫時切換主執行緒的核心，
+讓區塊內建立的執行緒落在指定核心上，結束後還原。
+"""
+
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# BLAS / OpenMP 執行緒上限的環境變數
+BLAS_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",  # macOS Accelerate
+    "NUMEXPR_NUM_THREADS",
+)
+
+AFFINITY_SUPPORTED = hasattr(os, "sched_setaffinity")
+AFFINITY_ROLES = ("ui", "capture", "detection")
+
+
+def available_cpus() -> Tuple[int, ...]:
+    """本程式可使用的 CPU 核心"""
+    if AFFINITY_SUPPORTED:
+        return tuple(sorted(os.sched_getaffinity(0)))
+    return tuple(range(os.cpu_count() or 1))
+
+
+@dataclass(frozen=True)
+class ThreadPlan:
+    """由執行緒預算推導出的各函式庫設定；None 表示不限制"""
+    budget: Optional[int]
+    opencv_threads: Optional[int]
+    blas_threads: Optional[int]
+    affinity: Dict[str, Tuple[int, ...]]
+    opencv_capped: bool = False  # OpenCV 執行緒數是否因 ui 核心數而減少
+
+    def cores(self, role: str) -> Optional[Tuple[int, ...]]:
+        return self.affinity.get(role)
+
+    def describe(self) -> str:
+        parts = [f"預算 {self.budget if self.budget is not None else '不限'}"]
+        parts.append(f"OpenCV {self.opencv_threads if self.opencv_threads is not None else '預設'}"
+                     + ("（受 ui 核心數限制）" if self.opencv_capped else ""))
+        if self.blas_threads is not None:
+            parts.append(f"BLAS/OpenMP {self.blas_threads}")
+        for role in AFFINITY_ROLES:
+            if role in self.affinity:
+                parts.append(f"{role} → CPU {','.join(map(str, self.affinity[role]))}")
+        return "，".join(parts)
+
+
+def plan_threads(
+    budget: Optional[int] = None,
+    opencv_threads: Optional[int] = None,
+    affinity: Optional[Dict[str, Iterable[int]]] = None,
+    cpus: Optional[Sequence[int]] = None,
+) -> ThreadPlan:
+    """依預算分配執行緒
+
+    Args:
+        budget: 同時可執行的執行緒數，None 表示不限制；超過可用核心數時以核心數為準
+        opencv_threads: 明確指定的 OpenCV 執行緒數（config.OPENCV_NUM_THREADS），優先於預算；
+            ui 綁定核心時兩者都不超過 ui 的核心數（未指定時即為 ui 的核心數）
+        affinity: {角色: 核心列表}，角色為 AFFINITY_ROLES；不支援的平台忽略
+        cpus: 可用核心（預設為目前程式的親和性）
+
+    Raises:
+        ValueError: 預算小於 1、未知的角色，或指定的核心都不可用
+    """
+    cpus = tuple(cpus) if cpus is not None else available_cpus()
+    blas_threads = None
+    if budget is not None:
+        if budget < 1:
+            raise ValueError(f"執行緒預算至少為 1: {budget}")
+        budget = min(budget, len(cpus))
+        if opencv_threads is None:
+            opencv_threads = max(1, budget - 1)
+        blas_threads = 1
+
+    pinned = {}
+    for role, cores in (affinity or {}).items():
+        if role not in AFFINITY_ROLES:
+            raise ValueError(f"未知的親和性角色: {role}（可用: {', '.join(AFFINITY_ROLES)}）")
+        usable = tuple(sorted(set(cores) & set(cpus)))
+        if not usable:
+            raise ValueError(f"{role} 指定的核心 {list(cores)} 都不可用（可用: {list(cpus)}）")
+        if AFFINITY_SUPPORTED:
+            pinned[role] = usable
+
+    opencv_capped = False
+    if "ui" in pinned and (opencv_threads is None or opencv_threads > len(pinned["ui"])):
+        opencv_threads = len(pinned["ui"])
+        opencv_capped = True
+    return ThreadPlan(budget, opencv_threads, blas_threads, pinned, opencv_capped)
+
+
+def apply_env_limits(plan: ThreadPlan) -> List[str]:
+    """設定 BLAS / OpenMP 執行緒上限（使用者已設定的環境變數不覆寫）
+
+    Returns:
+        實際設定的環境變數
+    """
+    if plan.blas_threads is None:
+        return []
+    applied = []
+    for name in BLAS_ENV_VARS:
+        if name not in os.environ:
+            os.environ[name] = str(plan.blas_threads)
+            applied.append(name)
+    return applied
+
+
+def pin_current_thread(cores: Optional[Iterable[int]]) -> bool:
+    """將呼叫端執行緒綁定到指定核心（Linux 上 pid 0 代表呼叫端執行緒）"""
+    if not cores or not AFFINITY_SUPPORTED:
+        return False
+    os.sched_setaffinity(0, set(cores))
+    return True
+
+
+@contextmanager
+def spawn_affinity(cores: Optional[Iterable[int]]):
+    """區塊內建立的執行緒繼承指定核心，結束後還原呼叫端執行緒的親和性"""
+    if not cores or not AFFINITY_SUPPORTED:
+        yield
+        return
+    previous = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, set(cores))
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, previous)
+
+
+def thread_affinities() -> Dict[Tuple[int, ...], int]:
+    """目前程式的執行緒依親和性分組計數（Linux 讀取 /proc/self/task）
+
+    Returns:
+        {核心: 執行緒數}；無法讀取時為空
+    """
+    if not AFFINITY_SUPPORTED:
+        return {}
+    groups: Dict[Tuple[int, ...], int] = {}
+    try:
+        tids = [int(tid) for tid in os.listdir("/proc/self/task")]
+    except OSError:
+        return {}
+    for tid in tids:
+        try:
+            cores = tuple(sorted(os.sched_getaffinity(tid)))
+        except OSError:
+            continue  # 執行緒已結束
+        groups[cores] = groups.get(cores, 0) + 1
+    return groups
+
+
+def thread_report(plan: ThreadPlan) -> str:
+    """預算設定與目前各核心組合上的執行緒數"""
+    lines = [f"🧵 執行緒預算: {plan.describe()}"]
+    groups = thread_affinities()
+    if groups:
+        total = sum(groups.values())
+        lines.append(f"   執行緒: {total} 個")
+        for cores, count in sorted(groups.items(), key=lambda item: -item[1]):
+            lines.append(f"   CPU {','.join(map(str, cores))}: {count} 個")
+    return "\n".join(lines)
@@ -0,0 +1,232 @@
+"""
+影格管線追蹤模組
+
+記錄各處理階段與執行緒的開始/結束時間，輸出 Chrome Trace JSON，
+可直接用 Perfetto (https://ui.perfetto.dev) 或 chrome://tracing 開啟。
+
+事件存放在 start() 時配置的環形緩衝區中，追蹤期間不會配置新的記憶體；
+緩衝區寫滿後會覆寫最舊的事件，因此永遠保留最近一段時間的紀錄。
+停止後輸出時釋放緩衝區；從未啟用的追蹤器不配置緩衝區，
+span() 只回傳共用的空物件，幾乎沒有額外負擔。
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from array import array
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+
+class _NullSpan:
+    """停用時使用的空 span"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """一段計時區間，結束時寫入一筆 Chrome "X"（complete）事件"""
+
+    __slots__ = ("tracer", "name_id", "start_ns")
+
+    def __init__(self, tracer: "Tracer", name_id: int):
+        self.tracer = tracer
+        self.name_id = name_id
+        self.start_ns = 0
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        self.tracer._record(self.name_id, self.start_ns, end_ns - self.start_ns)
+        return False
+
+
+class Tracer:
+    """影格管線追蹤器
+
+    每個事件包含名稱、開始時間、持續時間與執行緒 ID，
+    分別存放在固定大小的 array 中（start() 時配置）。
+    """
+
+    def __init__(self, capacity: int = 1 << 18):
+        """初始化追蹤器
+
+        Args:
+            capacity: 緩衝區可保存的事件數量
+        """
+        self.capacity = capacity
+        self.enabled = False
+
+        # 事件欄位 (名稱, 開始, 持續時間, 執行緒)，start() 時配置，None 表示未配置
+        self._buffers = None
+
+        self._names: Dict[str, int] = {}
+        self._name_list = []
+        self._thread_names: Dict[int, str] = {}
+        self._counter = itertools.count()
+        self._count = 0
+        self._origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """開始記錄（清除先前的事件）"""
+        if self._buffers is None:
+            capacity = self.capacity
+            self._buffers = (
+                array("i", [0]) * capacity,
+                array("q", [0]) * capacity,
+                array("q", [0]) * capacity,
+                array("q", [0]) * capacity,
+            )
+        self._counter = itertools.count()
+        self._count = 0
+        self._origin_ns = time.perf_counter_ns()
+        self.enabled = True
+
+    def stop(self):
+        """停止記錄，已記錄的事件保留到輸出（write_chrome_trace）或下次 start()"""
+        self.enabled = False
+
+    def release(self):
+        """釋放緩衝區與已記錄的事件（記錄中時無作用）"""
+        if self.enabled:
+            return
+        self._buffers = None
+        self._count = 0
+
+    def _name_id(self, name: str) -> int:
+        name_id = self._names.get(name)
+        if name_id is None:
+            with self._lock:
+                name_id = self._names.setdefault(name, len(self._name_list))
+                if name_id == len(self._name_list):
+                    self._name_list.append(name)
+        return name_id
+
+    def _record(self, name_id: int, start_ns: int, duration_ns: int):
+        buffers = self._buffers
+        if not self.enabled or buffers is None:
+            return
+        # itertools.count 在 GIL 下是原子操作，多執行緒可安全取得槽位
+        index = next(self._counter)
+        slot = index % self.capacity
+        thread_id = threading.get_ident()
+        if thread_id not in self._thread_names:
+            self._thread_names[thread_id] = threading.current_thread().name
+
+        name_ids, starts, durations, thread_ids = buffers
+        name_ids[slot] = name_id
+        starts[slot] = start_ns
+        durations[slot] = duration_ns
+        thread_ids[slot] = thread_id
+        self._count = index + 1
+
+    def span(self, name: str):
+        """建立一段計時區間，用法: with tracer.span("detect"): ..."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, self._name_id(name))
+
+    def traced(self, name: Optional[str] = None):
+        """函式裝飾器，將整個函式呼叫記錄為一段區間
+
+        Args:
+            name: 事件名稱，預設為函式名稱
+        """
+        def decorator(func):
+            event_name = name or func.__name__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, self._name_id(event_name)):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @property
+    def event_count(self) -> int:
+        """目前緩衝區中的事件數量"""
+        if self._buffers is None:
+            return 0
+        return min(self._count, self.capacity)
+
+    @property
+    def dropped_count(self) -> int:
+        """因緩衝區已滿而被覆寫的事件數量"""
+        if self._buffers is None:
+            return 0
+        return max(self._count - self.capacity, 0)
+
+    def to_chrome_trace(self) -> dict:
+        """轉換為 Chrome Trace 格式的字典"""
+        pid = os.getpid()
+        buffers = self._buffers
+        total = self._count if buffers is not None else 0
+        first = max(total - self.capacity, 0)
+
+        events = [{
+            "name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+            "args": {"name": "gesture-demo"},
+        }]
+        for thread_id, thread_name in self._thread_names.items():
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id,
+                "args": {"name": thread_name},
+            })
+
+        name_ids, starts, durations, thread_ids = buffers or ((),) * 4
+        for index in range(first, total):
+            slot = index % self.capacity
+            events.append({
+                "name": self._name_list[name_ids[slot]],
+                "ph": "X",
+                "pid": pid,
+                "tid": thread_ids[slot],
+                "ts": (starts[slot] - self._origin_ns) / 1000.0,
+                "dur": durations[slot] / 1000.0,
+            })
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped_count},
+        }
+
+    def write_chrome_trace(self, path: Union[str, Path]) -> Path:
+        """將目前的事件寫成 Chrome Trace JSON 檔
+
+        已停止記錄時，輸出後釋放緩衝區（記錄中則繼續保留）。
+
+        Args:
+            path: 輸出檔案路徑
+
+        Returns:
+            實際寫入的路徑
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+        self.release()
+        return path
+
+
+# 全域追蹤器，預設停用
+tracer = Tracer()